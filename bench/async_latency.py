@@ -0,0 +1,135 @@
+"""
+Async Database Latency Benchmark
+
+Measures event loop lag while concurrent tasks query a database, once with
+`Database` called directly from coroutines and once through `AsyncDatabase`.
+A ticker task sleeps for one millisecond at a time and records how late each
+wakeup is. Also measures how quickly cancelling a long select or bulk insert
+frees the connection thread, and checks that no rows are left behind.
+
+Usage:
+    python bench/async_latency.py [--tasks 32] [--rows 50000]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Awaitable, Callable, Iterator, List
+
+# import the package from the repository rather than an installed copy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.database import AsyncDatabase, Database
+from bot.database.storable import column, table
+
+
+TICK: float = 0.001
+"""The interval of the ticker measuring loop lag, in seconds"""
+
+
+@table(name='events', compiled=True)
+class Event():
+
+    def __init__(self, id: int, name: str) -> None:
+        self._id: int = id
+        self._name: str = name
+
+    @column(name='id', type='INTEGER', is_primary=True)
+    def id(self) -> int:
+        return self._id
+
+    @column(name='name', type='TEXT')
+    def name(self) -> str:
+        return self._name
+
+
+def generate(start: int, count: int) -> Iterator[Event]:
+    for id in range(start, start + count): yield Event(id, f'event-{id % 100}')
+
+
+async def tick(lags: List[float], stop: asyncio.Event) -> None:
+    """
+    Records the lag of each wakeup until stopped.
+    """
+    while not stop.is_set():
+        expected: float = time.perf_counter() + TICK
+        await asyncio.sleep(TICK)
+        lags.append(max(0.0, time.perf_counter() - expected))
+
+
+async def measure(name: str, query: Callable[[int], Awaitable[None]], tasks: int) -> None:
+    """
+    Runs the queries concurrently with the ticker and prints the loop lag.
+    """
+    lags: List[float] = list()
+    stop: asyncio.Event = asyncio.Event()
+    ticker: asyncio.Task[None] = asyncio.create_task(tick(lags, stop))
+    await asyncio.sleep(0.05)
+    start: float = time.perf_counter()
+    await asyncio.gather(*(query(index) for index in range(tasks)))
+    elapsed: float = time.perf_counter() - start
+    stop.set()
+    await ticker
+    lags.sort()
+    # the nearest-rank percentiles of the recorded lags
+    p50: float = lags[int(len(lags) * 0.50)]
+    p99: float = lags[min(int(len(lags) * 0.99), len(lags) - 1)]
+    print(f'{name}: {elapsed:.2f}s, {len(lags)} ticks, loop lag p50 {p50 * 1000:.2f}ms, p99 {p99 * 1000:.2f}ms, max {lags[-1] * 1000:.0f}ms')
+
+
+async def measure_cancellation(database: AsyncDatabase, rows: int) -> None:
+    """
+    Cancels a long select and a long bulk insert, and prints how quickly a following call completes
+    and the number of rows in the table, which the cancelled insert must not change.
+    """
+    for name, call in (('select', lambda: database.select(Event)), ('insert_many', lambda: database.insert_many(Event, generate(rows * 10, rows * 200)))):
+        task: asyncio.Task[object] = asyncio.create_task(call())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        start: float = time.perf_counter()
+        # a call that reads one row, so its time is spent waiting for the connection thread
+        await database.page(Event, 'id', limit=1)
+        freed: float = time.perf_counter() - start
+        remaining: int = len(await database.select(Event))
+        print(f'cancelled {name}: next call completed after {freed * 1000:.1f}ms, {remaining} rows in the table')
+
+
+async def run(path: Path, *, tasks: int, rows: int) -> None:
+    database: Database = Database(path)
+    database.create(Event)
+    database.insert_many(Event, generate(0, rows))
+
+    async def blocking(index: int) -> None:
+        # the statements run on the event loop thread
+        database.select(Event)
+        database.insert(Event, Event(rows + index, 'blocking'))
+
+    await measure('Database', blocking, tasks)
+    database.close()
+
+    asynchronous: AsyncDatabase = AsyncDatabase(path)
+
+    async def queued(index: int) -> None:
+        await asynchronous.select(Event)
+        await asynchronous.insert(Event, Event(rows + tasks + index, 'queued'))
+
+    await measure('AsyncDatabase', queued, tasks)
+    await measure_cancellation(asynchronous, rows)
+    await asynchronous.close()
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Measures event loop lag under concurrent database queries')
+    parser.add_argument('--tasks', type=int, default=32, help='the number of concurrent tasks, each selecting every row and inserting one')
+    parser.add_argument('--rows', type=int, default=50000, help='the number of rows in the table')
+    args: argparse.Namespace = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        asyncio.run(run(Path(directory) / 'events.db', tasks=args.tasks, rows=args.rows))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Bundle Startup Benchmark
+
+Measures the time to locate and execute generated component modules from a
+directory of source files and from a bundle packed by `Bundle.pack`, resolving
+specs the way `Loader` does for each. Each run happens in a fresh process, so
+that no module is reused from a previous run. The first directory run compiles
+the modules into `__pycache__`, and is reported separately from the runs
+reading the cached bytecode.
+
+Usage:
+    python bench/bundle_startup.py [--components 200] [--runs 3]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from importlib.machinery import ModuleSpec
+from importlib.util import spec_from_file_location
+from pathlib import Path
+from typing import List, Optional
+
+# import the package from the repository rather than an installed copy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.bundle import Bundle
+from bot.loader import BUNDLE_EXTENSION, execute_module
+
+
+TEMPLATE: str = '''
+class Component{index}():
+    """
+    A generated component.
+    """
+
+    def __init__(self, *args, **kwargs) -> None:
+        self._count: int = {index}
+
+    async def command{index}(self, interaction) -> None:
+        """
+        Responds with the count of the component.
+        """
+        await interaction.response.send_message(str(self._count))
+'''
+"""The source of each generated component module"""
+
+
+def generate(directory: Path, components: int) -> None:
+    directory.mkdir(parents=True)
+    for index in range(components): (directory / f'component{index}.py').write_text(TEMPLATE.format(index=index))
+
+
+def load_directory(directory: Path) -> int:
+    """
+    Executes each module in the directory, and returns the number executed.
+    """
+    file_objects: List[Path] = [path.resolve() for path in directory.glob('*.py') if path.is_file()]
+    for file_object in file_objects:
+        spec: Optional[ModuleSpec] = spec_from_file_location(name=file_object.stem, location=file_object)
+        if spec: execute_module(spec)
+    return len(file_objects)
+
+
+def load_bundle(path: Path) -> int:
+    """
+    Executes each module in the bundle, and returns the number executed.
+    """
+    bundle: Bundle = Bundle(path)
+    names: List[str] = bundle.modules
+    for name in names: execute_module(bundle.get_module_spec(name))
+    return len(names)
+
+
+def measure(mode: str, path: Path) -> float:
+    """
+    Loads the components in a fresh process and returns the elapsed seconds.
+    """
+    command: List[str] = [sys.executable, __file__, '--mode', mode, '--path', str(path)]
+    return float(subprocess.run(command, check=True, capture_output=True, text=True).stdout)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Measures component startup from a directory and from a bundle')
+    parser.add_argument('--components', type=int, default=200, help='the number of generated components')
+    parser.add_argument('--runs', type=int, default=3, help='the number of runs per mode')
+    parser.add_argument('--mode', choices=['directory', 'bundle'], help=argparse.SUPPRESS)
+    parser.add_argument('--path', type=Path, help=argparse.SUPPRESS)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.mode:
+        start: float = time.perf_counter()
+        loaded: int = load_directory(args.path) if args.mode == 'directory' else load_bundle(args.path)
+        elapsed: float = time.perf_counter() - start
+        if not loaded: raise RuntimeError(f'{args.path}: No components loaded')
+        print(elapsed)
+        return
+
+    with tempfile.TemporaryDirectory() as temporary:
+        directory: Path = Path(temporary) / 'components'
+        generate(directory, args.components)
+        bundle: Path = Path(temporary) / f'components.{BUNDLE_EXTENSION}'
+        Bundle.pack(directory, bundle)
+
+        print(f'Python {sys.version_info.major}.{sys.version_info.minor}, {args.components} components, {args.runs} runs per mode')
+        print(f'directory, compiling: {measure("directory", directory) * 1000:.1f}ms')
+        for mode, path in (('directory', directory), ('bundle', bundle)):
+            timings: List[float] = [measure(mode, path) for _ in range(args.runs)]
+            print(f'{mode}: median {statistics.median(timings) * 1000:.1f}ms, min {min(timings) * 1000:.1f}ms, max {max(timings) * 1000:.1f}ms')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Dispatch Benchmark
+
+Measures the throughput of message events routed by `bot.events.Router` under
+each event loop configuration offered by `--loop` and `--eager-tasks`. Each
+event matches one of three channel handlers, which runs as its own task.
+Each configuration runs in a fresh process, so that event loop policies do not
+carry over. Unavailable configurations are reported as skipped.
+
+Usage:
+    python bench/dispatch.py [--events 200000]
+"""
+
+import argparse
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+# import the package from the repository rather than an installed copy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.events import Handler, Router
+
+
+CONFIGURATIONS: List[Tuple[str, bool]] = [('default', False), ('default', True), ('uvloop', False), ('uvloop', True)]
+"""The loop implementation and eager task execution of each measured configuration"""
+
+BATCH: int = 1000
+"""The number of events dispatched before waiting for their handlers to complete"""
+
+CHANNELS: int = 3
+"""The number of channels, each with one handler"""
+
+
+class Channel():
+
+    def __init__(self, id: int) -> None:
+        self.id: int = id
+
+
+class Message():
+    """
+    A stand-in for `discord.Message` carrying only the attributes the router reads.
+    """
+
+    def __init__(self, channel: Channel) -> None:
+        self.guild: Optional[object] = None
+        self.channel: Channel = channel
+
+
+async def on_message(message: Message) -> None:
+    pass
+
+
+async def run(events: int, eager: bool) -> float:
+    """
+    Dispatches the events and returns the events handled per second.
+    """
+    if eager: asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)  # type: ignore[attr-defined]
+    router: Router = Router()
+    for channel in range(CHANNELS): router.add(Handler(on_message, event='message', channel=channel))
+    messages: List[Message] = [Message(Channel(channel)) for channel in range(CHANNELS)]
+    start: float = time.perf_counter()
+    for sequence in range(events):
+        router.dispatch('message', messages[sequence % CHANNELS])
+        # let the handler tasks of the batch run
+        if sequence % BATCH == BATCH - 1:
+            while router.tasks: await asyncio.sleep(0)
+    while router.tasks: await asyncio.sleep(0)
+    return events / (time.perf_counter() - start)
+
+
+def measure(loop: str, eager: bool, events: int) -> Optional[float]:
+    """
+    Runs a configuration in this process and returns the events handled per second, or None if unavailable.
+    """
+    if eager and sys.version_info < (3, 12): return None
+    if loop == 'uvloop':
+        try:
+            import uvloop
+        except ImportError:
+            return None
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(run(events, eager))
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Measures routed event throughput under each event loop configuration')
+    parser.add_argument('--events', type=int, default=200000, help='the number of message events dispatched')
+    parser.add_argument('--loop', choices=['default', 'uvloop'], help=argparse.SUPPRESS)
+    parser.add_argument('--eager-tasks', action='store_true', help=argparse.SUPPRESS)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.loop:
+        rate: Optional[float] = measure(args.loop, args.eager_tasks, args.events)
+        print(f'{rate:.0f}' if rate else 'skipped')
+        return
+    print(f'Python {sys.version_info.major}.{sys.version_info.minor}, {args.events} events, {CHANNELS} handlers, one match per event')
+    for loop, eager in CONFIGURATIONS:
+        command: List[str] = [sys.executable, __file__, '--events', str(args.events), '--loop', loop, *(['--eager-tasks'] if eager else [])]
+        output: str = subprocess.run(command, check=True, capture_output=True, text=True).stdout.strip()
+        label: str = f'{loop}{" + eager" if eager else ""}'
+        print(f'{label}: {int(output):,} events/s' if output.isdigit() else f'{label}: {output}')
+
+
+if __name__ == '__main__':
+    main()
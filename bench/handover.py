@@ -0,0 +1,168 @@
+"""
+Handover Benchmark
+
+Measures the window in which interactions go unanswered while a replacement
+process takes over from a running one through `bot.handover.Handover`.
+
+A local gateway stand-in listens on a Unix socket and broadcasts one numbered
+interaction per millisecond to every connected process. Each process answers
+the interactions it handles, unless it is on standby or shutting down. The
+stand-in reports how many interactions were unanswered or answered twice.
+
+Usage:
+    python bench/handover.py [--standby] [--load 0.5] [--connect 0.05]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+# import the package from the repository rather than an installed copy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.handover import Handover
+
+
+DURATION: int = 2500
+"""The number of interactions broadcast, one per millisecond"""
+
+WARMUP: int = 100
+"""The number of interactions ignored while the running process connects"""
+
+
+class StandInClient():
+    """
+    A stand-in for `Core` that answers interactions from the gateway stand-in.
+    """
+
+    def __init__(self, name: str, gateway: Path, *, drain: float) -> None:
+        self.name: str = name
+        self.standby: bool = False
+        self._gateway: Path = gateway
+        self._drain: float = drain
+        self._closed: asyncio.Event = asyncio.Event()
+        self._closing: Optional['asyncio.Future[None]'] = None
+
+    async def close(self) -> None:
+        if not self._closing: self._closing = asyncio.ensure_future(self._close())
+        await asyncio.shield(self._closing)
+
+    async def _close(self) -> None:
+        # stand-in for draining running commands
+        await asyncio.sleep(self._drain)
+        self._closed.set()
+
+    async def run(self) -> None:
+        """
+        Answers each interaction broadcast by the gateway stand-in until closed.
+        """
+        reader, writer = await asyncio.open_unix_connection(str(self._gateway))
+        try:
+            while not self._closed.is_set():
+                line: bytes = await asyncio.wait_for(reader.readline(), 0.5)
+                if not line: break
+                # leave interactions to the other process while on standby or shutting down
+                if self.standby or self._closing: continue
+                writer.write(f'{line.decode().strip()} {self.name}\n'.encode())
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            writer.close()
+
+
+async def run_process(name: str, directory: Path, *, load: float, connect: float, standby: bool, drain: float) -> None:
+    """
+    Runs a bot process stand-in, taking over from a running process if there is one.
+    """
+    client: StandInClient = StandInClient(name, directory / 'gateway.sock', drain=drain)
+    handover: Handover = Handover(directory / 'handover.sock')
+    if not await handover.connect():
+        # no running process, serve interactions until replaced
+        await handover.serve(client)  # type: ignore[arg-type]
+        await client.run()
+        await handover.close()
+        return
+
+    connection: Optional['asyncio.Task[None]'] = None
+    if standby:
+        # connect to the gateway before loading, ignoring interactions until the handover
+        client.standby = True
+        connection = asyncio.create_task(client.run())
+    # stand-in for loading components
+    await asyncio.sleep(load)
+    elapsed: float = await handover.take_over()
+    client.standby = False
+    if not connection:
+        # stand-in for the gateway IDENTIFY and READY exchange
+        await asyncio.sleep(connect)
+        connection = asyncio.create_task(client.run())
+    print(f'{name}: took over in {elapsed * 1000:.2f}ms', flush=True)
+    await handover.serve(client)  # type: ignore[arg-type]
+    await asyncio.gather(handover.wait_closed(), connection)
+    await handover.close()
+
+
+async def measure(directory: Path, *, load: float, connect: float, standby: bool, drain: float) -> None:
+    """
+    Runs the gateway stand-in, starts a running process and its replacement, and reports the outage.
+    """
+    answers: Dict[int, List[str]] = dict()
+    writers: Set[asyncio.StreamWriter] = set()
+
+    async def accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writers.add(writer)
+        while line := await reader.readline():
+            sequence, name = line.decode().split()
+            answers.setdefault(int(sequence), []).append(name)
+        writers.discard(writer)
+
+    server: asyncio.AbstractServer = await asyncio.start_unix_server(accept, str(directory / 'gateway.sock'))
+    arguments: List[str] = [__file__, '--process', '--directory', str(directory), '--load', str(load), '--connect', str(connect), '--drain', str(drain)]
+    running = await asyncio.create_subprocess_exec(sys.executable, *arguments, '--name', 'running')
+    # let the running process connect and listen for a replacement
+    await asyncio.sleep(0.5)
+    replacement = await asyncio.create_subprocess_exec(sys.executable, *arguments, '--name', 'replacement', *(['--standby'] if standby else []))
+
+    sent: Dict[int, float] = dict()
+    for sequence in range(DURATION):
+        sent[sequence] = time.perf_counter()
+        for writer in list(writers): writer.write(f'{sequence}\n'.encode())
+        await asyncio.sleep(0.001)
+    await asyncio.sleep(0.3)
+
+    await running.wait()
+    replacement.terminate()
+    await replacement.wait()
+    server.close()
+
+    unanswered: List[int] = [sequence for sequence in sent if sequence not in answers and sequence >= WARMUP]
+    duplicated: List[int] = [sequence for sequence, names in answers.items() if len(names) > 1]
+    outage: float = sent[unanswered[-1]] - sent[unanswered[0]] if unanswered else 0.0
+    print(f'standby={standby}: sent {len(sent)}, unanswered {len(unanswered)}, duplicated {len(duplicated)}, outage ~{outage * 1000:.1f}ms')
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Measures the outage window of a handover')
+    parser.add_argument('--standby', action='store_true', help='connect the replacement to the gateway before taking over')
+    parser.add_argument('--load', type=float, default=0.5, help='the time the replacement spends loading components, in seconds')
+    parser.add_argument('--connect', type=float, default=0.05, help='the time the replacement spends connecting after taking over without standby, in seconds')
+    parser.add_argument('--drain', type=float, default=0.2, help='the time the running process spends draining, in seconds')
+    parser.add_argument('--process', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--name', default='running', help=argparse.SUPPRESS)
+    parser.add_argument('--directory', type=Path, help=argparse.SUPPRESS)
+    args: argparse.Namespace = parser.parse_args()
+
+    if args.process:
+        asyncio.run(run_process(args.name, args.directory, load=args.load, connect=args.connect, standby=args.standby, drain=args.drain))
+        return
+    # keep the socket paths short, as Unix socket paths are limited to about 100 characters
+    with tempfile.TemporaryDirectory(prefix='handover') as directory:
+        asyncio.run(measure(Path(directory), load=args.load, connect=args.connect, standby=args.standby, drain=args.drain))
+
+
+if __name__ == '__main__':
+    main()
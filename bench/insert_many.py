@@ -0,0 +1,99 @@
+"""
+Bulk Insert Benchmark
+
+Measures rows inserted per second into a file database by `Database.insert`,
+which commits each row, and by `Database.insert_many`, which streams a
+generator through `executemany` in chunks inside one transaction.
+
+Usage:
+    python bench/insert_many.py [--rows 200000] [--single-rows 3000]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Iterator, List
+
+# import the package from the repository rather than an installed copy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.database import Database
+from bot.database.storable import column, table
+
+
+CHUNK_SIZES: List[int] = [100, 1000, 10000]
+"""The chunk sizes measured for `insert_many`"""
+
+
+@table(name='events')
+class Event():
+
+    def __init__(self, id: int, name: str, value: float) -> None:
+        self._id: int = id
+        self._name: str = name
+        self._value: float = value
+
+    @column(name='id', type='INTEGER', is_primary=True)
+    def id(self) -> int:
+        return self._id
+
+    @column(name='name', type='TEXT')
+    def name(self) -> str:
+        return self._name
+
+    @column(name='value', type='REAL')
+    def value(self) -> float:
+        return self._value
+
+    def __values__(self):
+        return (self._id, self._name, self._value)
+
+
+def generate(count: int) -> Iterator[Event]:
+    for id in range(count): yield Event(id, f'event-{id % 100}', id / 7)
+
+
+def measure_insert(path: Path, rows: int) -> float:
+    """
+    Inserts rows one at a time and returns the rows inserted per second.
+    """
+    database: Database = Database(path)
+    database.create(Event)
+    start: float = time.perf_counter()
+    for event in generate(rows): database.insert(Event, event)
+    elapsed: float = time.perf_counter() - start
+    database.close()
+    return rows / elapsed
+
+
+def measure_insert_many(path: Path, rows: int, chunk_size: int) -> float:
+    """
+    Inserts rows from a generator in one transaction and returns the rows inserted per second.
+    """
+    database: Database = Database(path)
+    database.create(Event)
+    start: float = time.perf_counter()
+    count: int = database.insert_many(Event, generate(rows), chunk_size=chunk_size)
+    elapsed: float = time.perf_counter() - start
+    database.close()
+    if count != rows: raise RuntimeError(f'Expected {rows} rows, inserted {count}')
+    return rows / elapsed
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Measures per-row and bulk insert throughput')
+    parser.add_argument('--rows', type=int, default=200000, help='the number of rows inserted by insert_many')
+    parser.add_argument('--single-rows', type=int, default=3000, help='the number of rows inserted one at a time')
+    args: argparse.Namespace = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        print(f'insert, {args.single_rows} rows: {measure_insert(Path(directory) / "single.db", args.single_rows):,.0f} rows/s')
+        for chunk_size in CHUNK_SIZES:
+            rate: float = measure_insert_many(Path(directory) / f'bulk-{chunk_size}.db', args.rows, chunk_size)
+            print(f'insert_many, {args.rows} rows, chunk size {chunk_size}: {rate:,.0f} rows/s')
+
+
+if __name__ == '__main__':
+    main()
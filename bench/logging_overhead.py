@@ -0,0 +1,93 @@
+"""
+Logging Overhead Benchmark
+
+Measures the time a caller spends per `log.debug` call with a file handler and a
+console handler attached to the root logger, once with the handlers writing
+synchronously and once behind the bounded queue of `QueueLogging`, for each
+queue size and drop policy. The console handler writes to `os.devnull`, so the
+terminal does not slow it down. For the queued pipeline, the records dropped
+and the time taken by `stop` to write the queued records are also reported.
+
+Usage:
+    python bench/logging_overhead.py [--records 100000]
+"""
+
+import argparse
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import IO, List, Optional, Tuple
+
+# import the package from the repository rather than an installed copy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.logs import DROP_NEWEST, DROP_OLDEST, QueueLogging
+
+
+CONFIGURATIONS: List[Tuple[int, str]] = [(10000, DROP_NEWEST), (10000, DROP_OLDEST), (200000, DROP_NEWEST)]
+"""The queue size and drop policy of each measured queued configuration"""
+
+FORMAT: str = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+"""The format of both handlers"""
+
+
+def configure(path: Path, console: IO[str]) -> List[logging.Handler]:
+    """
+    Attaches a file handler and a console handler to the root logger at debug level.
+    """
+    root: logging.Logger = logging.getLogger()
+    root.setLevel(logging.DEBUG)
+    handlers: List[logging.Handler] = [logging.FileHandler(path, encoding='utf-8'), logging.StreamHandler(console)]
+    for handler in handlers:
+        handler.setFormatter(logging.Formatter(FORMAT))
+        root.addHandler(handler)
+    return handlers
+
+
+def emit(records: int) -> float:
+    """
+    Logs the records from the caller and returns the microseconds spent per call.
+    """
+    logger: logging.Logger = logging.getLogger('bench.component')
+    start: float = time.perf_counter()
+    for sequence in range(records): logger.debug('Retrieved %s from section %s: %d', 'prefix', 'general', sequence)
+    return (time.perf_counter() - start) / records * 1e6
+
+
+def run(path: Path, console: IO[str], records: int, queued: Optional[Tuple[int, str]]) -> str:
+    handlers: List[logging.Handler] = configure(path, console)
+    pipeline: Optional[QueueLogging] = QueueLogging(maxsize=queued[0], policy=queued[1]) if queued else None
+    if pipeline: pipeline.start()
+    per_call: float = emit(records)
+    result: str = f'{per_call:.2f}us/call'
+    if pipeline:
+        dropped: int = pipeline.dropped
+        start: float = time.perf_counter()
+        # write the queued records and restore the handlers
+        pipeline.stop()
+        result += f', {dropped:,} dropped, stop took {(time.perf_counter() - start) * 1000:.0f}ms'
+    root: logging.Logger = logging.getLogger()
+    for handler in handlers:
+        root.removeHandler(handler)
+        handler.close()
+    return result
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Measures the per-call logging overhead on the caller')
+    parser.add_argument('--records', type=int, default=100000, help='the number of debug records logged per configuration')
+    args: argparse.Namespace = parser.parse_args()
+
+    print(f'{args.records} debug records, file and console handlers')
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as console:
+        print(f'synchronous: {run(Path(directory) / "synchronous.log", console, args.records, None)}')
+        for maxsize, policy in CONFIGURATIONS:
+            path: Path = Path(directory) / f'queued-{maxsize}-{policy}.log'
+            print(f'queued, maxsize {maxsize}, drop {policy}: {run(path, console, args.records, (maxsize, policy))}')
+
+
+if __name__ == '__main__':
+    main()
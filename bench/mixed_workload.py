@@ -0,0 +1,131 @@
+"""
+Mixed Workload Benchmark
+
+Measures reads and writes per second on a `bot.database.Database` for several
+pragma configurations, with and without a pool of read-only connections.
+
+One writer commits single-row inserts while selects filter the table by an
+unindexed column. Without read-only connections the selects run on the writer's
+thread, four per insert; with them, each reader thread selects in a loop.
+
+Usage:
+    python bench/mixed_workload.py [--rows 20000] [--duration 3] [--readers 4]
+"""
+
+import argparse
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# import the package from the repository rather than an installed copy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.database import ComparisonClause, Database, Pragmas
+from bot.database.storable import column, table
+
+
+SELECTS_PER_INSERT: int = 4
+"""The number of selects run between inserts without read-only connections"""
+
+
+@table(name='messages', compiled=True)
+class Message():
+
+    def __init__(self, id: int, channel: int, length: int) -> None:
+        self._id: int = id
+        self._channel: int = channel
+        self._length: int = length
+
+    @column(name='id', type='INTEGER', is_primary=True)
+    def id(self) -> int:
+        return self._id
+
+    @column(name='channel', type='INTEGER')
+    def channel(self) -> int:
+        return self._channel
+
+    @column(name='length', type='INTEGER')
+    def length(self) -> int:
+        return self._length
+
+
+CONFIGURATIONS: Dict[str, Optional[Pragmas]] = {
+    'default': None,
+    'wal, full sync': Pragmas(journal_mode='wal', synchronous='full'),
+    'Pragmas.wal()': Pragmas.wal(),
+}
+"""The pragmas of each measured configuration"""
+
+
+class Counts():
+
+    def __init__(self) -> None:
+        self.reads: int = 0
+        self.writes: int = 0
+
+
+def select(database: Database, counts: Counts, value: int) -> None:
+    """
+    Selects the rows of a channel, which is not indexed.
+    """
+    database.select(Message, ComparisonClause('channel', '=', value % 100))
+    counts.reads += 1
+
+
+def run(path: Path, pragmas: Optional[Pragmas], *, rows: int, duration: float, readers: int) -> Counts:
+    """
+    Runs the workload on a new database and returns the number of reads and writes.
+    """
+    database: Database = Database(path, pragmas=pragmas, readers=readers)
+    database.create(Message)
+    database.insert_many(Message, (Message(id, id % 100, id % 2000) for id in range(rows)))
+    counts: Counts = Counts()
+    stop: threading.Event = threading.Event()
+
+    def read() -> None:
+        sequence: int = 0
+        while not stop.is_set():
+            select(database, counts, sequence)
+            sequence += 1
+
+    threads: List[threading.Thread] = [threading.Thread(target=read, daemon=True) for _ in range(readers)]
+    for thread in threads: thread.start()
+    deadline: float = time.perf_counter() + duration
+    id: int = rows
+    while time.perf_counter() < deadline:
+        # without read-only connections, interleave the selects with the writes
+        if not readers:
+            for offset in range(SELECTS_PER_INSERT): select(database, counts, id + offset)
+        database.insert(Message, Message(id, id % 100, id % 2000))
+        counts.writes += 1
+        id += 1
+    stop.set()
+    for thread in threads: thread.join()
+    database.close()
+    return counts
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Measures mixed read and write throughput across pragma configurations')
+    parser.add_argument('--rows', type=int, default=20000, help='the number of rows in the table before the workload starts')
+    parser.add_argument('--duration', type=float, default=3.0, help='the duration of each configuration, in seconds')
+    parser.add_argument('--readers', type=int, default=4, help='the number of read-only connections in the pooled configurations')
+    args: argparse.Namespace = parser.parse_args()
+
+    print('| Configuration | Reads/s | Writes/s | Total/s |')
+    print('|---|---|---|---|')
+    with tempfile.TemporaryDirectory() as directory:
+        for name, pragmas in CONFIGURATIONS.items():
+            for readers in (0, args.readers):
+                path: Path = Path(directory) / f'{len(list(Path(directory).iterdir()))}.db'
+                counts: Counts = run(path, pragmas, rows=args.rows, duration=args.duration, readers=readers)
+                label: str = f'{name} + {readers} readers' if readers else f'{name}, 1 connection'
+                rates: Tuple[float, ...] = (counts.reads / args.duration, counts.writes / args.duration, (counts.reads + counts.writes) / args.duration)
+                print(f'| {label} | {rates[0]:,.0f} | {rates[1]:,.0f} | {rates[2]:,.0f} |')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Table Cache Benchmark
+
+Measures the per-operation overhead of table metadata and generated SQL.
+The uncached path rebuilds the `Table` from the column metadata and generates
+the insert and select statements on every operation, as `Database` did before
+tables and statements were cached; the cached path retrieves both from the
+class. Also measures selecting one row and constructing a `@table` instance.
+
+Usage:
+    python bench/table_cache.py [--number 100000]
+"""
+
+import argparse
+import sys
+import tempfile
+import timeit
+from pathlib import Path
+from typing import Callable, List, Tuple
+
+# import the package from the repository rather than an installed copy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.database import ColumnBuilder, Database, Table, TableBuilder, WhereClause
+from bot.database.storable import column, table
+
+
+@table(name='members')
+class Member():
+
+    def __init__(self, id: int, name: str, joined: float) -> None:
+        self._id: int = id
+        self._name: str = name
+        self._joined: float = joined
+
+    @column(name='id', type='INTEGER', is_primary=True)
+    def id(self) -> int:
+        return self._id
+
+    @column(name='name', type='TEXT')
+    def name(self) -> str:
+        return self._name
+
+    @column(name='joined', type='REAL')
+    def joined(self) -> float:
+        return self._joined
+
+    def __values__(self):
+        return (self._id, self._name, self._joined)
+
+    @classmethod
+    def __from_row__(cls, row) -> 'Member':
+        return cls(row['id'], row['name'], row['joined'])
+
+
+COLUMNS: List[Tuple[str, str, bool]] = [('id', 'INTEGER', True), ('name', 'TEXT', False), ('joined', 'REAL', False)]
+"""The name, type and primary flag of each column the uncached path rebuilds the table from"""
+
+
+def rebuild() -> None:
+    """
+    Builds a new table and generates its statements, without the cache.
+    """
+    builder: TableBuilder = TableBuilder()
+    builder.setName('members')
+    for name, type, is_primary in COLUMNS:
+        builder.addColumn(ColumnBuilder().setName(name).setType(type).isPrimary(is_primary).build())
+    rebuilt: Table = builder.build()
+    rebuilt.__insert__()
+    rebuilt.__select__()
+
+
+def cached() -> None:
+    """
+    Retrieves the table of the class and its cached statements.
+    """
+    cached_table: Table = Member.__table__()
+    cached_table.__insert__()
+    cached_table.__select__()
+
+
+def measure(name: str, function: Callable[[], object], number: int) -> None:
+    # take the best of several repeats, as the fastest run is the least disturbed
+    best: float = min(timeit.repeat(function, number=number, repeat=5))
+    print(f'{name}: {best / number * 1e6:.2f}us')
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Measures the per-operation overhead of table metadata and SQL generation')
+    parser.add_argument('--number', type=int, default=100000, help='the number of operations per repeat')
+    args: argparse.Namespace = parser.parse_args()
+
+    measure('table + insert/select SQL, uncached', rebuild, args.number)
+    measure('table + insert/select SQL, cached', cached, args.number)
+    measure('constructing a @table instance', lambda: Member(1, 'member', 0.0), args.number)
+
+    with tempfile.TemporaryDirectory() as directory:
+        database: Database = Database(Path(directory) / 'members.db')
+        database.create(Member)
+        database.insert_many(Member, (Member(id, f'member-{id}', id / 3) for id in range(1000)))
+        measure('select of one row', lambda: database.select(Member, WhereClause('id', 500)), args.number // 10)
+        database.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+"""
+Write Buffer Benchmark
+
+Measures upserts per second by a single coroutine awaiting each write, through
+`AsyncDatabase.upsert` and through a `WriteBuffer`, with the default rollback
+journal and with WAL. Writes cycle over a set of hot keys, and the table is
+checked against the latest write for each key afterwards. The longest time a
+single buffered write waited for room is reported as the backpressure wait.
+
+Usage:
+    python bench/writebuffer.py [--writes 20000] [--keys 500]
+"""
+
+import argparse
+import asyncio
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+# import the package from the repository rather than an installed copy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bot.database import AsyncDatabase, Pragmas, WriteBuffer
+from bot.database.storable import column, table
+
+
+@table(name='counters', compiled=True)
+class Counter():
+
+    def __init__(self, id: int, count: int) -> None:
+        self._id: int = id
+        self._count: int = count
+
+    @column(name='id', type='INTEGER', is_primary=True)
+    def id(self) -> int:
+        return self._id
+
+    @column(name='count', type='INTEGER')
+    def count(self) -> int:
+        return self._count
+
+
+async def check(database: AsyncDatabase, writes: int, keys: int) -> None:
+    """
+    Checks that each key holds its latest write.
+    """
+    expected: Dict[int, int] = {sequence % keys: sequence for sequence in range(writes)}
+    actual: Dict[int, int] = {counter.id(): counter.count() for counter in await database.select(Counter)}
+    if actual != expected: raise RuntimeError('The table does not match the latest write for each key')
+
+
+async def run(path: Path, pragmas: Optional[Pragmas], *, buffered: bool, writes: int, keys: int, interval: float, batch_size: int, max_size: int) -> str:
+    database: AsyncDatabase = AsyncDatabase(path, pragmas=pragmas)
+    await database.create(Counter)
+    buffer: Optional[WriteBuffer[Counter]] = WriteBuffer(database, Counter, interval=interval, batch_size=batch_size, max_size=max_size) if buffered else None
+    if buffer: buffer.start()
+    longest: float = 0.0
+    start: float = time.perf_counter()
+    for sequence in range(writes):
+        counter: Counter = Counter(sequence % keys, sequence)
+        if not buffer:
+            await database.upsert(Counter, counter)
+            continue
+        began: float = time.perf_counter()
+        await buffer.write(counter)
+        longest = max(longest, time.perf_counter() - began)
+    if buffer: await buffer.close()
+    elapsed: float = time.perf_counter() - start
+    await check(database, writes, keys)
+    await database.close()
+    result: str = f'{writes / elapsed:,.0f} writes/s'
+    if buffer: result += f', {buffer.flushed:,} rows committed, longest wait {longest * 1000:.1f}ms'
+    return result
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description='Measures buffered and direct upsert throughput')
+    parser.add_argument('--writes', type=int, default=20000, help='the number of writes')
+    parser.add_argument('--keys', type=int, default=500, help='the number of hot keys the writes cycle over')
+    parser.add_argument('--interval', type=float, default=0.05, help='the buffer flush interval, in seconds')
+    parser.add_argument('--batch-size', type=int, default=1000, help='the number of buffered keys that begins a flush')
+    parser.add_argument('--max-size', type=int, default=2000, help='the number of buffered keys at which writes wait')
+    args: argparse.Namespace = parser.parse_args()
+    options: Dict[str, Any] = {'writes': args.writes, 'interval': args.interval, 'batch_size': args.batch_size, 'max_size': args.max_size}
+
+    with tempfile.TemporaryDirectory() as directory:
+        for name, pragmas in (('default', None), ('WAL', Pragmas.wal())):
+            direct: str = asyncio.run(run(Path(directory) / f'{name}-direct.db', pragmas, buffered=False, keys=args.keys, **options))
+            buffered: str = asyncio.run(run(Path(directory) / f'{name}-buffered.db', pragmas, buffered=True, keys=args.keys, **options))
+            print(f'{name}, {args.keys} keys: direct upsert {direct}; WriteBuffer {buffered}')
+        # every write has a new key, so the buffer fills and writes wait for flushes
+        distinct: str = asyncio.run(run(Path(directory) / 'WAL-distinct.db', Pragmas.wal(), buffered=True, keys=args.writes, **options))
+        print(f'WAL, {args.writes} distinct keys: WriteBuffer {distinct}')
+
+
+if __name__ == '__main__':
+    main()
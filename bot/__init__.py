@@ -1,11 +1,13 @@
-from typing import List
+import importlib
+from typing import TYPE_CHECKING, Any, Dict, List, Tuple
 
-from . import database
-
-from .core import Core
-from .settings import Settings
-from .configuration import Configuration, Section
-from .component import Component, Payload
+if TYPE_CHECKING:
+    from . import configuration, database
+    from .core import Core
+    from .settings import Settings
+    from .configuration import Configuration, Section
+    from .component import Component, Payload
+    from .events import listener
 
 """
 Bot
@@ -27,5 +29,43 @@ __all__: List[str] = [
     "Section",
 
     "Component",
-    "Payload"
-]
\ No newline at end of file
+    "Payload",
+
+    "listener"
+]
+
+_LAZY: Dict[str, Tuple[str, str]] = {
+    "database": (".database", ""),
+    "configuration": (".configuration", ""),
+
+    "Core": (".core", "Core"),
+    "Settings": (".settings", "Settings"),
+
+    "Configuration": (".configuration", "Configuration"),
+    "Section": (".configuration", "Section"),
+
+    "Component": (".component", "Component"),
+    "Payload": (".component", "Payload"),
+
+    "listener": (".events", "listener"),
+}
+"""
+The module and attribute of each public name.
+Names are imported on first access, so importing the package does not pull
+in discord.py or sqlite3 until they are needed.
+"""
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attribute = _LAZY[name]
+    except KeyError:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    module = importlib.import_module(module_name, __name__)
+    value: Any = getattr(module, attribute) if attribute else module
+    # cache the value so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -1,23 +1,33 @@
+from __future__ import annotations
+
 import argparse
 import asyncio
 import logging
+import multiprocessing
 import os
 import platform
+import re
+import signal
 import socket
 import sys
 from configparser import ParsingError
 from logging.config import fileConfig
 from pathlib import Path
 import traceback
-from typing import Optional
-
-import discord
+from typing import TYPE_CHECKING, List, Optional, Sequence, Tuple
 
 from .arguments import Arguments
+from .bundle import Bundle
+from .handover import Handover
+from .logs import QueueLogging, configure_filters
 
-from .core import Core
 from .settings import Settings
 
+# discord and the client are imported once needed, keeping --setup and --bundle runs lightweight
+if TYPE_CHECKING:
+    import discord
+    from .core import Core
+
 log: logging.Logger = logging.getLogger(__name__)
 
 TOKEN_VARIABLE_NAME: str = 'TOKEN'
@@ -31,6 +41,13 @@ def get_token(environment_variable_name: str) -> str:
         raise Exception(f'A Discord Developer bot token was not found for environment variable {environment_variable_name}')
     return token
 
+def get_identity_variable(config: Path) -> str:
+    """
+    Retrieves the environment variable holding the token of an additional identity,
+    `TOKEN_` followed by the upper-cased name of its configuration directory.
+    """
+    return f'{TOKEN_VARIABLE_NAME}_{re.sub(r"[^0-9A-Za-z]", "_", config.resolve().name).upper()}'
+
 def get_logging_config(args: Arguments) -> Path:
     path: Optional[Path] = args.logging
     if not isinstance(path, Path):
@@ -38,19 +55,216 @@ def get_logging_config(args: Arguments) -> Path:
     return path
 
 
+def configure_loop(loop: str) -> None:
+    """
+    Installs the event loop policy for the requested loop implementation.
+    Falls back to the default loop if the implementation is unavailable.
+    """
+    if loop == 'uvloop':
+        try:
+            import uvloop
+        except ImportError:
+            log.warning('uvloop is not installed, using the default event loop.')
+            return
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        log.info('Using uvloop v%s', uvloop.__version__)
+
+
+def configure_tasks(eager: bool) -> None:
+    """
+    Enables eager task execution on the running loop if requested and supported.
+    """
+    if not eager: return
+    if sys.version_info < (3, 12):
+        log.warning('Eager task execution requires Python 3.12 or later.')
+        return
+    asyncio.get_running_loop().set_task_factory(asyncio.eager_task_factory)
+    log.info('Using eager task execution')
+
+
+def configure_signals(*clients: Core) -> None:
+    """
+    Shuts the clients down gracefully when the process receives SIGTERM or SIGINT.
+    Signal handlers are unavailable on Windows, where interrupts cancel the clients instead.
+    """
+    def shutdown(signum: signal.Signals) -> None:
+        log.info('Received %s, shutting down', signum.name)
+        for client in clients: asyncio.ensure_future(client.close())
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    for signum in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(signum, shutdown, signum)
+        except (NotImplementedError, RuntimeError):
+            pass
+
+
 async def main(client: Core, token: str) -> None:
+    # apply the task factory before the client creates any tasks
+    configure_tasks(args.use_eager_tasks)
+    configure_signals(client)
+    handover: Optional[Handover] = Handover(args.handover) if args.handover else None
     try:
-        await client.start(token)
+        # replace the process running on the handover socket if there is one
+        if handover and await handover.connect():
+            await take_over(client, token, handover)
+        else:
+            if handover: await handover.serve(client)
+            await client.start(token)
     except Exception as error:
         log.error(error)
         raise
     finally:
         await client.close()
+        if handover: await handover.close()
+
+
+async def run_identities(identities: Sequence[Tuple[Core, str]]) -> None:
+    """
+    Runs a client per identity on the running loop until every client closes.
+    A client failing to start is logged and does not stop the others.
+    """
+    from .memory import log_identity_report
+    # apply the task factory before the clients create any tasks
+    configure_tasks(args.use_eager_tasks)
+    clients: List[Core] = [client for client, _ in identities]
+    configure_signals(*clients)
+
+    async def report() -> None:
+        # report memory once every identity has loaded its components
+        await asyncio.gather(*(client.wait_until_loaded() for client in clients))
+        log_identity_report(clients)
+
+    reporter: asyncio.Task[None] = asyncio.create_task(report())
+    try:
+        results: List[Optional[BaseException]] = await asyncio.gather(*(client.start(token) for client, token in identities), return_exceptions=True)
+        for index, result in enumerate(results):
+            if isinstance(result, Exception): log.error(f'Identity {index}: {result}')
+    finally:
+        reporter.cancel()
+        await asyncio.gather(*(client.close() for client in clients))
+
+
+async def take_over(client: Core, token: str, handover: Handover) -> None:
+    """
+    Loads components, connecting to the gateway first on standby, and takes over
+    from the running process once ready. If the running process exits before handing
+    over, the client starts handling interactions and events immediately.
+    """
+    connection: Optional[asyncio.Task[None]] = None
+    if args.use_standby:
+        # connect alongside the running process without handling interactions or events
+        client.standby = True
+        connection = asyncio.create_task(client.start(token))
+        loaded: asyncio.Task[None] = asyncio.create_task(client.wait_until_loaded())
+        await asyncio.wait({connection, loaded}, return_when=asyncio.FIRST_COMPLETED)
+        # surface a failure to connect before components were loaded
+        if connection.done():
+            loaded.cancel()
+            return await connection
+    else:
+        # load components before connecting
+        await client.login(token)
+        await client.__load__()
+
+    try:
+        elapsed: float = await handover.take_over()
+        log.info(f'Took over from the running process in {elapsed * 1000:.1f}ms')
+    except ConnectionError as error:
+        # the running process is gone, so there is nothing to wait for before handling interactions
+        log.warning(f'Taking over without a handover: {error}')
+    client.standby = False
+    # listen for the next replacement process
+    await handover.serve(client)
+    if not connection: connection = asyncio.create_task(client.connect())
+    await asyncio.gather(handover.wait_closed(), connection)
+
+
+async def fetch_shard_count(token: str) -> int:
+    """
+    Retrieves the shard count recommended by Discord for the bot.
+    """
+    import discord
+    client: discord.Client = discord.Client(intents=discord.Intents.none())
+    try:
+        await client.login(token)
+        shard_count, _, _ = await client.http.get_bot_gateway()
+        return shard_count
+    finally:
+        await client.close()
+
+
+def partition_shards(shard_count: int, processes: int) -> List[List[int]]:
+    """
+    Splits shard IDs into contiguous ranges, one per process.
+    """
+    # never launch more processes than there are shards
+    processes = max(1, min(processes, shard_count))
+    # distribute the remainder across the first processes
+    size, remainder = divmod(shard_count, processes)
+    ranges: List[List[int]] = list()
+    start: int = 0
+    for index in range(processes):
+        end: int = start + size + (1 if index < remainder else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def run_shards(config_path: Path, shard_ids: List[int], shard_count: int, token: str) -> None:
+    """
+    Runs a `ShardedCore` client for a range of shards.
+    Used as the entry point of each shard process.
+    """
+    logging_config: Optional[Path] = args.logging
+    if logging_config: configure_logger(logging_config)
+    queue_logging: Optional[QueueLogging] = configure_queue_logging(args)
+    log.info('Starting shards %d-%d of %d', shard_ids[0], shard_ids[-1], shard_count)
+    configure_loop(args.loop)
+    from .core import ShardedCore
+    try:
+        settings: Settings = Settings(config_path, args=args)
+        client: Core = ShardedCore(settings, shard_ids=shard_ids, shard_count=shard_count)
+        asyncio.run(main(client, token))
+    except KeyboardInterrupt:
+        log.info('Shards %d-%d stopped.', shard_ids[0], shard_ids[-1])
+    finally:
+        if queue_logging: queue_logging.stop()
+
+
+def launch_shards(config_path: Path, shard_count: int, processes: int, token: str) -> None:
+    """
+    Launches shard processes, each owning a contiguous range of shard IDs,
+    and waits for all of them to exit.
+    """
+    # retrieve the recommended shard count if one was not configured
+    if not shard_count: shard_count = asyncio.run(fetch_shard_count(token))
+    ranges: List[List[int]] = partition_shards(shard_count, processes)
+    log.info('Launching %d shards across %d processes', shard_count, len(ranges))
+
+    workers: List[multiprocessing.Process] = [multiprocessing.Process(target=run_shards, args=(config_path, shard_ids, shard_count, token), name=f'Shards-{shard_ids[0]}-{shard_ids[-1]}') for shard_ids in ranges]
+    for worker in workers: worker.start()
+    try:
+        for worker in workers: worker.join()
+    finally:
+        for worker in workers:
+            if worker.is_alive(): worker.terminate()
+
+
+def create_client(settings: Settings) -> Core:
+    """
+    Initializes a sharded client if sharding was configured, otherwise the Core client.
+    """
+    from .core import Core, ShardedCore
+    shard_count: int = settings.client.general.shard_count
+    shard_ids: List[int] = settings.client.general.shard_ids
+    return ShardedCore(settings, shard_ids=shard_ids or None, shard_count=shard_count or None) if shard_count or shard_ids else Core(settings)
 
 
 def configure_logger(config: Path, recurse: bool = True) -> None:
     try:
         fileConfig(config)
+        configure_filters(config)
     except ValueError as error:
         log.warning(error)
     except KeyError as error:
@@ -63,6 +277,15 @@ def configure_logger(config: Path, recurse: bool = True) -> None:
         if not recurse: raise 
         return configure_logger(config, recurse=False)
     
+def configure_queue_logging(args: Arguments) -> Optional[QueueLogging]:
+    """
+    Moves the configured log handlers behind a bounded queue if requested.
+    """
+    if not args.log_queue: return None
+    queue_logging: QueueLogging = QueueLogging(maxsize=args.log_queue, policy=args.log_drop)
+    queue_logging.start()
+    return queue_logging
+
 def display_metadata(settings: Settings) -> None:
     log.info(f'{platform.system()} {platform.machine()} @ {socket.gethostbyname(socket.gethostname())}')
     log.info(f'')
@@ -74,8 +297,16 @@ if __name__ == '__main__':
         settings: Settings = Settings(config_path, args=args)
         settings.__setup__()
         sys.exit()
+    if args.bundle:
+        settings: Settings = Settings(config_path, args=args)
+        Bundle.pack(settings.client.loader.directory, args.bundle)
+        sys.exit()
 
+    queue_logging: Optional[QueueLogging] = None
     try:
+        import discord
+        from .core import Core
+
         log.info('Bot started.')
         log.info('Using Python v%s', platform.python_version())
         log.info('Using Discord.py v%s', discord.__version__)
@@ -84,6 +315,8 @@ if __name__ == '__main__':
         logging_config: Path = get_logging_config(args)
         # configure the logger
         configure_logger(logging_config)
+        # route log records through a queue if requested
+        queue_logging = configure_queue_logging(args)
 
         # initialize the settings instance
         settings: Settings = Settings(config_path, args=args)
@@ -92,10 +325,27 @@ if __name__ == '__main__':
 
         # retrieve the token from the environment
         token: str = get_token(TOKEN_VARIABLE_NAME)
-        # initialize the Core client
-        client: Core = Core(settings)
-        # start the main async loop
-        asyncio.run(main(client, token))
+        # install the requested event loop implementation
+        configure_loop(args.loop)
+        # retrieve the shard configuration
+        shard_count: int = settings.client.general.shard_count
+        processes: int = settings.client.general.processes
+
+        # launch a process per shard range if multiple processes were requested
+        if processes > 1:
+            launch_shards(config_path, shard_count, processes, token)
+        # run a client per identity on one loop if additional identities were provided
+        elif args.identities:
+            identities: List[Tuple[Core, str]] = [(create_client(settings), token)]
+            for path in args.identities:
+                identity: Settings = Settings(path, args=args)
+                identity.__check__('--setup')
+                identities.append((create_client(identity), get_token(get_identity_variable(path))))
+            log.info('Running %d identities in one process', len(identities))
+            asyncio.run(run_identities(identities))
+        else:
+            # start the main async loop
+            asyncio.run(main(create_client(settings), token))
 
     except KeyboardInterrupt:
         log.info('Bot stopped.')
@@ -104,5 +354,7 @@ if __name__ == '__main__':
         if args.use_verbose:
             traceback.print_exception(error)
     finally:
+        # flush queued log records
+        if queue_logging: queue_logging.stop()
         input('Press enter to exit...')
         sys.exit()
\ No newline at end of file
@@ -1,7 +1,7 @@
 import argparse
 import logging
 from pathlib import Path
-from typing import Any, Optional
+from typing import Any, List, Optional
 
 
 log: logging.Logger = logging.getLogger(__name__)
@@ -20,7 +20,18 @@ class Arguments():
         parser.add_argument('--config', type=Path, help='The directory to store configuration data.')
         parser.add_argument('--logging', type=Path, help='A path referencing the logging configuration file.')
         parser.add_argument('--components', type=Path, help='The directory containing components to load.')
+        parser.add_argument('--log-queue', type=int, help='Write log records from a background thread through a queue of this size.')
+        parser.add_argument('--log-drop', choices=['newest', 'oldest'], default='newest', help='Which log record to drop when the logging queue is full.')
+        parser.add_argument('--loop', choices=['default', 'uvloop'], default='default', help='The event loop implementation to use.')
+        parser.add_argument('--eager-tasks', action='store_true', help='Run new tasks eagerly until their first suspension (Python 3.12+).')
+        parser.add_argument('--bundle', type=Path, help='A zip archive to pack the components directory into.')
         parser.add_argument('--permissions', type=int)
+        parser.add_argument('--shards', type=int, help='The total number of shards across all processes.')
+        parser.add_argument('--shard-ids', type=str, help='The shard IDs to run in this process (e.g. 0-3 or 0,2,4).')
+        parser.add_argument('--processes', type=int, help='The number of shard processes to launch.')
+        parser.add_argument('--identity', type=Path, action='append', help='The configuration directory of an additional bot identity to run in this process.')
+        parser.add_argument('--handover', type=Path, help='A local socket path used to hand over from a running process without downtime.')
+        parser.add_argument('--standby', action='store_true', help='Connect to the gateway before taking over from a running process.')
         self._arguments: argparse.Namespace = parser.parse_args()
     
     @property
@@ -35,11 +46,57 @@ class Arguments():
     def permissions(self) -> Optional[int]:
         return self._arguments.permissions if self._arguments.permissions else 3276799
     
+    @property
+    def shard_count(self) -> Optional[int]:
+        return self._arguments.shards if self._arguments.shards else None
+    
+    @property
+    def shard_ids(self) -> Optional[str]:
+        return self._arguments.shard_ids if self._arguments.shard_ids else None
+    
+    @property
+    def processes(self) -> Optional[int]:
+        return self._arguments.processes if self._arguments.processes else None
+    
+    @property
+    def identities(self) -> List[Path]:
+        return self._arguments.identity if self._arguments.identity else []
+    
+    @property
+    def handover(self) -> Optional[Path]:
+        return self._arguments.handover if self._arguments.handover else None
+    
+    @property
+    def use_standby(self) -> bool:
+        return self._arguments.standby if self._arguments.standby else False
+    
     @property
     def directory(self) -> Optional[Path]:
         return self._arguments.components if self._arguments.components else None
     
 
+    @property
+    def bundle(self) -> Optional[Path]:
+        return self._arguments.bundle if self._arguments.bundle else None
+    
+
+    @property
+    def log_queue(self) -> Optional[int]:
+        return self._arguments.log_queue if self._arguments.log_queue else None
+    
+    @property
+    def log_drop(self) -> str:
+        return self._arguments.log_drop if self._arguments.log_drop else 'newest'
+    
+    @property
+    def loop(self) -> str:
+        return self._arguments.loop if self._arguments.loop else 'default'
+    
+    @property
+    def use_eager_tasks(self) -> bool:
+        return self._arguments.eager_tasks if self._arguments.eager_tasks else False
+    
+
     @property
     def use_verbose(self) -> bool:
         return self._arguments.verbose if self._arguments.verbose else False
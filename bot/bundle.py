@@ -0,0 +1,131 @@
+import importlib.util
+import logging
+import py_compile
+import tempfile
+import zipfile
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from types import CodeType, ModuleType
+from typing import List, Optional
+from zipimport import zipimporter
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+SOURCE_SUFFIX: str = '.py'
+"""The suffix of source files stored in a bundle"""
+
+BYTECODE_SUFFIX: str = '.pyc'
+"""The suffix of bytecode files stored in a bundle"""
+
+
+class Bundle():
+    """
+    A zip archive of component modules and their precompiled bytecode.
+
+    Modules are imported directly from the archive via `zipimport`, which
+    reads the archive's directory once instead of statting and opening each
+    component file individually.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initializes a reference to a bundle on disk.
+
+        Args:
+            path: A reference to a zip archive.
+
+        Raises:
+            ValueError: If the provided path does not reference a zip archive
+        """
+        if not zipfile.is_zipfile(path): raise ValueError(f'{path.name}: Not a zip archive')
+        self._path: Path = path.absolute().resolve()
+        self._importer: zipimporter = zipimporter(str(self._path))
+
+    @property
+    def name(self) -> str:
+        """The name of the bundle."""
+        return self._path.name
+
+    @property
+    def path(self) -> Path:
+        """The absolute path of the bundle."""
+        return self._path
+
+    @property
+    def modules(self) -> List[str]:
+        """The names of all top-level modules contained in the bundle."""
+        with zipfile.ZipFile(self._path) as archive:
+            # get the paths of all top-level entries in the archive
+            entries: List[Path] = [Path(name) for name in archive.namelist() if '/' not in name]
+        # get the unique module names of source and bytecode entries
+        names: List[str] = [entry.stem for entry in entries if entry.suffix in (SOURCE_SUFFIX, BYTECODE_SUFFIX)]
+        return sorted(set(names))
+
+    def get_module_spec(self, name: str) -> ModuleSpec:
+        """
+        Retrieves the module spec for a module contained in the bundle.
+
+        Raises:
+            ValueError: If no spec is available for the module
+        """
+        # zipimporter only provides module specs from Python 3.10
+        spec: Optional[ModuleSpec] = self._importer.find_spec(name) if hasattr(self._importer, 'find_spec') else self._find_legacy_spec(name)
+        if not spec: raise ValueError(f'{self.name}: No spec available for module {name}.')
+        return spec
+
+    def _find_legacy_spec(self, name: str) -> Optional[ModuleSpec]:
+        """
+        Retrieves a module spec from a zipimporter without `find_spec`, wrapping it in a loader providing `exec_module`.
+        """
+        if self._importer.find_module(name) is None: return None
+        return importlib.util.spec_from_loader(name, _LegacyLoader(self._importer), origin=self._importer.get_filename(name), is_package=self._importer.is_package(name))
+
+    @classmethod
+    def pack(cls, directory: Path, path: Path, *, extension: str = 'py') -> 'Bundle':
+        """
+        Packs all component modules in a directory into a bundle.
+        Each module is stored alongside bytecode compiled with unchecked hash
+        invalidation, so importing from the bundle never recompiles. The bytecode
+        is compiled to a temporary directory, leaving the directory's `__pycache__` untouched.
+
+        Args:
+            directory: The directory containing components to pack.
+            path: A reference to the zip archive to create.
+            extension: The file extension of component modules.
+        """
+        # get all files with filenames matching the extension in the provided directory
+        file_objects: List[Path] = sorted(file for file in directory.glob(f'*.{extension}') if file.is_file())
+        # create the parent directory of the bundle
+        path.parent.mkdir(parents=True, exist_ok=True)
+
+        with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_STORED) as archive, tempfile.TemporaryDirectory() as temporary:
+            for file_object in file_objects:
+                # compile the module to bytecode outside the bytecode cache, which must keep checking the source
+                bytecode: str = py_compile.compile(str(file_object), cfile=str(Path(temporary) / f'{file_object.stem}{BYTECODE_SUFFIX}'), doraise=True, invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH)
+                # store the module source
+                archive.write(file_object, arcname=f'{file_object.stem}{SOURCE_SUFFIX}')
+                # store the module bytecode
+                archive.write(bytecode, arcname=f'{file_object.stem}{BYTECODE_SUFFIX}')
+                log.debug('Packed %s into %s', file_object.name, path.name)
+
+        log.info('Packed %d modules into %s', len(file_objects), path.name)
+        return cls(path)
+
+
+class _LegacyLoader():
+    """
+    Adapts a zipimporter without `exec_module`, as on Python 3.9, to the loader protocol.
+    """
+
+    def __init__(self, importer: zipimporter) -> None:
+        self._importer: zipimporter = importer
+
+    def create_module(self, spec: ModuleSpec) -> Optional[ModuleType]:
+        # use the default module creation
+        return None
+
+    def exec_module(self, module: ModuleType) -> None:
+        # execute the module's bytecode, or its compiled source, in the module namespace
+        code: CodeType = self._importer.get_code(module.__name__)
+        exec(code, module.__dict__)
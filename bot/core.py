@@ -1,16 +1,86 @@
+import asyncio
+import inspect
 import logging
+import sys
+import time
+import weakref
 from logging import Logger
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from types import CodeType, ModuleType
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Union
 
-from discord import Client, Intents
-from discord.app_commands import CommandTree
+from discord import AutoShardedClient, Client, Intents, Interaction, MemberCacheFlags, Object
+from discord.app_commands import AppCommandError, CheckFailure, CommandTree
 
+from . import intents
 from .loader import Loader
+from .memory import get_rss, log_cache_report
+from .monitor import LagMonitor
 from .settings import Settings
+from .settings.data import LoaderSection
+from .settings.general import GeneralSection
 
 log: Logger = logging.getLogger(__name__)
 
+_load_locks: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Lock]' = weakref.WeakKeyDictionary()
+"""The lock serializing component loads between the clients running on each event loop"""
+
+Flush = Callable[[], Union[None, Awaitable[None]]]
+
+
+def _get_load_lock() -> asyncio.Lock:
+    """
+    Retrieves the lock serializing component loads on the running event loop.
+    """
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    lock: Optional[asyncio.Lock] = _load_locks.get(loop)
+    if not lock: lock = _load_locks[loop] = asyncio.Lock()
+    return lock
+
+
+class DrainingTree(CommandTree):
+    """
+    A `CommandTree` that tracks the tasks running its commands, and rejects
+    new interactions once it is closed so that running commands can drain.
+    """
+
+    def __init__(self, client: Client, **options: Any) -> None:
+        super().__init__(client, **options)
+        self._closed: bool = False
+        self._tasks: Set[asyncio.Task[Any]] = set()
+
+    @property
+    def tasks(self) -> Set[asyncio.Task[Any]]:
+        """The tasks running commands that have not completed."""
+        return self._tasks
+
+    def close(self) -> None:
+        """
+        Stops accepting new interactions.
+        """
+        self._closed = True
+
+    async def interaction_check(self, interaction: Interaction, /) -> bool:
+        # leave interactions to the active process during a handover
+        if getattr(self.client, 'standby', False): return False
+        if self._closed:
+            # let the user know the command was not run
+            if not interaction.response.is_done(): await interaction.response.send_message('The bot is restarting, please try again shortly.', ephemeral=True)
+            return False
+        # track the task running the command until it completes
+        task: Optional[asyncio.Task[Any]] = asyncio.current_task()
+        if task:
+            # name the task after the command rather than the tree's generic invoker
+            if interaction.command: task.set_name(f'/{interaction.command.qualified_name}')
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return True
+
+    async def on_error(self, interaction: Interaction, error: AppCommandError, /) -> None:
+        # interactions rejected while closing or on standby are expected
+        if (self._closed or getattr(self.client, 'standby', False)) and isinstance(error, CheckFailure): return
+        await super().on_error(interaction, error)
+
 
 class Core(Client):
 
@@ -22,17 +92,117 @@ class Core(Client):
     def directory(self) -> Path:
         return self._settings.client.loader.directory
 
+    @property
+    def is_primary(self) -> bool:
+        """
+        Whether this client is responsible for syncing application commands.
+        """
+        return True
 
-    def __init__(self, settings: Settings) -> None:
+
+    def __init__(self, settings: Settings, **options: Any) -> None:
         self._settings: Settings = settings
-        super().__init__(intents=Intents(self.permissions))
+        self._flushes: List[Flush] = list()
+        self._shutdown: Optional[asyncio.Task[None]] = None
+        # the tasks that called close, such as a command shutting the bot down, which are not drained
+        self._closers: Set[asyncio.Task[Any]] = set()
+        # created on first use, as it binds to the current event loop when created on Python 3.9
+        self._loaded_event: Optional[asyncio.Event] = None
+        self.standby: bool = False
+        """Whether the client leaves interactions and events to another process, such as during a handover."""
+        self.load_rss: int = 0
+        """The growth in resident set size, in bytes, while components were loaded."""
+        super().__init__(intents=self.__intents__(), **self.__cache_options__(), **options)
+
+
+    @property
+    def _loaded(self) -> asyncio.Event:
+        """Set once components have been loaded."""
+        if not self._loaded_event: self._loaded_event = asyncio.Event()
+        return self._loaded_event
+
+
+    def __cache_options__(self) -> Dict[str, Any]:
+        """
+        Determines the cache limits to apply to the client.
+        """
+        general: GeneralSection = self._settings.client.general
+        options: Dict[str, Any] = {'max_messages': general.max_messages}
+        # only override the defaults derived from intents when configured
+        member_cache_flags: Optional[MemberCacheFlags] = general.member_cache_flags
+        if member_cache_flags is not None: options['member_cache_flags'] = member_cache_flags
+        chunk_guilds_at_startup: Optional[bool] = general.chunk_guilds_at_startup
+        if chunk_guilds_at_startup is not None: options['chunk_guilds_at_startup'] = chunk_guilds_at_startup
+        return options
+
+
+    def __intents__(self) -> Intents:
+        """
+        Determines the gateway intents to connect with.
+        """
+        # get the intents from the permissions integer
+        configured: Intents = Intents(self.permissions)
+        # use the configured intents unless they should be derived from components
+        if not self._settings.client.loader.derive_intents: return configured
+
+        loader: LoaderSection = self._settings.client.loader
+        # fingerprint the components directory
+        manifest: str = intents.get_manifest(self.directory, loader.isolated)
+        try:
+            # use the cached intents if the components are unchanged
+            if loader.manifest != manifest: raise ValueError('manifest: Components changed')
+            derived: Intents = Intents(loader.intents)
+            log.debug('Using cached intents %d', derived.value)
+        except ValueError:
+            # derive the intents from the components
+            derived = intents.discover(self.directory, loader.isolated)
+            loader.intents = derived.value
+            loader.manifest = manifest
+            log.debug('Derived intents %d from components', derived.value)
+
+        # never request intents beyond the configured intents
+        derived = derived & configured
+        # get a single name for each single-bit intent, skipping aliases
+        flags: Dict[int, str] = dict()
+        for flag, value in Intents.VALID_FLAGS.items():
+            if value & (value - 1) == 0: flags.setdefault(value, flag)
+        # get the name of each intent that was dropped
+        dropped: List[str] = [flag for value, flag in flags.items() if configured.value & value and not derived.value & value]
+        log.info(f'Connecting with derived intents {derived.value}, dropping {len(dropped)} intents: {", ".join(dropped)}')
+        log.info(f'Estimated gateway event volume reduced by {intents.estimate_savings(configured, derived):.0%}')
+        return derived
+
+
+    async def setup_hook(self) -> None:
+        # start monitoring event loop lag unless disabled
+        threshold: float = self._settings.client.general.lag_threshold
+        if threshold > 0:
+            # share one monitor between the clients on the loop, so that each stall is logged once
+            self._monitor: LagMonitor = LagMonitor.acquire(resolver=self.__source__, threshold=threshold)
+
+
+    def __source__(self, code: CodeType) -> Optional[str]:
+        """
+        Retrieves the component command or listener a code object belongs to.
+        """
+        loader: Optional[Loader] = getattr(self, '_loader', None)
+        return loader.sources.get(code) if loader else None
+
+
+    def dispatch(self, event_name: str, /, *args: Any, **kwargs: Any) -> None:
+        super().dispatch(event_name, *args, **kwargs)
+        # route the event to component listeners once components are loaded
+        loader: Optional[Loader] = getattr(self, '_loader', None)
+        if loader and not self.standby: loader.router.dispatch(event_name, *args, **kwargs)
 
 
     async def on_ready(self):
-        # call load hook
-        await self.__load__()
+        # call load hook unless components were loaded before connecting
+        if not self._loaded.is_set(): await self.__load__()
         # log ready status
         log.info("Ready!")
+        # log the memory held by each cache
+        log_cache_report(self)
 
 
     async def __load__(self) -> None:
@@ -40,12 +210,17 @@ class Core(Client):
         Calls necessary logic for loading application commands
         """
         # determine whether to sync application commands
-        sync: bool = self._settings.client.loader.sync
+        sync: bool = self._settings.client.loader.sync and self.is_primary
         # determine whether to reset application commands
         clear: bool = self._settings.client.loader.reset
+        # determine which guilds to sync application commands to
+        guilds: List[int] = self._settings.client.loader.guilds
+        # determine whether global commands are copied to those guilds instead of synced globally
+        copy_global: bool = self._settings.client.loader.copy_global and bool(guilds)
 
         # initialize the command loader
-        self._loader: Loader = Loader(CommandTree(self), settings=self._settings, client=self)
+        self._tree: DrainingTree = DrainingTree(self)
+        self._loader: Loader = Loader(self._tree, settings=self._settings, client=self)
 
         if clear:
             log.info(f'Clearing application commands')
@@ -58,11 +233,131 @@ class Core(Client):
             # initialize kwargs to be passed to the command loader
             kwargs: Dict[str, Any] = { }
             log.info('Loading application commands')
-            # load components from the directory
-            await self._loader.load(self.directory, extension='py', loop=self.loop, *args, **kwargs)
+            # load one client at a time, so that the memory growth measured belongs to this client
+            async with _get_load_lock():
+                # measure the memory used by loading components
+                rss: int = get_rss()
+                # load components from the directory
+                await self._loader.load(self.directory, extension='py', loop=self.loop, *args, **kwargs)
+                self.load_rss = max(get_rss() - rss, 0)
 
-        if sync:
+        # skip the global sync when global commands are copied to guilds, so that they are not listed twice
+        if sync and not copy_global:
             log.info(f'Syncing application commands')
             # sync the loader's commands
             await self._loader.sync(guild=None)
 
+        if sync and guilds:
+            log.info(f'Syncing application commands to {len(guilds)} guilds')
+            # sync the loader's commands to each guild
+            await self._loader.sync_guilds([Object(id=guild) for guild in guilds], copy_global=copy_global, concurrency=self._settings.client.loader.sync_concurrency, rate=self._settings.client.loader.sync_rate)
+
+        self._loaded.set()
+
+
+    async def wait_until_loaded(self) -> None:
+        """
+        Waits until components have been loaded.
+        """
+        await self._loaded.wait()
+
+
+    def add_flush(self, callback: Flush) -> None:
+        """
+        Registers a callable, or coroutine function, that persists buffered state
+        during shutdown. Callbacks are called in registration order after running
+        commands and listeners have drained.
+        """
+        self._flushes.append(callback)
+
+
+    async def close(self) -> None:
+        """
+        Shuts down gracefully and closes the connection to Discord.
+        Concurrent and repeated calls wait for the same shutdown.
+        """
+        # the shutdown runs in its own task, so remember the caller to keep it from waiting on itself
+        caller: Optional[asyncio.Task[Any]] = asyncio.current_task()
+        if caller: self._closers.add(caller)
+        if not self._shutdown: self._shutdown = asyncio.ensure_future(self.__shutdown__())
+        await asyncio.shield(self._shutdown)
+
+
+    async def __shutdown__(self) -> None:
+        """
+        Stops accepting interactions, drains running commands and listeners until
+        the shutdown timeout, cancels component background tasks, flushes buffered
+        state and reports any work that was cut off.
+        """
+        start: float = time.perf_counter()
+        timeout: float = self._settings.client.general.shutdown_timeout
+        tree: Optional[DrainingTree] = getattr(self, '_tree', None)
+        loader: Optional[Loader] = getattr(self, '_loader', None)
+
+        # stop accepting new interactions and routing new events
+        if tree: tree.close()
+        if loader: loader.router.close()
+
+        # wait for running commands and listeners until the deadline
+        running: Set[asyncio.Task[Any]] = set()
+        if tree: running.update(tree.tasks)
+        if loader: running.update(loader.router.tasks)
+        running.difference_update(self._closers)
+        if running: log.info(f'Draining {len(running)} running commands and listeners')
+        _, pending = await asyncio.wait(running, timeout=timeout) if running else (set(), set())
+        # cancel the commands and listeners that did not finish in time
+        for task in pending: task.cancel()
+        if pending: await asyncio.wait(pending)
+        interrupted: List[str] = sorted(task.get_name() for task in pending)
+
+        # cancel component background tasks and stop worker processes
+        cancelled: List[str] = await loader.close() if loader else []
+
+        # flush write buffers that were never closed, before components close their databases,
+        # without importing the database package if no component has
+        writebuffer: Optional[ModuleType] = sys.modules.get(f'{__package__}.database.writebuffer')
+        if writebuffer: await writebuffer.WriteBuffer.flush_open()
+        # flush buffered component and client state
+        if loader: await loader.flush()
+        for flush in self._flushes:
+            try:
+                result: Optional[Awaitable[None]] = flush()
+                if inspect.isawaitable(result): await result
+            except Exception as error:
+                log.warning(f'{getattr(flush, "__qualname__", flush)}: An error occurred during flush: {error}')
+
+        # report what was cut off
+        for name in interrupted: log.warning(f'Cancelled {name} after the {timeout:g}s shutdown timeout')
+        for name in cancelled: log.warning(f'Cancelled background task {name}')
+        log.info(f'Shut down in {time.perf_counter() - start:.2f}s: {len(running) - len(pending)} drained, {len(pending)} interrupted, {len(cancelled)} background tasks cancelled')
+
+        # stop monitoring event loop lag
+        monitor: Optional[LagMonitor] = getattr(self, '_monitor', None)
+        if monitor: await monitor.release(self.__source__)
+        await super().close()
+
+
+class ShardedCore(Core, AutoShardedClient):
+    """
+    A `Core` client connecting through one or more gateway shards.
+    """
+
+    @property
+    def is_primary(self) -> bool:
+        """
+        Whether this client runs shard 0, and is therefore responsible for
+        syncing application commands on behalf of every shard process.
+        """
+        return self.shard_ids is None or 0 in self.shard_ids
+
+
+    def __init__(self, settings: Settings, *, shard_ids: Optional[List[int]] = None, shard_count: Optional[int] = None) -> None:
+        """
+        Initializes a `ShardedCore` client.
+
+        Args:
+            settings: The settings used by the client.
+            shard_ids: The shard IDs to run in this client, or None to run every shard.
+            shard_count: The total number of shards, or None to use the count recommended by Discord.
+        """
+        super().__init__(settings, shard_ids=shard_ids, shard_count=shard_count)
@@ -1,14 +1,24 @@
 from typing import List
 
 from .database import Database
+from .asyncdatabase import AsyncDatabase
+from .pragmas import Pragmas
+from .writebuffer import WriteBuffer
+from .page import Page
 from .table import Table, TableBuilder
 from .column import Column, ColumnBuilder
+from .index import Index
 from .storable import TStorable
-from .clauses import WhereClause
+from .clauses import AndClause, BetweenClause, Clause, ComparisonClause, InClause, LikeClause, NotClause, NullClause, OrClause, WhereClause
+from .query import Query, QueryBuilder
 
 
 __all__: List[str] = [
     "Database",
+    "AsyncDatabase",
+    "Pragmas",
+    "WriteBuffer",
+    "Page",
     
     "Table",
     "TableBuilder",
@@ -16,7 +26,21 @@ __all__: List[str] = [
     "Column",
     "ColumnBuilder",
 
+    "Index",
+
     "TStorable",
 
+    "Clause",
     "WhereClause",
+    "ComparisonClause",
+    "InClause",
+    "BetweenClause",
+    "LikeClause",
+    "NullClause",
+    "AndClause",
+    "OrClause",
+    "NotClause",
+
+    "Query",
+    "QueryBuilder",
 ]
\ No newline at end of file
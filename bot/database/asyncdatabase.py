@@ -0,0 +1,283 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import sqlite3
+import threading
+from functools import partial
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from queue import SimpleQueue
+from typing import Any, AsyncIterator, Callable, Dict, Generic, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, TypeVar, Union
+
+from .clauses import Clause
+from .database import DEFAULT_CHUNK_SIZE, Database
+from .page import Page
+from .pragmas import Pragmas
+from .query import Query
+from .storable import TStorable
+
+log: logging.Logger = logging.getLogger(__name__)
+
+TResult = TypeVar('TResult')
+
+
+class Job(Generic[TResult]):
+    """
+    A call to a `Database` method queued for the connection thread.
+    """
+
+    def __init__(self, method: Callable[..., TResult], args: Tuple[Any, ...], kwargs: Dict[str, Any], future: asyncio.Future[TResult]) -> None:
+        self.method: Callable[..., TResult] = method
+        self.args: Tuple[Any, ...] = args
+        self.kwargs: Dict[str, Any] = kwargs
+        self.future: asyncio.Future[TResult] = future
+
+
+def _interruptible(items: Iterable[TStorable], cancelled: threading.Event) -> Iterator[TStorable]:
+    """
+    Yields the items until the event is set, then raises the error of an interrupted statement
+    so that the enclosing transaction is rolled back.
+    """
+    for item in items:
+        if cancelled.is_set(): raise sqlite3.OperationalError('interrupted')
+        yield item
+
+
+class AsyncDatabase():
+    """
+    An asyncio facade over `Database` that runs every statement on a dedicated
+    connection thread fed by a queue, so queries never block the event loop.
+
+    Statements run one at a time in submission order, except that with read-only
+    connections selects run in parallel on a pool of reader threads while a read-only
+    connection is free, and on the connection thread otherwise. Cancelling a call that
+    has not started removes it from the queue; cancelling a call that is running
+    interrupts its statement, rolling back any uncommitted changes. Changes
+    committed before the cancellation arrives are kept.
+    """
+
+    def __init__(self, reference: Path, detect_types: int = sqlite3.PARSE_DECLTYPES, *, chunk_size: int = DEFAULT_CHUNK_SIZE, pragmas: Optional[Pragmas] = None, readers: int = 0) -> None:
+        """
+        Initializes an `AsyncDatabase` and connects to the database on a new thread.
+
+        Args:
+            reference: A reference to the database file.
+            detect_types: The type detection flags passed to `sqlite3.connect`.
+            chunk_size: The number of rows sent to `executemany` at once by bulk operations, and fetched at once by `iter_select`.
+            pragmas: The pragmas applied to each connection, or None for the SQLite defaults.
+            readers: The number of read-only connections, and threads, used to run selects in parallel.
+        """
+        self._executor: Optional[ThreadPoolExecutor] = ThreadPoolExecutor(readers, thread_name_prefix=f'{AsyncDatabase.__name__}-{reference.name}-reader') if readers else None
+        # the number of read-only connections not taken by a select or iteration, counted on the event loop
+        self._free: int = readers
+        self._chunk_size: int = chunk_size
+        self._jobs: SimpleQueue[Optional[Job[Any]]] = SimpleQueue()
+        self._lock: threading.Lock = threading.Lock()
+        self._running: Optional[Job[Any]] = None
+        self._database: Optional[Database] = None
+        self._error: Optional[BaseException] = None
+        self._closed: bool = False
+
+        # connect on the thread that will own the connection
+        connected: threading.Event = threading.Event()
+        self._thread: threading.Thread = threading.Thread(target=self._run, args=(reference, detect_types, chunk_size, pragmas, readers, connected), name=f'{AsyncDatabase.__name__}-{reference.name}', daemon=True)
+        self._thread.start()
+        connected.wait()
+        if self._error: raise self._error
+
+    async def create(self, type: Type[TStorable]) -> None:
+        return await self._submit(Database.create, type)
+
+    async def select(self, type: Type[TStorable], where: Optional[Union[Clause, Query]] = None) -> List[TStorable]:
+        return await self._read(Database.select, type, where)
+
+    async def project(self, type: Type[TStorable], query: Query) -> List[sqlite3.Row]:
+        return await self._read(Database.project, type, query)
+
+    async def iter_select(self, type: Type[TStorable], where: Optional[Union[Clause, Query]] = None, *, batch_size: Optional[int] = None) -> AsyncIterator[TStorable]:
+        """
+        Selects items lazily, fetching each batch of rows as the previous batch is consumed.
+        While a read-only connection is free, the iteration takes it and fetches its batches on a reader thread;
+        otherwise its batches are fetched on the connection thread, and other calls can run between them.
+
+        Args:
+            batch_size: The number of rows per batch, or None for the database chunk size.
+        """
+        size: int = batch_size if batch_size else self._chunk_size
+        # hold a read-only connection for the whole iteration if one is free, without waiting for one
+        reader: bool = self._take_reader()
+        iterator: Optional[Iterator[TStorable]] = None
+        try:
+            iterator = await self._call(reader, Database.iter_select, type, where, batch_size=size)
+            while True:
+                # build the next batch of items, taking the connection on the first batch
+                batch: List[TStorable] = await self._call(reader, lambda _: list(islice(iterator, size)))
+                if not batch: break
+                for item in batch: yield item
+        finally:
+            try:
+                # release the cursor and connection on the thread that fetched the batches, unless the threads have stopped
+                if iterator is not None and not self._closed and (self._executor or not reader): await asyncio.shield(self._call(reader, lambda _: iterator.close()))
+            finally:
+                if reader: self._free += 1
+
+    async def page(self, type: Type[TStorable], key: str, *, after: Optional[Any] = None, before: Optional[Any] = None, limit: int = 25, where: Optional[Clause] = None) -> Page[TStorable]:
+        return await self._read(Database.page, type, key, after=after, before=before, limit=limit, where=where)
+
+    async def insert(self, type: Type[TStorable], item: TStorable) -> None:
+        return await self._submit(Database.insert, type, item)
+
+    async def insert_many(self, type: Type[TStorable], items: Iterable[TStorable], *, chunk_size: Optional[int] = None) -> int:
+        """
+        Inserts many items in a single transaction. The items are iterated on the
+        connection thread, so a generator must not depend on the event loop.
+        """
+        return await self._submit_many(Database.insert_many, type, items, chunk_size=chunk_size)
+
+    async def update(self, type: Type[TStorable], item: TStorable, *, key: Optional[Sequence[str]] = None) -> int:
+        return await self._submit(Database.update, type, item, key=key)
+
+    async def update_many(self, type: Type[TStorable], items: Iterable[TStorable], *, key: Optional[Sequence[str]] = None, chunk_size: Optional[int] = None) -> int:
+        """
+        Updates many items in a single transaction. The items are iterated on the
+        connection thread, so a generator must not depend on the event loop.
+        """
+        return await self._submit_many(Database.update_many, type, items, key=key, chunk_size=chunk_size)
+
+    async def upsert(self, type: Type[TStorable], item: TStorable, *, key: Optional[Sequence[str]] = None) -> None:
+        return await self._submit(Database.upsert, type, item, key=key)
+
+    async def upsert_many(self, type: Type[TStorable], items: Iterable[TStorable], *, key: Optional[Sequence[str]] = None, chunk_size: Optional[int] = None) -> int:
+        """
+        Inserts or updates many items in a single transaction. The items are iterated
+        on the connection thread, so a generator must not depend on the event loop.
+        """
+        return await self._submit_many(Database.upsert_many, type, items, key=key, chunk_size=chunk_size)
+
+    async def delete(self, type: Type[TStorable], item: TStorable, *, key: Optional[Sequence[str]] = None) -> int:
+        return await self._submit(Database.delete, type, item, key=key)
+
+    async def delete_many(self, type: Type[TStorable], items: Iterable[TStorable], *, key: Optional[Sequence[str]] = None, chunk_size: Optional[int] = None) -> int:
+        """
+        Deletes many items in a single transaction. The items are iterated on the
+        connection thread, so a generator must not depend on the event loop.
+        """
+        return await self._submit_many(Database.delete_many, type, items, key=key, chunk_size=chunk_size)
+
+    async def delete_where(self, type: Type[TStorable], where: Clause) -> int:
+        return await self._submit(Database.delete_where, type, where)
+
+    async def close(self) -> None:
+        """
+        Waits for queued statements to complete, then closes the connection and stops the thread.
+        """
+        if self._closed or not self._thread.is_alive(): return
+        # wait for running selects before closing the read-only connections
+        if self._executor: await asyncio.get_running_loop().run_in_executor(None, self._executor.shutdown)
+        self._executor = None
+        await self._submit(Database.close)
+        # reject calls that would be queued behind the stop sentinel
+        self._closed = True
+        self._jobs.put(None)
+        await asyncio.get_running_loop().run_in_executor(None, self._thread.join)
+
+    def _take_reader(self) -> bool:
+        """
+        Takes a read-only connection if one is free.
+
+        Returns:
+            Whether a read-only connection was taken, which must be returned by incrementing `_free`.
+        """
+        if not self._executor or not self._database or not self._free: return False
+        self._free -= 1
+        return True
+
+    async def _call(self, reader: bool, method: Callable[..., TResult], *args: Any, **kwargs: Any) -> TResult:
+        """
+        Calls a `Database` method on a reader thread, or queues it for the connection thread.
+        """
+        if not reader: return await self._submit(method, *args, **kwargs)
+        if not self._executor or not self._database: raise RuntimeError(f'{AsyncDatabase.__name__}: The database has been closed')
+        return await asyncio.get_running_loop().run_in_executor(self._executor, partial(method, self._database, *args, **kwargs))
+
+    async def _read(self, method: Callable[..., TResult], *args: Any, **kwargs: Any) -> TResult:
+        """
+        Calls a selecting `Database` method on a reader thread if a read-only connection is free,
+        or on the connection thread otherwise, so a select never waits for a connection held by an iteration.
+        """
+        reader: bool = self._take_reader()
+        try:
+            return await self._call(reader, method, *args, **kwargs)
+        finally:
+            if reader: self._free += 1
+
+    async def _submit(self, method: Callable[..., TResult], *args: Any, **kwargs: Any) -> TResult:
+        """
+        Queues a call to a `Database` method and waits for its result.
+
+        Raises:
+            RuntimeError: If the database has been closed
+        """
+        if self._closed or not self._thread.is_alive(): raise RuntimeError(f'{AsyncDatabase.__name__}: The database has been closed')
+        job: Job[TResult] = Job(method, args, kwargs, asyncio.get_running_loop().create_future())
+        self._jobs.put(job)
+        try:
+            return await job.future
+        except asyncio.CancelledError:
+            # abort the statement if the call is running
+            with self._lock:
+                if self._running is job and self._database: self._database.interrupt()
+            raise
+
+    async def _submit_many(self, method: Callable[..., TResult], type: Type[TStorable], items: Iterable[TStorable], **kwargs: Any) -> TResult:
+        """
+        Queues a call to a bulk `Database` method, which stops consuming items once the call is cancelled.
+        """
+        cancelled: threading.Event = threading.Event()
+        try:
+            return await self._submit(method, type, _interruptible(items, cancelled), **kwargs)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    def _run(self, reference: Path, detect_types: int, chunk_size: int, pragmas: Optional[Pragmas], readers: int, connected: threading.Event) -> None:
+        """
+        Connects to the database and executes queued calls until the stop sentinel is received.
+        """
+        try:
+            self._database = Database(reference, detect_types, chunk_size=chunk_size, pragmas=pragmas, readers=readers)
+        except BaseException as error:
+            self._error = error
+            return
+        finally:
+            connected.set()
+
+        while True:
+            job: Optional[Job[Any]] = self._jobs.get()
+            if job is None: break
+            # skip calls cancelled while queued
+            if job.future.cancelled(): continue
+            with self._lock: self._running = job
+            result: Any = None
+            error: Optional[BaseException] = None
+            try:
+                result = job.method(self._database, *job.args, **job.kwargs)
+            except BaseException as exception:
+                error = exception
+            finally:
+                with self._lock: self._running = None
+            try:
+                job.future.get_loop().call_soon_threadsafe(AsyncDatabase._resolve, job.future, result, error)
+            except RuntimeError:
+                log.debug('Discarded a result for a closed event loop')
+
+    @staticmethod
+    def _resolve(future: asyncio.Future[Any], result: Any, error: Optional[BaseException]) -> None:
+        """
+        Sets the outcome of a call on the event loop, unless the caller cancelled it.
+        """
+        if future.cancelled(): return
+        if error: future.set_exception(error)
+        else: future.set_result(result)
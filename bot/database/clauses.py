@@ -1,5 +1,207 @@
-class WhereClause():
-    
+from __future__ import annotations
+
+from typing import Any, Iterable, List, Tuple
+
+OPERATORS: Tuple[str, ...] = ('=', '!=', '<', '<=', '>', '>=')
+"""The operators accepted by a `ComparisonClause`"""
+
+
+class Clause():
+    """
+    A condition on the rows of a table, compiled into parameterized SQL.
+    Clauses combine with `&` (AND), `|` (OR) and `~` (NOT).
+    """
+
+    @property
+    def columns(self) -> List[str]:
+        """The names of the columns referenced by the clause."""
+        raise NotImplementedError()
+
+    def __sql__(self) -> str:
+        """
+        Returns a string containing the SQL condition, with a `?` placeholder for each parameter.
+        """
+        raise NotImplementedError()
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        """
+        Returns a tuple containing the parameters of the SQL condition, in placeholder order.
+        """
+        raise NotImplementedError()
+
+    def __and__(self, other: Clause) -> AndClause:
+        return AndClause(self, other)
+
+    def __or__(self, other: Clause) -> OrClause:
+        return OrClause(self, other)
+
+    def __invert__(self) -> NotClause:
+        return NotClause(self)
+
+
+class ComparisonClause(Clause):
+
+    def __init__(self, column_name: str, operator: str, value: object):
+        """
+        Args:
+            column_name: The name of the column to compare.
+            operator: One of `=`, `!=`, `<`, `<=`, `>` or `>=`.
+            value: The value to compare the column to.
+
+        Raises:
+            ValueError: If the operator is not supported
+        """
+        if operator not in OPERATORS: raise ValueError(f'operator: Expected one of {", ".join(OPERATORS)}, got {operator}')
+        self._column_name: str = column_name
+        self._operator: str = operator
+        self._value: object = value
+
+    @property
+    def columns(self) -> List[str]:
+        return [self._column_name]
+
+    def __sql__(self) -> str:
+        return f'{self._column_name} {self._operator} ?'
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        return (self._value, )
+
+
+class WhereClause(ComparisonClause):
+    """
+    A clause matching rows where a column equals a value.
+    """
+
     def __init__(self, column_name: str, value: object):
+        super().__init__(column_name, '=', value)
+
+
+class InClause(Clause):
+
+    def __init__(self, column_name: str, values: Iterable[object]):
+        self._column_name: str = column_name
+        self._values: Tuple[object, ...] = tuple(values)
+
+    @property
+    def columns(self) -> List[str]:
+        return [self._column_name]
+
+    def __sql__(self) -> str:
+        # get a parameter placeholder for each value
+        placeholders: str = ', '.join('?' for _ in self._values)
+        return f'{self._column_name} IN ({placeholders})'
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        return self._values
+
+
+class BetweenClause(Clause):
+
+    def __init__(self, column_name: str, low: object, high: object):
+        self._column_name: str = column_name
+        self._low: object = low
+        self._high: object = high
+
+    @property
+    def columns(self) -> List[str]:
+        return [self._column_name]
+
+    def __sql__(self) -> str:
+        return f'{self._column_name} BETWEEN ? AND ?'
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        return (self._low, self._high)
+
+
+class LikeClause(Clause):
+
+    def __init__(self, column_name: str, pattern: str):
+        """
+        Args:
+            column_name: The name of the column to match.
+            pattern: A LIKE pattern, where `%` matches any sequence and `_` any single character.
+        """
+        self._column_name: str = column_name
+        self._pattern: str = pattern
+
+    @property
+    def columns(self) -> List[str]:
+        return [self._column_name]
+
+    def __sql__(self) -> str:
+        return f'{self._column_name} LIKE ?'
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        return (self._pattern, )
+
+
+class NullClause(Clause):
+
+    def __init__(self, column_name: str, is_null: bool = True):
+        """
+        Args:
+            column_name: The name of the column to check.
+            is_null: Whether to match rows where the column is NULL, or where it is not.
+        """
         self._column_name: str = column_name
-        self._value: object = value
\ No newline at end of file
+        self._is_null: bool = is_null
+
+    @property
+    def columns(self) -> List[str]:
+        return [self._column_name]
+
+    def __sql__(self) -> str:
+        return f'{self._column_name} IS NULL' if self._is_null else f'{self._column_name} IS NOT NULL'
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        return ()
+
+
+class AndClause(Clause):
+
+    def __init__(self, *clauses: Clause):
+        if not clauses: raise ValueError('clauses: Expected at least one clause')
+        self._clauses: Tuple[Clause, ...] = clauses
+
+    @property
+    def columns(self) -> List[str]:
+        return [column for clause in self._clauses for column in clause.columns]
+
+    def __sql__(self) -> str:
+        return f'({" AND ".join(clause.__sql__() for clause in self._clauses)})'
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        return tuple(parameter for clause in self._clauses for parameter in clause.__parameters__())
+
+
+class OrClause(Clause):
+
+    def __init__(self, *clauses: Clause):
+        if not clauses: raise ValueError('clauses: Expected at least one clause')
+        self._clauses: Tuple[Clause, ...] = clauses
+
+    @property
+    def columns(self) -> List[str]:
+        return [column for clause in self._clauses for column in clause.columns]
+
+    def __sql__(self) -> str:
+        return f'({" OR ".join(clause.__sql__() for clause in self._clauses)})'
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        return tuple(parameter for clause in self._clauses for parameter in clause.__parameters__())
+
+
+class NotClause(Clause):
+
+    def __init__(self, clause: Clause):
+        self._clause: Clause = clause
+
+    @property
+    def columns(self) -> List[str]:
+        return self._clause.columns
+
+    def __sql__(self) -> str:
+        return f'NOT ({self._clause.__sql__()})'
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        return self._clause.__parameters__()
@@ -13,6 +13,7 @@ class Column:
         self._type: str = type
         self._is_unique: bool = False
         self._is_primary: bool = False
+        self._is_indexed: bool = False
 
     def __sql__(self) -> str:
         """
@@ -26,7 +27,7 @@ class Column:
         # add the unique term to the list of terms if marked as unique
         if self._is_unique: terms.append('UNIQUE')
         # add the primary term to the list of terms if marked as primary
-        if self._is_unique: terms.append('PRIMARY KEY')
+        if self._is_primary: terms.append('PRIMARY KEY')
         # join the terms with a space character
         sql: str = ' '.join(terms)
         return sql
@@ -85,6 +86,15 @@ class ColumnBuilder():
         # return the builder for call chaining
         return self
 
+    def isIndexed(self, value: bool = True) -> ColumnBuilder:
+        """
+        Sets whether or not the column being built should have its own index.
+        """
+        # set the column's _is_indexed property
+        self._column._is_indexed = value
+        # return the builder for call chaining
+        return self
+
     def setType(self, value: str) -> ColumnBuilder:
         """
         Sets the declared column type of the column being built
@@ -1,50 +1,444 @@
+import logging
 import sqlite3
+import threading
+from itertools import islice
+from queue import Queue
 from pathlib import Path
-from sqlite3 import Connection, Row
-from typing import Iterable, List, Optional, Tuple, Type
+from sqlite3 import Connection, Cursor, Row
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Type, Union
 
-from .clauses import WhereClause
+from .clauses import Clause
 
 from ..disk import File
 
+from .page import Page
+from .pragmas import Pragmas
+from .query import Query
 from .storable import TStorable
 from .table import Table
 
+log: logging.Logger = logging.getLogger(__name__)
+
+DEFAULT_CHUNK_SIZE: int = 1000
+"""The default number of rows sent to `executemany` at once by bulk operations"""
+
 class Database(File):
 
-    def __init__(self, reference: Path, detect_types=sqlite3.PARSE_DECLTYPES) -> None:
+    def __init__(self, reference: Path, detect_types=sqlite3.PARSE_DECLTYPES, *, chunk_size: int = DEFAULT_CHUNK_SIZE, pragmas: Optional[Pragmas] = None, readers: int = 0) -> None:
+        """
+        Initializes a `Database` and connects to it.
+
+        Args:
+            reference: A reference to the database file.
+            detect_types: The type detection flags passed to `sqlite3.connect`.
+            chunk_size: The number of rows sent to `executemany` at once by bulk operations.
+            pragmas: The pragmas applied to each connection, or None for the SQLite defaults.
+            readers: The number of read-only connections used by `select`, which can then be
+                called from several threads at once. Selects only run alongside writes with WAL.
+                Selects made on the thread that opened the database use its own connection.
+        """
         # call parent initializer
         super().__init__(reference)
+        # set the number of rows sent to executemany at once
+        if chunk_size < 1: raise ValueError(f'chunk_size: Expected a positive integer, got {chunk_size}')
+        self._chunk_size: int = chunk_size
+        # the table of each storable type, built on first use
+        self._tables: Dict[type, Table] = dict()
+        if readers < 0: raise ValueError(f'readers: Expected a non-negative integer, got {readers}')
+        self._pragmas: Pragmas = pragmas if pragmas else Pragmas()
 
+        # the thread that owns the connection, which never waits on the read-only connections
+        self._owner: int = threading.get_ident()
         # connect to the database
         self._connection: Connection = sqlite3.connect(self._path, detect_types=detect_types)
         # set the connection's row factory
         self._connection.row_factory = Row
+        # apply the pragmas to the connection
+        for statement in self._pragmas.__sql__(): self._connection.execute(statement)
+
+        # open the read-only connections
+        self._readers: Queue[Connection] = Queue()
+        for _ in range(readers):
+            # allow the connection to be used by whichever thread takes it from the pool
+            reader: Connection = sqlite3.connect(f'{self._path.as_uri()}?mode=ro', detect_types=detect_types, uri=True, check_same_thread=False)
+            reader.row_factory = Row
+            for statement in self._pragmas.__sql__(read_only=True): reader.execute(statement)
+            self._readers.put(reader)
+        self._reader_count: int = readers
+        # guards returning read-only connections against closing the pool
+        self._pool_lock: threading.Lock = threading.Lock()
+
+    def close(self) -> None:
+        """
+        Closes the connections to the database.
+        """
+        self._connection.close()
+        with self._pool_lock:
+            self._reader_count = 0
+            # close the pooled read-only connections, and those still held by an iteration once it ends
+            while not self._readers.empty(): self._readers.get().close()
+
+    def interrupt(self) -> None:
+        """
+        Aborts the statement currently executing on the connection, if any.
+        Safe to call from any thread.
+        """
+        self._connection.interrupt()
+
+    def _take_connection(self) -> Connection:
+        """
+        Takes a read-only connection from the pool for a call from another thread. A call from the
+        owning thread uses its own connection, so it never waits for a read-only connection that
+        an iteration on the same thread holds.
+        """
+        if not self._reader_count or threading.get_ident() == self._owner: return self._connection
+        return self._readers.get()
+
+    def _return_connection(self, connection: Connection) -> None:
+        """
+        Returns a read-only connection to the pool, or closes it if the database has been closed.
+        """
+        if connection is self._connection: return
+        with self._pool_lock:
+            if self._reader_count: self._readers.put(connection)
+            else: connection.close()
+
+    def _get_table(self, type: Type[TStorable]) -> Table:
+        """
+        Retrieves the table of a storable type, calling its `__table__` method only once.
+        """
+        table: Optional[Table] = self._tables.get(type)
+        if table is None: table = self._tables[type] = type.__table__()
+        return table
 
     def create(self, type: Type[TStorable]) -> None:
         # get the table instance
-        table: Table = type.__table__()
+        table: Table = self._get_table(type)
         # execute the table's create statement
         self._connection.cursor().execute(table.__create__(if_not_exists=True))
+        # execute the create statement of each index missing from the table
+        for statement in table.__indexes__(if_not_exists=True): self._connection.cursor().execute(statement)
         # commit the changes
         self._connection.commit()
 
-    def select(self, type: Type[TStorable], where: Optional[WhereClause] = None) -> Iterable[TStorable]:
+    def explain(self, type: Type[TStorable], where: Optional[Union[Clause, Query]] = None) -> List[str]:
+        """
+        Retrieves the query plan SQLite would use to select the items matching a clause or query.
+
+        Returns:
+            The detail of each step of the plan, such as `SEARCH points USING INDEX ix_points_name (name=?)`.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        # initialize sql string
+        sql: str = table.__select__(where=where) if where else table.__select__()
+        # initialize sql parameters if a clause was provided
+        parameters: Tuple = where.__parameters__() if where else ()
+        # explain the table's select statement
+        results: List[Row] = self._connection.cursor().execute(f'EXPLAIN QUERY PLAN {sql}', parameters).fetchall()
+        return [row['detail'] for row in results]
+
+    def check_indexes(self, type: Type[TStorable]) -> List[str]:
+        """
+        Confirms that an equality lookup on the columns of each index of a type's table,
+        under the condition of a partial index, is planned to use that index.
+
+        Returns:
+            The names of the indexes that the lookups did not use.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        table_name: str = table._fully_qualified_name
+        unused: List[str] = list()
+        for index in table.indexes:
+            name: str = index.get_name(table_name.split('.')[-1])
+            # look up every indexed column, within the partial index condition if it exists
+            conditions: List[str] = [f'{column_name} = ?' for column_name in index.columns]
+            if index.where: conditions.append(f'({index.where})')
+            sql: str = f'EXPLAIN QUERY PLAN SELECT * FROM {table_name} WHERE {" AND ".join(conditions)}'
+            results: List[Row] = self._connection.cursor().execute(sql, [None for _ in index.columns]).fetchall()
+            # check whether any step of the plan uses the index
+            if not any(f'INDEX {name} ' in f'{row["detail"]} ' for row in results):
+                log.warning(f'{table_name}: Lookups on {", ".join(index.columns)} do not use index {name}')
+                unused.append(name)
+        return unused
+
+    def select(self, type: Type[TStorable], where: Optional[Union[Clause, Query]] = None) -> Iterable[TStorable]:
+        """
+        Selects the items matching a clause, or filtered, ordered and limited by a query.
+
+        Raises:
+            ValueError: If the query projects columns, which `project` selects instead
+        """
+        if isinstance(where, Query) and where.projection: raise ValueError('Projected queries must be selected with project')
+        return [type.__from_row__(row) for row in self._fetch(type, where)]
+
+    def project(self, type: Type[TStorable], query: Query) -> List[Row]:
+        """
+        Selects the rows of a query, containing only the columns it projects.
+        """
+        return self._fetch(type, query)
+
+    def _fetch(self, type: Type[TStorable], where: Optional[Union[Clause, Query]]) -> List[Row]:
         # get the table instance
-        table: Table = type.__table__()
+        table: Table = self._get_table(type)
         # initialize sql string
         sql: str = table.__select__(where=where) if where else table.__select__()
         # initialize sql parameters if a clause was provided
-        parameters: Tuple = (where._value, ) if where else ()
-        # execute the table's select statement and fetch all results
-        results: List[Row] = self._connection.cursor().execute(sql, parameters).fetchall()
+        parameters: Tuple = where.__parameters__() if where else ()
+        # take a read-only connection from the pool if there is one
+        connection: Connection = self._take_connection()
+        try:
+            # execute the table's select statement and fetch all results
+            results: List[Row] = connection.cursor().execute(sql, parameters).fetchall()
+        finally:
+            # return the read-only connection to the pool
+            self._return_connection(connection)
+        return results
+
+    def iter_select(self, type: Type[TStorable], where: Optional[Union[Clause, Query]] = None, *, batch_size: Optional[int] = None) -> Iterator[TStorable]:
+        """
+        Selects items lazily, fetching rows in batches and building each item as it is
+        consumed, so that memory use does not grow with the size of the table.
+        A read-only connection, if any, is held until the generator is exhausted or closed.
+
+        Args:
+            type: The storable type of the items.
+            where: The clause the rows must match, or a query filtering, ordering and limiting the rows.
+            batch_size: The number of rows per `fetchmany` call, or None for the database chunk size.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        # initialize sql string
+        sql: str = table.__select__(where=where) if where else table.__select__()
+        if isinstance(where, Query) and where.projection: raise ValueError('Projected queries must be selected with project')
+        # initialize sql parameters if a clause was provided
+        parameters: Tuple = where.__parameters__() if where else ()
+        size: int = batch_size if batch_size else self._chunk_size
+        # take a read-only connection from the pool if there is one
+        connection: Connection = self._take_connection()
+        cursor: Cursor = connection.cursor()
+        try:
+            # execute the table's select statement
+            cursor.execute(sql, parameters)
+            while True:
+                # fetch the next batch of results
+                results: List[Row] = cursor.fetchmany(size)
+                if not results: break
+                # initialize each result from the static class method
+                for row in results: yield type.__from_row__(row)
+        finally:
+            try:
+                cursor.close()
+            except sqlite3.ProgrammingError:
+                # the connection was closed before the generator
+                pass
+            # return the read-only connection to the pool
+            self._return_connection(connection)
+
+    def page(self, type: Type[TStorable], key: str, *, after: Optional[Any] = None, before: Optional[Any] = None, limit: int = 25, where: Optional[Clause] = None) -> Page[TStorable]:
+        """
+        Selects a page of items ordered by a key column using keyset pagination.
+
+        Args:
+            type: The storable type of the items.
+            key: The name of a unique column to order the items by, such as the primary key.
+            after: The key after which the page starts, usually `Page.last` of the previous page.
+            before: The key before which the page ends, usually `Page.first` of the next page.
+            limit: The maximum number of items on the page.
+            where: The clause the rows must match.
+
+        Raises:
+            ValueError: If both `after` and `before` are provided, or the key is not a column
+        """
+        if after is not None and before is not None: raise ValueError('Expected either after or before, got both')
+        if limit < 1: raise ValueError(f'limit: Expected a positive integer, got {limit}')
+        # get the table instance
+        table: Table = self._get_table(type)
+        # select backwards from the bound when paging to the previous page
+        descending: bool = before is not None
+        bound: Optional[Any] = before if descending else after
+        # initialize sql string
+        sql: str = table.__page__(key, where=where, bounded=bound is not None, descending=descending)
+        # initialize sql parameters, fetching an extra row to detect further pages
+        parameters: List[Any] = list()
+        if where: parameters.extend(where.__parameters__())
+        if bound is not None: parameters.append(bound)
+        parameters.append(limit + 1)
+
+        # take a read-only connection from the pool if there is one
+        connection: Connection = self._take_connection()
+        try:
+            # execute the table's page statement and fetch all results
+            results: List[Row] = connection.cursor().execute(sql, parameters).fetchall()
+        finally:
+            # return the read-only connection to the pool
+            self._return_connection(connection)
+
+        more: bool = len(results) > limit
+        results = results[:limit]
+        # restore ascending order when paging backwards
+        if descending: results.reverse()
+        first: Optional[Any] = results[0][key] if results else None
+        last: Optional[Any] = results[-1][key] if results else None
+        has_previous: bool = more if descending else bound is not None
+        has_next: bool = bound is not None if descending else more
         # initialize each result from the static class method
-        return [type.__from_row__(row) for row in results]
+        return Page([type.__from_row__(row) for row in results], first=first, last=last, has_previous=has_previous, has_next=has_next)
 
     def insert(self, type: Type[TStorable], item: TStorable) -> None:
         # get the table instance
-        table: Table = type.__table__()
+        table: Table = self._get_table(type)
         # execute the table's insert statement with parameter injection
         self._connection.cursor().execute(table.__insert__(), item.__values__())
         # commit the changes
         self._connection.commit()
+
+    def insert_many(self, type: Type[TStorable], items: Iterable[TStorable], *, chunk_size: Optional[int] = None) -> int:
+        """
+        Inserts many items in a single transaction, sending them to `executemany`
+        in chunks so that items from a generator are never all held in memory.
+        The transaction is rolled back if any insert fails.
+
+        Args:
+            type: The storable type of the items.
+            items: The items to insert.
+            chunk_size: The number of rows per `executemany` call, or None for the database default.
+
+        Returns:
+            The number of rows inserted.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        # execute the table's insert statement with the values of each item
+        return self._execute_many(table.__insert__(), (item.__values__() for item in items), chunk_size)
+
+    def update(self, type: Type[TStorable], item: TStorable, *, key: Optional[Sequence[str]] = None) -> int:
+        """
+        Updates the row with the same key as an item to the item's values.
+
+        Args:
+            type: The storable type of the item.
+            item: The item to update.
+            key: The names of the columns identifying the row, or None for the primary key.
+
+        Returns:
+            The number of rows updated, which is 0 if no row has the item's key.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        # execute the table's update statement with parameter injection
+        cursor: Cursor = self._connection.cursor().execute(table.__update__(key), item.__values__())
+        # commit the changes
+        self._connection.commit()
+        return cursor.rowcount
+
+    def update_many(self, type: Type[TStorable], items: Iterable[TStorable], *, key: Optional[Sequence[str]] = None, chunk_size: Optional[int] = None) -> int:
+        """
+        Updates the rows with the same keys as many items in a single transaction.
+        The transaction is rolled back if any update fails.
+
+        Returns:
+            The number of rows updated.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        # execute the table's update statement with the values of each item
+        return self._execute_many(table.__update__(key), (item.__values__() for item in items), chunk_size)
+
+    def upsert(self, type: Type[TStorable], item: TStorable, *, key: Optional[Sequence[str]] = None) -> None:
+        """
+        Inserts an item, or updates the row with the same key to the item's values.
+
+        Args:
+            type: The storable type of the item.
+            item: The item to insert or update.
+            key: The names of the columns of the primary key or a unique constraint, or None for the primary key.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        # execute the table's upsert statement with parameter injection
+        self._connection.cursor().execute(table.__upsert__(key), item.__values__())
+        # commit the changes
+        self._connection.commit()
+
+    def upsert_many(self, type: Type[TStorable], items: Iterable[TStorable], *, key: Optional[Sequence[str]] = None, chunk_size: Optional[int] = None) -> int:
+        """
+        Inserts or updates many items in a single transaction.
+        The transaction is rolled back if any statement fails.
+
+        Returns:
+            The number of rows inserted or updated.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        # execute the table's upsert statement with the values of each item
+        return self._execute_many(table.__upsert__(key), (item.__values__() for item in items), chunk_size)
+
+    def delete(self, type: Type[TStorable], item: TStorable, *, key: Optional[Sequence[str]] = None) -> int:
+        """
+        Deletes the row with the same key as an item.
+
+        Returns:
+            The number of rows deleted, which is 0 if no row has the item's key.
+        """
+        return self.delete_many(type, [item], key=key)
+
+    def delete_many(self, type: Type[TStorable], items: Iterable[TStorable], *, key: Optional[Sequence[str]] = None, chunk_size: Optional[int] = None) -> int:
+        """
+        Deletes the rows with the same keys as many items in a single transaction.
+        The transaction is rolled back if any delete fails.
+
+        Returns:
+            The number of rows deleted.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        columns: Tuple[str, ...] = table._get_key(key)
+        # get the position of each key column in the values of an item
+        positions: Tuple[int, ...] = table._get_positions(columns)
+        # get the key values of each item lazily
+        values: Iterator[Tuple[Any, ...]] = (Database._pick(item.__values__(), positions) for item in items)
+        # execute the table's delete statement with the key values of each item
+        return self._execute_many(table.__remove__(columns), values, chunk_size)
+
+    def delete_where(self, type: Type[TStorable], where: Clause) -> int:
+        """
+        Deletes the rows matching a clause.
+
+        Returns:
+            The number of rows deleted.
+        """
+        # get the table instance
+        table: Table = self._get_table(type)
+        # execute the table's delete statement with parameter injection
+        cursor: Cursor = self._connection.cursor().execute(table.__remove__(where), where.__parameters__())
+        # commit the changes
+        self._connection.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def _pick(values: Tuple[Any, ...], positions: Tuple[int, ...]) -> Tuple[Any, ...]:
+        return tuple(values[position] for position in positions)
+
+    def _execute_many(self, sql: str, values: Iterator[Tuple[Any, ...]], chunk_size: Optional[int]) -> int:
+        """
+        Executes a statement for each set of values in a single transaction, sending them to
+        `executemany` in chunks so that values from a generator are never all held in memory.
+        The transaction is rolled back if any statement fails.
+
+        Returns:
+            The number of rows modified.
+        """
+        size: int = chunk_size if chunk_size else self._chunk_size
+        count: int = 0
+        # commit once all chunks are executed, or roll back on error
+        with self._connection:
+            while True:
+                # get the next chunk of values
+                chunk: List[Tuple[Any, ...]] = list(islice(values, size))
+                if not chunk: break
+                # execute the statement for each row in the chunk
+                cursor: Cursor = self._connection.executemany(sql, chunk)
+                count += cursor.rowcount
+        return count
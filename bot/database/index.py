@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+
+class Index:
+    """
+    An object containing metadata needed to construct a database table index.
+    """
+
+    def __init__(self, *columns: str, name: Optional[str] = None, is_unique: bool = False, where: Optional[str] = None) -> None:
+        """
+        Args:
+            columns: The names of the indexed columns, in index order.
+            name: The name of the index, or None to derive it from the table and column names.
+            is_unique: Whether the indexed values must be unique.
+            where: A SQL condition restricting the index to matching rows, making it a partial index.
+                Queries only use a partial index when their conditions imply this one.
+        """
+        if not columns: raise ValueError('columns: Expected at least one column')
+        self._columns: Sequence[str] = columns
+        self._name: Optional[str] = name
+        self._is_unique: bool = is_unique
+        self._where: Optional[str] = where
+
+    @property
+    def columns(self) -> Sequence[str]:
+        """The names of the indexed columns."""
+        return self._columns
+
+    @property
+    def where(self) -> Optional[str]:
+        """The condition of a partial index."""
+        return self._where
+
+    def get_name(self, table_name: str) -> str:
+        """
+        Retrieves the name of the index on the provided table.
+        """
+        return self._name if self._name else '_'.join(['ix', table_name, *self._columns])
+
+    def __sql__(self, table_name: str, *, if_not_exists: bool = True) -> str:
+        """
+        Returns a string containing the SQL statement.
+
+        Args:
+            table_name: the name of the indexed table.
+            if_not_exists: whether 'IF NOT EXISTS' should be included in the statement.
+        """
+        terms: List[str] = list()
+        # add the create index command to the list of terms
+        terms.append('CREATE UNIQUE INDEX' if self._is_unique else 'CREATE INDEX')
+        # add the if not exists term to the list of terms if marked
+        if if_not_exists: terms.append('IF NOT EXISTS')
+        # add the name and indexed columns to the list of terms
+        terms.append(self.get_name(table_name.split('.')[-1]))
+        terms.append(f'ON {table_name} ({", ".join(self._columns)})')
+        # add the partial index condition to the list of terms if it exists
+        if self._where: terms.append(f'WHERE {self._where}')
+        # join the terms with a space character
+        sql: str = ' '.join(terms)
+        return sql
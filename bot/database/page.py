@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from typing import Any, Generic, List, Optional
+
+from .storable import TStorable
+
+
+class Page(Generic[TStorable]):
+    """
+    A page of items selected by keyset pagination, in ascending key order.
+
+    Pages are bounded by the key values of their first and last items rather
+    than an offset, so fetching the next or previous page costs the same
+    regardless of how deep into the table it is.
+    """
+
+    def __init__(self, items: List[TStorable], *, first: Optional[Any], last: Optional[Any], has_previous: bool, has_next: bool) -> None:
+        self.items: List[TStorable] = items
+        """The items on the page."""
+        self.first: Optional[Any] = first
+        """The key of the first item, passed as `before` to fetch the previous page."""
+        self.last: Optional[Any] = last
+        """The key of the last item, passed as `after` to fetch the next page."""
+        self.has_previous: bool = has_previous
+        """Whether items exist before the page."""
+        self.has_next: bool = has_next
+        """Whether items exist after the page."""
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
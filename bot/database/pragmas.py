@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+JOURNAL_MODES: Tuple[str, ...] = ('delete', 'truncate', 'persist', 'memory', 'wal', 'off')
+"""The accepted values of the `journal_mode` pragma"""
+
+SYNCHRONOUS_MODES: Tuple[str, ...] = ('off', 'normal', 'full', 'extra')
+"""The accepted values of the `synchronous` pragma"""
+
+TEMP_STORES: Tuple[str, ...] = ('default', 'file', 'memory')
+"""The accepted values of the `temp_store` pragma"""
+
+
+class Pragmas:
+    """
+    An object containing the SQLite pragmas applied to each connection of a `Database`.
+    Pragmas left as None keep the SQLite default.
+    """
+
+    def __init__(self, *, journal_mode: Optional[str] = None, synchronous: Optional[str] = None, cache_size: Optional[int] = None, mmap_size: Optional[int] = None, temp_store: Optional[str] = None, busy_timeout: Optional[int] = None) -> None:
+        """
+        Initializes a `Pragmas` object.
+
+        Args:
+            journal_mode: The journal mode of the database, such as `wal`.
+            synchronous: How often SQLite waits for writes to reach the disk: `off`, `normal`, `full` or `extra`.
+            cache_size: The page cache size, in pages if positive or in KiB if negative.
+            mmap_size: The maximum number of bytes of the database file to memory map.
+            temp_store: Where temporary tables and indices are stored: `default`, `file` or `memory`.
+            busy_timeout: The time, in milliseconds, to wait for a lock before failing.
+
+        Raises:
+            ValueError: If a value is not accepted by its pragma
+        """
+        self._journal_mode: Optional[str] = Pragmas._choose('journal_mode', journal_mode, JOURNAL_MODES)
+        self._synchronous: Optional[str] = Pragmas._choose('synchronous', synchronous, SYNCHRONOUS_MODES)
+        self._cache_size: Optional[int] = cache_size
+        self._mmap_size: Optional[int] = Pragmas._positive('mmap_size', mmap_size)
+        self._temp_store: Optional[str] = Pragmas._choose('temp_store', temp_store, TEMP_STORES)
+        self._busy_timeout: Optional[int] = Pragmas._positive('busy_timeout', busy_timeout)
+
+    @property
+    def is_wal(self) -> bool:
+        """Whether the database uses write-ahead logging."""
+        return self._journal_mode == 'wal'
+
+    @classmethod
+    def wal(cls) -> Pragmas:
+        """
+        Pragmas suited to concurrent readers and a single writer: write-ahead logging,
+        fewer disk syncs, a 16 MiB page cache, a 256 MiB memory map, in-memory
+        temporary storage and a 5 second busy timeout.
+        """
+        return cls(journal_mode='wal', synchronous='normal', cache_size=-16384, mmap_size=268435456, temp_store='memory', busy_timeout=5000)
+
+    def __sql__(self, *, read_only: bool = False) -> List[str]:
+        """
+        Returns a list of strings containing the SQL statements.
+
+        Args:
+            read_only: whether to omit pragmas that modify the database file.
+        """
+        statements: List[str] = list()
+        # add the journal mode unless the connection is read-only
+        if self._journal_mode and not read_only: statements.append(f'PRAGMA journal_mode = {self._journal_mode}')
+        # add each connection pragma that was set
+        if self._synchronous: statements.append(f'PRAGMA synchronous = {self._synchronous}')
+        if self._cache_size is not None: statements.append(f'PRAGMA cache_size = {int(self._cache_size)}')
+        if self._mmap_size is not None: statements.append(f'PRAGMA mmap_size = {self._mmap_size}')
+        if self._temp_store: statements.append(f'PRAGMA temp_store = {self._temp_store}')
+        if self._busy_timeout is not None: statements.append(f'PRAGMA busy_timeout = {self._busy_timeout}')
+        return statements
+
+    @staticmethod
+    def _choose(name: str, value: Optional[str], choices: Tuple[str, ...]) -> Optional[str]:
+        if value is None: return None
+        if value.lower() not in choices: raise ValueError(f'{name}: Expected one of {", ".join(choices)}, got {value}')
+        return value.lower()
+
+    @staticmethod
+    def _positive(name: str, value: Optional[int]) -> Optional[int]:
+        if value is None: return None
+        if int(value) < 0: raise ValueError(f'{name}: Expected a non-negative integer, got {value}')
+        return int(value)
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+from typing import Any, List, Optional, Tuple
+
+from .clauses import Clause
+
+
+class Query:
+    """
+    An object containing the filtering, ordering, limiting and projection of a select statement.
+    """
+
+    def __init__(self) -> None:
+        self._where: Optional[Clause] = None
+        self._order: List[Tuple[str, bool]] = list()
+        self._limit: Optional[int] = None
+        self._offset: Optional[int] = None
+        self._columns: List[str] = list()
+
+    @property
+    def projection(self) -> List[str]:
+        """The names of the selected columns, or an empty list for every column."""
+        return self._columns
+
+    @property
+    def columns(self) -> List[str]:
+        """The names of every column referenced by the query."""
+        referenced: List[str] = list(self._columns)
+        if self._where: referenced.extend(self._where.columns)
+        referenced.extend(column_name for column_name, _ in self._order)
+        return referenced
+
+    def __sql__(self) -> str:
+        """
+        Returns a string containing the SQL following the FROM term of a select statement.
+        """
+        terms: List[str] = list()
+        # add the where clause to the list of terms if provided
+        if self._where: terms.append(f'WHERE {self._where.__sql__()}')
+        # add the ordering to the list of terms if provided
+        if self._order: terms.append(f'ORDER BY {", ".join(f"{column_name} DESC" if descending else f"{column_name} ASC" for column_name, descending in self._order)}')
+        # add the limit to the list of terms, which an offset requires
+        if self._limit is not None or self._offset is not None: terms.append('LIMIT ?')
+        # add the offset to the list of terms if provided
+        if self._offset is not None: terms.append('OFFSET ?')
+        # join the terms with a space character
+        sql: str = ' '.join(terms)
+        return f'{sql}'
+
+    def __parameters__(self) -> Tuple[Any, ...]:
+        """
+        Returns a tuple containing the parameters of the SQL, in placeholder order.
+        """
+        parameters: List[Any] = list(self._where.__parameters__()) if self._where else list()
+        # an offset without a limit selects every remaining row
+        if self._limit is not None or self._offset is not None: parameters.append(self._limit if self._limit is not None else -1)
+        if self._offset is not None: parameters.append(self._offset)
+        return tuple(parameters)
+
+
+class QueryBuilder():
+
+    def __init__(self) -> None:
+        """
+        Creates a new instance of the query builder, resetting internal state
+        """
+        # reset the builder state
+        self.__reset__()
+
+    def __reset__(self) -> None:
+        """
+        Resets the query builder's internal state
+        """
+        self._query: Query = Query()
+
+    def build(self) -> Query:
+        """
+        Outputs the query being built and resets the builder's internal state
+        """
+        # get a copy of the Query instance
+        query: Query = self._query
+        # reset the builder state
+        self.__reset__()
+        # return the copied Query instance
+        return query
+
+    def setWhere(self, value: Clause) -> QueryBuilder:
+        """
+        Sets the clause the rows selected by the query being built must match
+        """
+        # set the query's _where property
+        self._query._where = value
+        # return the builder for call chaining
+        return self
+
+    def addOrder(self, column_name: str, *, descending: bool = False) -> QueryBuilder:
+        """
+        Adds a column to order the rows selected by the query being built by
+        """
+        # add the provided column and direction
+        self._query._order.append((column_name, descending))
+        # return the builder for call chaining
+        return self
+
+    def setLimit(self, value: int) -> QueryBuilder:
+        """
+        Sets the maximum number of rows selected by the query being built
+        """
+        if value < 0: raise ValueError(f'limit: Expected a non-negative integer, got {value}')
+        # set the query's _limit property
+        self._query._limit = value
+        # return the builder for call chaining
+        return self
+
+    def setOffset(self, value: int) -> QueryBuilder:
+        """
+        Sets the number of rows skipped by the query being built
+        """
+        if value < 0: raise ValueError(f'offset: Expected a non-negative integer, got {value}')
+        # set the query's _offset property
+        self._query._offset = value
+        # return the builder for call chaining
+        return self
+
+    def addColumn(self, column_name: str) -> QueryBuilder:
+        """
+        Adds a column to the columns selected by the query being built
+        """
+        # add the provided column name
+        self._query._columns.append(column_name)
+        # return the builder for call chaining
+        return self
@@ -1,8 +1,9 @@
 from abc import abstractmethod
 from sqlite3 import Row
-from typing import Any, Callable, Dict, List, Optional, Protocol, Tuple, Type, TypeVar
+from typing import Any, Callable, Dict, List, Optional, Protocol, Sequence, Tuple, Type, TypeVar
 
 from .column import Column, ColumnBuilder
+from .index import Index
 from .table import Table, TableBuilder
 
 TStorable = TypeVar('TStorable', bound='Storable')
@@ -49,10 +50,29 @@ class Storable(Protocol):
 
 
 
-def table(*, name: str):
+def table(*, name: str, indexes: Sequence[Index] = (), compiled: bool = False):
+    """
+    Builds a Table from the column methods of a class.
+
+    Args:
+        name: The name of the table.
+        indexes: The composite or partial indexes of the table.
+        compiled: Whether to generate `__slots__`, and a `__from_row__`/`__values__` pair unless the
+            class implements them. Each column's value is held in a slot named after its column
+            method with a leading underscore, such as `_id` for a method `id`, so a column method
+            cannot be named `table` or after another class attribute. The generated
+            `__from_row__` reads the row by position and does not call `__init__`.
+
+    Raises:
+        ValueError: If compiled and the slot of a column method is a class attribute
+    """
     def wrapper(cls: Type[Storable]) -> Type[Storable]:
+        # the attribute holding the value of each column, in column order
+        attributes: List[str] = list()
         table_builder: TableBuilder = TableBuilder()
         table_builder.setName(name)
+        # add each composite or partial index declared on the table
+        for index in indexes: table_builder.addIndex(index)
 
         for method_name, method in cls.__dict__.items():
             # if the method does not have attached column metadata, skip it
@@ -82,29 +102,83 @@ def table(*, name: str):
             is_unique: Optional[bool] = value if value and isinstance(value, bool) else False
             column_builder.isUnique(is_unique)
 
+            value: Optional[Any] = metadata.get('is_indexed')
+            is_indexed: Optional[bool] = value if value and isinstance(value, bool) else False
+            column_builder.isIndexed(is_indexed)
+
             column: Column = column_builder.build()
 
             table_builder.addColumn(column)
-
-        def __init__(self: Storable, *args: List[Any], **kwargs: Dict[str, Any]):
-            # class the provided class' __init__
-            cls.__init__(self, *args, **kwargs)
-            self._table = table_builder.build()
-            
-        # set the class __init__ to the modified init
-        cls.__init__ = __init__
+            attributes.append(f'_{method_name}')
+
+        # build the table once for the class and its instances
+        built: Table = table_builder.build()
+        setattr(cls, '_table', built)
+        # provide the table from __table__ unless the class implements it
+        if '__table__' not in cls.__dict__: setattr(cls, '__table__', classmethod(lambda _: built))
+        # replace the class with a slotted class holding generated row mapping methods
+        if compiled: cls = _compile(cls, attributes)
         # return the modified class
         return cls
     return wrapper
 
-def column(*, name: str, type: str, is_primary: bool = False, is_unique: bool = False):
+def column(*, name: str, type: str, is_primary: bool = False, is_unique: bool = False, is_indexed: bool = False):
     def wrapper(func: Callable[..., Any]):
         metadata: Dict[str, Any] = {
             'name': name,
             'type': type,
             'is_primary': is_primary,
-            'is_unique': is_unique
+            'is_unique': is_unique,
+            'is_indexed': is_indexed
         }
         setattr(func, '_column_metadata', metadata)
         return func
-    return wrapper
\ No newline at end of file
+    return wrapper
+
+
+def _compile(cls: Type[Storable], attributes: List[str]) -> Type[Storable]:
+    """
+    Recreates a class with a slot for each column attribute, and with a `__from_row__`/`__values__`
+    pair generated for its columns unless the class implements them.
+    """
+    namespace: Dict[str, Any] = dict(cls.__dict__)
+    existing: Tuple[str, ...] = (namespace['__slots__'],) if isinstance(namespace.get('__slots__'), str) else tuple(namespace.get('__slots__', ()))
+    # remove the descriptors of existing slots and of the instance dictionary, which the new class recreates
+    for attribute in (*existing, '__dict__', '__weakref__'): namespace.pop(attribute, None)
+    # a slot cannot share its name with a class attribute, such as _table for a column method table
+    for attribute in attributes:
+        if attribute in namespace: raise ValueError(f'{cls.__name__}.{attribute[1:]}: Expected a column method whose slot name {attribute} is not a class attribute, got {attribute[1:]}')
+    namespace['__slots__'] = existing + tuple(attribute for attribute in attributes if attribute not in existing)
+
+    # generate the methods as source, so each column is read and written without a loop
+    targets: str = ''.join(f'item.{attribute}, ' for attribute in attributes)
+    values: str = ''.join(f'self.{attribute}, ' for attribute in attributes)
+    # unpack the row positionally into the slots, rather than looking up each column by name
+    assignment: str = f'    {targets}= row\n' if attributes else ''
+    source: str = f'def __from_row__(cls, row):\n    item = cls.__new__(cls)\n{assignment}    return item\n\ndef __values__(self):\n    return ({values})\n'
+    generated: Dict[str, Any] = dict()
+    exec(source, {}, generated)
+    if '__from_row__' not in namespace: namespace['__from_row__'] = classmethod(generated['__from_row__'])
+    if '__values__' not in namespace: namespace['__values__'] = generated['__values__']
+
+    compiled: Type[Storable] = type(cls)(cls.__name__, cls.__bases__, namespace)
+    # point the __class__ cells used by zero-argument super() at the new class
+    for value in namespace.values(): _replace_class_cells(value, cls, compiled)
+    return compiled
+
+def _replace_class_cells(value: Any, old: type, new: type) -> None:
+    """
+    Replaces the references to a class held in the closure cells of a function,
+    or of the functions wrapped by a classmethod, staticmethod or property.
+    """
+    if isinstance(value, (classmethod, staticmethod)): functions: Tuple[Any, ...] = (value.__func__,)
+    elif isinstance(value, property): functions = (value.fget, value.fset, value.fdel)
+    else: functions = (value,)
+    for function in functions:
+        # skip non-functions and functions without a closure
+        for cell in getattr(function, '__closure__', None) or ():
+            try:
+                if cell.cell_contents is old: cell.cell_contents = new
+            except ValueError:
+                # the cell is empty
+                continue
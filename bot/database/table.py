@@ -1,10 +1,12 @@
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
-from .clauses import WhereClause
+from .clauses import Clause
+from .query import Query
 
 from .column import Column
+from .index import Index
 
 
 class Table:
@@ -24,6 +26,17 @@ class Table:
         self._schema: Optional[str] = None
         self._name: Optional[str] = None
         self._columns: List[Column] = list()
+        self._indexes: List[Index] = list()
+        self._statements: Dict[Tuple[object, ...], str] = dict()
+        """The generated SQL statements by statement type and arguments."""
+
+    def _memoize(self, key: Tuple[object, ...], generate: Callable[[], str]) -> str:
+        """
+        Returns the SQL statement generated for the key, generating it on first use.
+        """
+        sql: Optional[str] = self._statements.get(key)
+        if sql is None: sql = self._statements[key] = generate()
+        return sql
 
     def __create__(self, *, if_not_exists: bool = True) -> str:
         """
@@ -32,6 +45,9 @@ class Table:
         Args:
             if_not_exists: whether 'IF NOT EXISTS' should be included in the statement.
         """
+        return self._memoize(('create', if_not_exists), lambda: self._create(if_not_exists=if_not_exists))
+
+    def _create(self, *, if_not_exists: bool) -> str:
         terms: List[str] = list()
         # add the create table command to the list of terms
         terms.append('CREATE TABLE')
@@ -49,16 +65,28 @@ class Table:
 
         return f'{sql} ({delimited_columns})'
 
-    def __select__(self, where: Optional[WhereClause] = None) -> str:
+    def __select__(self, where: Optional[Union[Clause, Query]] = None) -> str:
         """
         Get the SQL statement responsible for selecting the table
+
+        Args:
+            where: the clause the rows must match, or a query filtering, ordering, limiting and projecting the rows.
+
+        Raises:
+            ValueError: If the clause or query references a column that is not in the table
         """
+        # check the referenced columns, as column names are not parameterized
+        if where: self._check_columns(where.columns)
+        projection: Tuple[str, ...] = tuple(where.projection) if isinstance(where, Query) else ()
+        return self._memoize(('select', projection, where.__sql__() if where else None), lambda: self._select(where))
+
+    def _select(self, where: Optional[Union[Clause, Query]]) -> str:
         terms: List[str] = list()
         # add the select command to the list of terms
         terms.append('SELECT')
 
-        # get the statement for each column
-        column_names: List[str] = [column._name for column in self._columns]
+        # get the projected column names if provided, otherwise every column name
+        column_names: List[str] = where.projection if isinstance(where, Query) and where.projection else [column._name for column in self._columns]
         # join each statement with a comma
         delimited_column_names: str = ', '.join(column_names)
         # add the delimited column names to the list of terms
@@ -69,19 +97,75 @@ class Table:
         # add the name to the list of terms if it exists
         if self._name: terms.append(self._fully_qualified_name)
         
+        # if a query was provided
+        if isinstance(where, Query):
+            # add the query's where, order and limit terms to the list of terms
+            query: str = where.__sql__()
+            if query: terms.append(query)
         # if a where clause was provided
-        if where:
+        elif where:
             # add the where clause to the list of terms
-            terms.append(f'WHERE {where._column_name} = ?')
+            terms.append(f'WHERE {where.__sql__()}')
 
         # join the terms with a space character
         sql: str = ' '.join(terms)        
         return f'{sql}'
 
+    def _check_columns(self, column_names: Iterable[str]) -> None:
+        """
+        Raises:
+            ValueError: If a column name is not a column of the table
+        """
+        known: List[str] = [column._name for column in self._columns]
+        for column_name in column_names:
+            if column_name not in known: raise ValueError(f'{column_name} is not a column of {self._fully_qualified_name}')
+
+    def __page__(self, key: str, *, where: Optional[Clause] = None, bounded: bool = True, descending: bool = False) -> str:
+        """
+        Get the SQL statement responsible for selecting a page of the table ordered by a key column.
+        The statement takes the where clause parameters if provided, then the key bound if bounded,
+        then the row limit as parameters.
+
+        Args:
+            key: the name of the column to order and bound the page by.
+            where: the clause the rows must match.
+            bounded: whether the page starts after, or when descending before, a key value.
+            descending: whether the rows are ordered by descending key.
+
+        Raises:
+            ValueError: If the key is not a column of the table
+        """
+        self._check_columns([key] + (where.columns if where else []))
+        return self._memoize(('page', key, where.__sql__() if where else None, bounded, descending), lambda: self._page(key, where=where, bounded=bounded, descending=descending))
+
+    def _page(self, key: str, *, where: Optional[Clause], bounded: bool, descending: bool) -> str:
+        terms: List[str] = list()
+        # add the select statement without a where clause to the list of terms
+        terms.append(self._select(None))
+
+        conditions: List[str] = list()
+        # add the where clause to the list of conditions if provided
+        if where: conditions.append(where.__sql__())
+        # add the key bound to the list of conditions if bounded
+        if bounded: conditions.append(f'{key} {"<" if descending else ">"} ?')
+        # add the conditions to the list of terms if any exist
+        if conditions: terms.append(f'WHERE {" AND ".join(conditions)}')
+
+        # add the ordering and limit to the list of terms
+        terms.append(f'ORDER BY {key} {"DESC" if descending else "ASC"}')
+        terms.append('LIMIT ?')
+
+        # join the terms with a space character
+        sql: str = ' '.join(terms)
+        return f'{sql}'
+
     def __insert__(self) -> str:
         """
         Get the SQL statement responsible for inserting the table
         """
+        return self._memoize(('insert',), self._insert)
+
+    def _insert(self) -> str:
         terms: List[str] = list()
         # add the create table command to the list of terms
         terms.append('INSERT INTO')
@@ -101,7 +185,147 @@ class Table:
         delimited_values: str = ', '.join(values)
 
         return  f'{sql} ({delimited_column_names}) VALUES ({delimited_values})'
-            
+
+    def _get_key(self, key: Optional[Sequence[str]] = None) -> Tuple[str, ...]:
+        """
+        Retrieves the names of the columns identifying a row, defaulting to the primary key
+        columns, or the first unique column of a table without a primary key.
+
+        Raises:
+            ValueError: If a key column is not in the table, or no key is provided and the table has none
+        """
+        if key:
+            self._check_columns(key)
+            return tuple(key)
+        primary: Tuple[str, ...] = tuple(column._name for column in self._columns if column._is_primary)
+        if primary: return primary
+        unique: Tuple[str, ...] = tuple(column._name for column in self._columns if column._is_unique)
+        if unique: return unique[:1]
+        raise ValueError(f'{self._fully_qualified_name} has no primary key or unique column')
+
+    def _get_positions(self, column_names: Iterable[str]) -> Tuple[int, ...]:
+        """
+        Retrieves the position of each column in the table, which is also its position in an item's values.
+        """
+        known: List[str] = [column._name for column in self._columns]
+        return tuple(known.index(column_name) for column_name in column_names)
+
+    def __update__(self, key: Optional[Sequence[str]] = None) -> str:
+        """
+        Get the SQL statement responsible for updating a row of the table by its key.
+        The statement takes an item's values as parameters, in column order.
+
+        Args:
+            key: the names of the columns identifying the row, or None for the primary key.
+
+        Raises:
+            ValueError: If the table has no key, or no columns outside of the key
+        """
+        key = self._get_key(key)
+        return self._memoize(('update', key), lambda: self._update(key))
+
+    def _update(self, key: Tuple[str, ...]) -> str:
+        terms: List[str] = list()
+        # add the update command to the list of terms
+        terms.append('UPDATE')
+        # add the name to the list of terms if it exists
+        if self._name: terms.append(self._fully_qualified_name)
+
+        # number each placeholder by column position, so the parameters stay in column order
+        assignments: List[str] = [f'{column._name} = ?{position}' for position, column in enumerate(self._columns, 1) if column._name not in key]
+        if not assignments: raise ValueError(f'{self._fully_qualified_name} has no columns outside of the key {", ".join(key)}')
+        # add the assignments to the list of terms
+        terms.append(f'SET {", ".join(assignments)}')
+
+        # match the row by each key column
+        conditions: List[str] = [f'{column_name} = ?{position + 1}' for column_name, position in zip(key, self._get_positions(key))]
+        # add the conditions to the list of terms
+        terms.append(f'WHERE {" AND ".join(conditions)}')
+
+        # join the terms with a space character
+        sql: str = ' '.join(terms)
+        return f'{sql}'
+
+    def __upsert__(self, key: Optional[Sequence[str]] = None) -> str:
+        """
+        Get the SQL statement responsible for inserting a row of the table, or updating
+        the existing row with the same key. The statement takes an item's values as
+        parameters, in column order.
+
+        Args:
+            key: the names of the columns of the primary key or a unique constraint, or None for the primary key.
+
+        Raises:
+            ValueError: If the table has no key
+        """
+        key = self._get_key(key)
+        return self._memoize(('upsert', key), lambda: self._upsert(key))
+
+    def _upsert(self, key: Tuple[str, ...]) -> str:
+        terms: List[str] = list()
+        # add the insert statement to the list of terms
+        terms.append(self._insert())
+        # add the conflict target to the list of terms
+        terms.append(f'ON CONFLICT ({", ".join(key)})')
+
+        # replace each column outside of the key with the value that conflicted
+        assignments: List[str] = [f'{column._name} = excluded.{column._name}' for column in self._columns if column._name not in key]
+        # keep the existing row if every column is part of the key
+        terms.append(f'DO UPDATE SET {", ".join(assignments)}' if assignments else 'DO NOTHING')
+
+        # join the terms with a space character
+        sql: str = ' '.join(terms)
+        return f'{sql}'
+
+    def __remove__(self, where: Optional[Union[Clause, Sequence[str]]] = None) -> str:
+        """
+        Get the SQL statement responsible for deleting rows of the table
+
+        Args:
+            where: the clause the rows must match, or the names of the columns identifying a
+                row, in which case the statement takes the value of each column as parameters.
+
+        Raises:
+            ValueError: If the clause or key references a column that is not in the table
+        """
+        # delete every row if no clause or key was provided
+        if not where: return self._memoize(('remove', None), lambda: self._remove(None))
+        # check the referenced columns, as column names are not parameterized
+        self._check_columns(where.columns if isinstance(where, Clause) else where)
+        condition: str = where.__sql__() if isinstance(where, Clause) else ' AND '.join(f'{column_name} = ?' for column_name in where)
+        return self._memoize(('remove', condition), lambda: self._remove(condition))
+
+    def _remove(self, condition: Optional[str]) -> str:
+        terms: List[str] = list()
+        # add the delete command to the list of terms
+        terms.append('DELETE FROM')
+        # add the name to the list of terms if it exists
+        if self._name: terms.append(self._fully_qualified_name)
+        # add the condition to the list of terms if provided
+        if condition: terms.append(f'WHERE {condition}')
+
+        # join the terms with a space character
+        sql: str = ' '.join(terms)
+        return f'{sql}'
+
+    @property
+    def indexes(self) -> List[Index]:
+        """The indexes of the table, including the single-column index of each indexed column."""
+        return [Index(column._name) for column in self._columns if column._is_indexed] + self._indexes
+
+    def __indexes__(self, *, if_not_exists: bool = True) -> List[str]:
+        """
+        Get the SQL statements responsible for creating the table's indexes
+
+        Args:
+            if_not_exists: whether 'IF NOT EXISTS' should be included in the statements.
+
+        Raises:
+            ValueError: If an index references a column that is not in the table
+        """
+        for index in self._indexes: self._check_columns(index.columns)
+        return [index.__sql__(self._fully_qualified_name, if_not_exists=if_not_exists) for index in self.indexes]
+
     def __delete__(self, *, if_exists: bool) -> str:
         """
         Get the SQL statement responsible for deleting the table
@@ -109,6 +333,9 @@ class Table:
         Args:
             if_exists: whether 'IF EXISTS' should be included in the statement.
         """
+        return self._memoize(('delete', if_exists), lambda: self._delete(if_exists=if_exists))
+
+    def _delete(self, *, if_exists: bool) -> str:
         terms: List[str] = list()
         # add the create table command to the list of terms
         terms.append('DROP TABLE')
@@ -154,6 +381,17 @@ class TableBuilder():
         """
         # set the table's _name property
         self._table._name = value
+        # discard statements generated with the previous name
+        self._table._statements.clear()
+        # return the builder for call chaining
+        return self
+
+    def addIndex(self, value: Index) -> TableBuilder:
+        """
+        Adds an index to the table being built
+        """
+        # add the provided index
+        self._table._indexes.append(value)
         # return the builder for call chaining
         return self
 
@@ -163,6 +401,8 @@ class TableBuilder():
         """
         # add the provided column
         self._table._columns.append(value)
+        # discard statements generated without the column
+        self._table._statements.clear()
         # return the builder for call chaining
         return self
 
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from typing import Any, Dict, Generic, Optional, Sequence, Tuple, Type
+
+from .asyncdatabase import AsyncDatabase
+from .storable import TStorable
+from .table import Table
+
+log: logging.Logger = logging.getLogger(__name__)
+
+_open: 'weakref.WeakSet[WriteBuffer[Any]]' = weakref.WeakSet()
+"""The buffers that have not been closed, flushed by `WriteBuffer.flush_open` during shutdown"""
+
+
+class WriteBuffer(Generic[TStorable]):
+    """
+    A write-behind buffer for items of one storable type that are written too often
+    to commit one at a time, such as counters updated on every gateway event.
+
+    Writes are accepted immediately and coalesced by key, so only the latest item
+    for each key is written. The buffered items are upserted in one transaction every
+    `interval` seconds, or as soon as `batch_size` keys are buffered. Once `max_size`
+    keys are buffered, writes of new keys wait until a flush completes. Items that
+    fail to flush are kept in the buffer, unless a newer item has replaced them.
+    Buffers that are not closed are flushed when a `Core` shuts down.
+    """
+
+    def __init__(self, database: AsyncDatabase, type: Type[TStorable], *, interval: float = 1.0, batch_size: int = 1000, max_size: int = 10000, key: Optional[Sequence[str]] = None) -> None:
+        """
+        Initializes a `WriteBuffer`. Call `start` from the event loop to begin flushing periodically.
+
+        Args:
+            database: The database the items are written to.
+            type: The storable type of the items.
+            interval: The maximum time, in seconds, an item is buffered before a flush begins.
+            batch_size: The number of buffered keys that begins a flush before the interval elapses.
+            max_size: The number of buffered keys at which writes of new keys wait for a flush.
+            key: The names of the columns identifying an item, or None for the primary key.
+        """
+        if interval <= 0: raise ValueError(f'interval: Expected a positive number, got {interval}')
+        if batch_size < 1: raise ValueError(f'batch_size: Expected a positive integer, got {batch_size}')
+        if max_size < batch_size: raise ValueError(f'max_size: Expected an integer of at least batch_size ({batch_size}), got {max_size}')
+        self._database: AsyncDatabase = database
+        self._type: Type[TStorable] = type
+        self._interval: float = interval
+        self._batch_size: int = batch_size
+        self._max_size: int = max_size
+
+        table: Table = type.__table__()
+        self._key: Tuple[str, ...] = table._get_key(key)
+        # the position of each key column in the values of an item
+        self._positions: Tuple[int, ...] = table._get_positions(self._key)
+
+        # the latest item written for each key, in order of first write
+        self._items: Dict[Tuple[Any, ...], TStorable] = dict()
+        # created on first use, as they bind to the current event loop when created on Python 3.9
+        self._due_event: Optional[asyncio.Event] = None
+        self._room_event: Optional[asyncio.Event] = None
+        self._flush_lock: Optional[asyncio.Lock] = None
+        self._task: Optional[asyncio.Task[None]] = None
+        self._closed: bool = False
+
+        # flush the buffer during shutdown even if it is never closed
+        _open.add(self)
+
+        self.written: int = 0
+        """The number of items written to the buffer."""
+        self.coalesced: int = 0
+        """The number of written items replaced by a later item with the same key before being flushed."""
+        self.flushed: int = 0
+        """The number of items flushed to the database."""
+
+    @property
+    def pending(self) -> int:
+        """The number of buffered keys."""
+        return len(self._items)
+
+    @property
+    def _due(self) -> asyncio.Event:
+        """Set when a flush should begin before the interval elapses."""
+        if not self._due_event: self._due_event = asyncio.Event()
+        return self._due_event
+
+    @property
+    def _room(self) -> asyncio.Event:
+        """Set while the buffer has room for new keys."""
+        if not self._room_event:
+            self._room_event = asyncio.Event()
+            self._room_event.set()
+        return self._room_event
+
+    @property
+    def _lock(self) -> asyncio.Lock:
+        """Held while a flush is in progress."""
+        if not self._flush_lock: self._flush_lock = asyncio.Lock()
+        return self._flush_lock
+
+    def start(self) -> None:
+        """
+        Starts flushing the buffer in the background.
+        """
+        if self._task: return
+        self._task = asyncio.create_task(self._run(), name=f'{WriteBuffer.__name__}:{self._type.__name__}')
+
+    def put(self, item: TStorable) -> bool:
+        """
+        Buffers an item without waiting.
+
+        Returns:
+            Whether the item was buffered, which is False if it has a new key and the buffer is full.
+
+        Raises:
+            RuntimeError: If the buffer has been closed
+        """
+        if self._closed: raise RuntimeError(f'{WriteBuffer.__name__}: The buffer has been closed')
+        values: Tuple[Any, ...] = item.__values__()
+        key: Tuple[Any, ...] = tuple(values[position] for position in self._positions)
+        if key not in self._items and len(self._items) >= self._max_size:
+            # begin a flush to make room
+            self._room.clear()
+            self._due.set()
+            return False
+        if key in self._items: self.coalesced += 1
+        self._items[key] = item
+        self.written += 1
+        if len(self._items) >= self._batch_size: self._due.set()
+        return True
+
+    async def write(self, item: TStorable) -> None:
+        """
+        Buffers an item, waiting for a flush to complete while the buffer is full.
+        Starts flushing in the background if `start` has not been called, so that the wait ends.
+
+        Raises:
+            RuntimeError: If the buffer has been closed
+        """
+        while not self.put(item):
+            self.start()
+            await self._room.wait()
+
+    async def flush(self) -> int:
+        """
+        Writes the buffered items to the database in one transaction.
+
+        Returns:
+            The number of rows written.
+        """
+        async with self._lock:
+            if not self._items: return 0
+            # take the buffered items, so that writes during the flush are buffered for the next one
+            items: Dict[Tuple[Any, ...], TStorable] = self._items
+            self._items = dict()
+            try:
+                count: int = await self._database.upsert_many(self._type, list(items.values()), key=self._key)
+            except BaseException:
+                # restore the items that have not been replaced by newer ones
+                for key, item in items.items():
+                    if key in self._items: self.coalesced += 1
+                    else: self._items[key] = item
+                raise
+            finally:
+                # let waiting writers retry, even if the flush failed
+                self._room.set()
+            self.flushed += len(items)
+            return count
+
+    async def close(self) -> None:
+        """
+        Stops flushing in the background and flushes the remaining items.
+        Writes made after closing raise a `RuntimeError`.
+        Suitable as a `Core.add_flush` callback or for a component's `__flush__` hook.
+        """
+        self._closed = True
+        _open.discard(self)
+        if self._task:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        count: int = await self.flush()
+        log.debug(f'{self._type.__name__}: Flushed {count} rows on close, {self.coalesced} writes coalesced')
+
+    @staticmethod
+    async def flush_open() -> None:
+        """
+        Flushes every buffer in the process that has not been closed, logging failures.
+        Called by `Core` during shutdown, before components flush their own state.
+        """
+        for buffer in list(_open):
+            try:
+                count: int = await buffer.flush()
+                if count: log.debug(f'{buffer._type.__name__}: Flushed {count} rows on shutdown')
+            except Exception as error:
+                log.warning(f'{buffer._type.__name__}: Failed to flush {buffer.pending} buffered items on shutdown: {error}')
+
+    async def _run(self) -> None:
+        """
+        Flushes the buffer whenever the interval elapses or a flush is due.
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self._due.wait(), self._interval)
+            except asyncio.TimeoutError:
+                pass
+            self._due.clear()
+            try:
+                # let a flush in progress complete if the task is cancelled, so that close does not roll it back
+                await asyncio.shield(self.flush())
+            except Exception as error:
+                log.warning(f'{self._type.__name__}: Failed to flush {self.pending} buffered items: {error}')
+                # retry once the interval elapses rather than immediately
+                await asyncio.sleep(self._interval)
@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import time
+from typing import Any, Callable, Coroutine, Dict, Iterator, List, Optional, Set, Tuple
+
+log: logging.Logger = logging.getLogger(__name__)
+
+METADATA_ATTRIBUTE: str = '_listener_metadata'
+"""The attribute storing listener metadata on a decorated coroutine"""
+
+Predicate = Callable[..., bool]
+Callback = Callable[..., Coroutine[Any, Any, Any]]
+Key = Tuple[Optional[int], Optional[int]]
+
+
+def listener(event: str, *, guild: Optional[int] = None, channel: Optional[int] = None, predicate: Optional[Predicate] = None):
+    """
+    Marks a component coroutine as a handler for a gateway event instead of a command.
+    A coroutine can be decorated several times to handle several events.
+
+    Args:
+        event: The name of the event without the `on_` prefix (e.g. `message`).
+        guild: The ID of the guild the event must originate from.
+        channel: The ID of the channel the event must originate from.
+        predicate: A callable receiving the event arguments that must return True for the handler to run.
+    """
+    def wrapper(func: Callback) -> Callback:
+        metadata: List[Dict[str, Any]] = getattr(func, METADATA_ATTRIBUTE, [])
+        metadata.append({
+            'event': event,
+            'guild': guild,
+            'channel': channel,
+            'predicate': predicate,
+        })
+        setattr(func, METADATA_ATTRIBUTE, metadata)
+        return func
+    return wrapper
+
+
+class Handler():
+    """
+    A routed event handler and its latency metrics.
+    """
+
+    def __init__(self, callback: Callback, *, event: str, guild: Optional[int] = None, channel: Optional[int] = None, predicate: Optional[Predicate] = None) -> None:
+        self.callback: Callback = callback
+        self.event: str = event
+        self.guild: Optional[int] = guild
+        self.channel: Optional[int] = channel
+        self.predicate: Optional[Predicate] = predicate
+
+        self.calls: int = 0
+        """The number of completed calls."""
+        self.failures: int = 0
+        """The number of calls that raised an exception."""
+        self.total: float = 0.0
+        """The total time spent in the handler, in seconds."""
+        self.maximum: float = 0.0
+        """The longest call, in seconds."""
+
+    @property
+    def name(self) -> str:
+        """The qualified name of the handler's callback."""
+        return self.callback.__qualname__
+
+    @property
+    def key(self) -> Key:
+        """The routing key of the handler."""
+        return (self.guild, self.channel)
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """A summary of the handler's latency metrics."""
+        return {
+            'handler': self.name,
+            'event': self.event,
+            'calls': self.calls,
+            'failures': self.failures,
+            'mean': self.total / self.calls if self.calls else 0.0,
+            'max': self.maximum,
+        }
+
+    def accepts(self, *args: Any) -> bool:
+        """
+        Checks the handler's predicate against the event arguments.
+        A predicate that raises is counted as a failure and rejects the event,
+        so that it cannot interrupt the dispatch of the event to other handlers.
+        """
+        if not self.predicate: return True
+        try:
+            return bool(self.predicate(*args))
+        except Exception as exception:
+            self.failures += 1
+            log.warning(f'{self.name}: {exception.__class__.__name__} occurred checking the predicate for {self.event}: {exception}')
+            return False
+
+    async def __call__(self, *args: Any, **kwargs: Any) -> None:
+        start: float = time.perf_counter()
+        try:
+            await self.callback(*args, **kwargs)
+        except Exception as exception:
+            self.failures += 1
+            log.warning(f'{self.name}: {exception.__class__.__name__} occurred handling {self.event}: {exception}')
+        finally:
+            elapsed: float = time.perf_counter() - start
+            self.calls += 1
+            self.total += elapsed
+            self.maximum = max(self.maximum, elapsed)
+
+
+class Router():
+    """
+    Routes gateway events to handlers indexed by event name, guild and channel.
+    A dispatch only visits handlers registered for the event under one of the four
+    keys matching its origin, rather than every handler.
+    """
+
+    def __init__(self) -> None:
+        self._index: Dict[str, Dict[Key, List[Handler]]] = dict()
+        self._tasks: Set[asyncio.Task[None]] = set()
+        self._closed: bool = False
+
+    def __iter__(self) -> Iterator[Handler]:
+        for keys in self._index.values():
+            for handlers in keys.values():
+                yield from handlers
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    @property
+    def tasks(self) -> Set[asyncio.Task[None]]:
+        """The handler tasks that have not completed."""
+        return self._tasks
+
+    @property
+    def metrics(self) -> List[Dict[str, Any]]:
+        """The latency metrics of each handler, slowest mean first."""
+        return sorted((handler.metrics for handler in self), key=lambda metrics: metrics['mean'], reverse=True)
+
+    def close(self) -> None:
+        """
+        Stops scheduling handlers for new events. Running handlers are left to complete.
+        """
+        self._closed = True
+
+    def add(self, handler: Handler) -> None:
+        """
+        Adds a handler to the routing table.
+        """
+        self._index.setdefault(handler.event, dict()).setdefault(handler.key, list()).append(handler)
+
+    def match(self, event: str, *args: Any) -> List[Handler]:
+        """
+        Retrieves the handlers matching an event and its arguments.
+        """
+        # skip events without any handlers
+        keys: Optional[Dict[Key, List[Handler]]] = self._index.get(event)
+        if not keys: return []
+
+        guild, channel = Router._get_origin(args)
+        # get the handlers for each key matching the event origin
+        candidates: List[Handler] = list()
+        for key in {(None, None), (guild, None), (None, channel), (guild, channel)}:
+            candidates.extend(keys.get(key, []))
+        # filter the handlers by predicate
+        return [handler for handler in candidates if handler.accepts(*args)]
+
+    def dispatch(self, event: str, *args: Any, **kwargs: Any) -> None:
+        """
+        Schedules each handler matching an event, unless the router is closed.
+        """
+        if self._closed: return
+        for handler in self.match(event, *args):
+            task: asyncio.Task[None] = asyncio.create_task(handler(*args, **kwargs), name=f'{handler.name}:{event}')
+            # keep a reference to the task until it completes
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    @staticmethod
+    def _get_origin(args: Tuple[Any, ...]) -> Key:
+        """
+        Retrieves the guild and channel IDs of an event from its first argument.
+        """
+        if not args: return (None, None)
+        subject: Any = args[0]
+
+        guild: Optional[Any] = getattr(subject, 'guild', None)
+        guild_id: Optional[int] = getattr(guild, 'id', None) if guild is not None else getattr(subject, 'guild_id', None)
+
+        channel: Optional[Any] = getattr(subject, 'channel', None)
+        channel_id: Optional[int] = getattr(channel, 'id', None) if channel is not None else getattr(subject, 'channel_id', None)
+
+        return (guild_id, channel_id)
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+# the client is only needed for annotations
+if TYPE_CHECKING:
+    from .core import Core
+
+log: logging.Logger = logging.getLogger(__name__)
+
+READY: bytes = b'ready\n'
+"""Sent by the new process once its components are loaded"""
+
+DRAINING: bytes = b'draining\n'
+"""Sent by the running process once it has stopped handling interactions and events"""
+
+CLOSED: bytes = b'closed\n'
+"""Sent by the running process once it has drained and disconnected"""
+
+
+class Handover():
+    """
+    Coordinates a handover between a running bot process and its replacement
+    over a local socket.
+
+    The running process listens on the socket. A new process started with the
+    same socket connects, loads its components, and sends `READY`. The running
+    process then stops handling interactions and events, releases the socket,
+    replies `DRAINING` and shuts down gracefully, replying `CLOSED` once it has
+    disconnected. The new process starts handling interactions as soon as it
+    receives `DRAINING` and listens on the socket for its own replacement.
+    """
+
+    def __init__(self, path: Path) -> None:
+        """
+        Initializes a `Handover`.
+
+        Args:
+            path: The path of the local socket shared by successive processes.
+        """
+        self._path: Path = path
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._retiring: Optional[asyncio.Task[None]] = None
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    @property
+    def path(self) -> Path:
+        """The path of the local socket."""
+        return self._path
+
+    async def connect(self) -> bool:
+        """
+        Connects to the process currently running on the socket, if any.
+
+        Returns:
+            Whether a running process accepted the connection.
+        """
+        try:
+            self._reader, self._writer = await asyncio.open_unix_connection(str(self._path))
+            log.info(f'Found a running process on {self._path}')
+            return True
+        except (FileNotFoundError, ConnectionRefusedError):
+            return False
+
+    async def take_over(self) -> float:
+        """
+        Signals readiness to the running process and waits for it to stop handling
+        interactions and events.
+
+        Returns:
+            The time, in seconds, between signalling readiness and the running process stopping.
+
+        Raises:
+            ConnectionError: If the running process disconnects before handing over
+        """
+        if not self._reader or not self._writer: raise ConnectionError('Not connected to a running process')
+        start: float = time.perf_counter()
+        self._writer.write(READY)
+        await self._writer.drain()
+        if await self._reader.readline() != DRAINING: raise ConnectionError('The running process disconnected before handing over')
+        return time.perf_counter() - start
+
+    async def wait_closed(self, timeout: Optional[float] = None) -> None:
+        """
+        Waits for the previous process to finish draining and disconnect.
+        """
+        if not self._reader or not self._writer: return
+        try:
+            if await asyncio.wait_for(self._reader.readline(), timeout) == CLOSED: log.info('The previous process has closed')
+        except asyncio.TimeoutError:
+            log.warning(f'The previous process did not close within {timeout:g}s')
+        finally:
+            self._writer.close()
+            self._reader = self._writer = None
+
+    async def serve(self, client: Core) -> None:
+        """
+        Listens on the socket for a replacement process, handing over the client to it once it is ready.
+        """
+        # remove a socket left behind by a process that did not exit cleanly
+        self._path.unlink(missing_ok=True)
+
+        async def accept(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+            # only hand over once, to the first process that becomes ready
+            if self._retiring or await reader.readline() != READY:
+                writer.close()
+                return
+            self._retiring = asyncio.current_task()
+            await self._retire(client, writer)
+
+        self._server = await asyncio.start_unix_server(accept, str(self._path))
+        log.debug(f'Listening for a replacement process on {self._path}')
+
+    async def close(self) -> None:
+        """
+        Stops listening on the socket and waits for an ongoing handover to complete.
+        """
+        self._stop_serving()
+        if self._retiring and self._retiring is not asyncio.current_task(): await self._retiring
+
+    async def _retire(self, client: Core, writer: asyncio.StreamWriter) -> None:
+        """
+        Stops the client handling interactions and events, then shuts it down while reporting progress to the replacement process.
+        """
+        log.info('Replacement process is ready, handing over')
+        client.standby = True
+        # release the socket so the replacement process can listen on it
+        self._stop_serving()
+        try:
+            writer.write(DRAINING)
+            await writer.drain()
+            await client.close()
+            writer.write(CLOSED)
+            await writer.drain()
+        except ConnectionError as error:
+            log.warning(f'Lost connection to the replacement process: {error}')
+            await client.close()
+        finally:
+            writer.close()
+
+    def _stop_serving(self) -> None:
+        if not self._server: return
+        self._server.close()
+        self._server = None
+        self._path.unlink(missing_ok=True)
@@ -0,0 +1,180 @@
+import hashlib
+import importlib.util
+import inspect
+import logging
+import zipfile
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+
+from discord import Intents
+
+from .bundle import Bundle
+from .component import Component
+from .events import METADATA_ATTRIBUTE
+from .loader import execute_module
+
+log: logging.Logger = logging.getLogger(__name__)
+
+INTENTS_ATTRIBUTE: str = '__intents__'
+"""The class attribute declaring the gateway intents a component requires"""
+
+EVENT_INTENTS: Dict[str, Tuple[str, ...]] = {
+    'message': ('messages',),
+    'message_edit': ('messages',),
+    'message_delete': ('messages',),
+    'bulk_message_delete': ('guild_messages',),
+    'raw_message_edit': ('messages',),
+    'raw_message_delete': ('messages',),
+    'raw_bulk_message_delete': ('guild_messages',),
+    'reaction_add': ('reactions',),
+    'reaction_remove': ('reactions',),
+    'reaction_clear': ('reactions',),
+    'reaction_clear_emoji': ('reactions',),
+    'raw_reaction_add': ('reactions',),
+    'raw_reaction_remove': ('reactions',),
+    'raw_reaction_clear': ('reactions',),
+    'raw_reaction_clear_emoji': ('reactions',),
+    'typing': ('typing',),
+    'raw_typing': ('typing',),
+    'member_join': ('members',),
+    'member_remove': ('members',),
+    'member_update': ('members',),
+    'raw_member_remove': ('members',),
+    'user_update': ('members',),
+    'presence_update': ('presences',),
+    'voice_state_update': ('voice_states',),
+    'member_ban': ('bans',),
+    'member_unban': ('bans',),
+    'invite_create': ('invites',),
+    'invite_delete': ('invites',),
+    'webhooks_update': ('webhooks',),
+    'integration_create': ('integrations',),
+    'integration_update': ('integrations',),
+    'guild_integrations_update': ('integrations',),
+    'guild_emojis_update': ('emojis',),
+    'guild_stickers_update': ('emojis',),
+    'scheduled_event_create': ('guild_scheduled_events',),
+    'scheduled_event_update': ('guild_scheduled_events',),
+    'scheduled_event_delete': ('guild_scheduled_events',),
+}
+"""The intents required to receive each gateway event"""
+
+INTENT_WEIGHTS: Dict[str, int] = {
+    'presences': 40,
+    'guild_messages': 20,
+    'guild_typing': 10,
+    'members': 8,
+    'guild_reactions': 6,
+    'voice_states': 4,
+    'dm_messages': 2,
+    'dm_typing': 1,
+    'dm_reactions': 1,
+    'guilds': 2,
+}
+"""
+The rough share of gateway traffic attributed to each intent on a busy bot.
+Intents not listed are considered negligible.
+"""
+
+BASE_INTENTS: Tuple[str, ...] = ('guilds',)
+"""The intents always requested, as guild data is required for application commands"""
+
+
+def get_manifest(directory: Path, isolated: Iterable[str] = ()) -> str:
+    """
+    Computes a fingerprint of the component modules and bundles in a directory
+    from their names, sizes and modification times, and of the isolated module names.
+    """
+    digest = hashlib.sha1()
+    digest.update(f'{",".join(sorted(isolated))};'.encode())
+    paths: List[Path] = [directory] if directory.is_file() else sorted(path for path in directory.glob('*') if path.suffix in ('.py', '.zip') and path.is_file())
+    for path in paths:
+        stat = path.stat()
+        digest.update(f'{path.name}:{stat.st_size}:{stat.st_mtime_ns};'.encode())
+    return digest.hexdigest()
+
+
+def discover(directory: Path, isolated: Iterable[str] = ()) -> Intents:
+    """
+    Imports the component modules in a directory or bundle, without initializing
+    any components, and returns the union of the intents they require.
+    Failed imports are logged as warning messages. The executed modules are kept in
+    the loader's module cache, so loading their components later does not execute them again.
+
+    Args:
+        directory: The components directory or bundle.
+        isolated: The names of modules run in worker processes, which are not imported.
+            Worker components only provide commands, so they require no intents.
+    """
+    intents: Intents = Intents.none()
+    for flag in BASE_INTENTS: setattr(intents, flag, True)
+
+    for spec in _get_module_specs(directory, isolated):
+        try:
+            # execute the module once, sharing it with the loader that later loads its components
+            module: ModuleType = execute_module(spec)
+            for _, class_object in inspect.getmembers(module, inspect.isclass):
+                # skip classes that are imported or are not components
+                if class_object.__module__ != module.__name__ or not isinstance(class_object, Component): continue
+                intents = intents | get_intents(class_object)
+        except Exception as exception:
+            log.warning(f'{spec.name}: {exception.__class__.__name__} occurred discovering intents: {exception}')
+    return intents
+
+
+def get_intents(class_object: Type[Any]) -> Intents:
+    """
+    Retrieves the intents required by a component class, from its `__intents__`
+    declaration and the events its listeners handle.
+
+    Raises:
+        ValueError: If the component declares an unknown intent
+    """
+    intents: Intents = Intents.none()
+    declared: Optional[Any] = getattr(class_object, INTENTS_ATTRIBUTE, None)
+    # merge intents declared as an Intents instance
+    if isinstance(declared, Intents):
+        intents = intents | declared
+    # merge intents declared by flag name
+    elif declared:
+        for flag in declared: _enable(intents, flag, class_object)
+
+    for _, coroutine in inspect.getmembers(class_object, inspect.iscoroutinefunction):
+        for declaration in getattr(coroutine, METADATA_ATTRIBUTE, []):
+            for flag in EVENT_INTENTS.get(declaration['event'], ()): _enable(intents, flag, class_object)
+    return intents
+
+
+def estimate_savings(configured: Intents, derived: Intents) -> float:
+    """
+    Estimates the fraction of gateway traffic avoided by connecting with the
+    derived intents instead of the configured intents.
+    """
+    def weigh(intents: Intents) -> int:
+        return sum(weight for flag, weight in INTENT_WEIGHTS.items() if getattr(intents, flag))
+    total: int = weigh(configured)
+    return (total - weigh(derived)) / total if total else 0.0
+
+
+def _enable(intents: Intents, flag: str, class_object: Type[Any]) -> None:
+    if flag not in Intents.VALID_FLAGS: raise ValueError(f'{class_object.__name__}: Unknown intent {flag}')
+    setattr(intents, flag, True)
+
+def _get_module_specs(directory: Path, isolated: Iterable[str] = ()) -> Iterable[ModuleSpec]:
+    """
+    Retrieves the module spec of each component module in a directory or bundle,
+    skipping the modules of the directory run in worker processes.
+    """
+    bundles: List[Path] = [directory] if zipfile.is_zipfile(directory) else sorted(path for path in directory.glob('*.zip') if zipfile.is_zipfile(path))
+    if not zipfile.is_zipfile(directory):
+        for path in sorted(directory.glob('*.py')):
+            # skip isolated modules, which only the worker processes import
+            if path.stem in isolated: continue
+            # resolve the path as the loader does, so that the module's origin matches its cache entry
+            spec: Optional[ModuleSpec] = importlib.util.spec_from_file_location(name=path.stem, location=path.resolve())
+            if spec: yield spec
+    for path in bundles:
+        bundle: Bundle = Bundle(path)
+        for name in bundle.modules: yield bundle.get_module_spec(name)
@@ -1,20 +1,28 @@
+import asyncio
 import importlib.util
 import inspect
 import logging
+import time
+import zipfile
 from asyncio import AbstractEventLoop, Task
 from importlib.machinery import ModuleSpec
 from pathlib import Path
 import sys
-from types import MethodType, ModuleType
-from typing import Any, Coroutine, List, MutableMapping, Optional, Tuple, Type, TypeVar
+from types import CodeType, MethodType, ModuleType
+from typing import Any, Coroutine, Dict, Iterable, List, Mapping, MutableMapping, Optional, Set, Tuple, Type, TypeVar
 import discord
 from typing_extensions import TypeAlias
 
 from discord.abc import Snowflake
-from discord.app_commands import Command, CommandTree
+from discord.app_commands import AppCommand, Command, CommandTree
 
+from .bundle import Bundle
 from .component import Component, KWARGTYPE
+from .events import METADATA_ATTRIBUTE, Handler, Router
+from .scheduler import Scheduler
 from .settings import Settings
+from .settings.data import LoaderSection
+from .worker import TYPES, Worker
 
 
 log: logging.Logger = logging.getLogger(__name__)
@@ -33,9 +41,34 @@ DEFAULT_DOCSTRING: str = '…'
 TRUNCATOR: str = '…'
 """The string to use for docstring truncation"""
 
+FLUSH_ATTRIBUTE: str = '__flush__'
+"""The optional component coroutine called to persist buffered state during shutdown"""
+
+BUNDLE_EXTENSION: str = 'zip'
+"""The file extension of component bundles"""
+
+_modules: Dict[str, ModuleType] = dict()
+"""Component modules executed in this process by their origin, shared by every `Loader`"""
+
 ReturnType = TypeVar('ReturnType')
 
 
+def execute_module(spec: ModuleSpec) -> ModuleType:
+    """
+    Retrieves the module of a spec, executing it unless a module with the same origin
+    has been executed in this process, so that its import-time side effects run once.
+    """
+    # reuse the module if it has been executed, such as while discovering intents or by another loader
+    module: Optional[ModuleType] = _modules.get(spec.origin) if spec.origin else None
+    if module: return module
+    # create the module from the module spec
+    module = importlib.util.module_from_spec(spec)
+    # execute the module via the spec loader if available
+    if spec.loader: spec.loader.exec_module(module)
+    if spec.origin: _modules[spec.origin] = module
+    return module
+
+
 class Loader():
 
     def __init__(self, tree: CommandTree, *, settings: Settings, client: discord.Client):
@@ -43,14 +76,40 @@ class Loader():
         self._tree: CommandTree = tree
         self._settings: Settings = settings
         self._client: discord.Client = client
+        self._workers: List[Worker] = list()
+        self._router: Router = Router()
+        self._sources: Dict[CodeType, str] = dict()
+        self._tasks: Set[Task[Any]] = set()
+        self._instances: List[Component] = list()
+        self._isolated: List[str] = list()
+
+    @property
+    def router(self) -> Router:
+        """
+        The routing table of event handlers declared by loaded components.
+        """
+        return self._router
+
+    @property
+    def sources(self) -> Dict[CodeType, str]:
+        """
+        The qualified name of each registered command and listener, keyed by its code object.
+        """
+        return self._sources
 
 
     async def load(self, directory: Path, *args: Any, extension: str = 'py', loop: Optional[AbstractEventLoop] = None, **kwargs: KWARGTYPE) -> None:
         """
-        Load package files from a directory.
+        Load package files from a directory or a zip bundle.
+        Zip bundles contained in a directory are loaded alongside its package files.
         Failed package assemblies are logged as warning messages.
         """
-        await self._process_directory(directory, extension=extension, loop=loop, *args, **kwargs)
+        # read the names of modules to run in worker processes once for the whole load
+        self._isolated = self._settings.client.loader.isolated
+        # load the reference as a bundle if it is a zip archive
+        if zipfile.is_zipfile(directory): await self._process_bundle(directory, loop=loop, *args, **kwargs)
+        # otherwise load the reference as a directory
+        else: await self._process_directory(directory, extension=extension, loop=loop, *args, **kwargs)
 
     async def sync(self, *, guild: Optional[Snowflake] = None) -> None:
         """
@@ -68,6 +127,122 @@ class Loader():
         # clear the command tree
         self._tree.clear_commands(guild=guild)
 
+    async def flush(self) -> None:
+        """
+        Calls the optional `__flush__` coroutine of each loaded component, so that
+        components can persist buffered state before the client closes.
+        Exceptions are logged as warning messages.
+        """
+        for instance in self._instances:
+            flush: Optional[Any] = getattr(instance, FLUSH_ATTRIBUTE, None)
+            if not flush: continue
+            try:
+                log.debug(f'{instance.__class__.__name__}: Flushing state')
+                await flush()
+            except Exception as error:
+                log.warning(f'{instance.__class__.__name__}: An error occurred during {FLUSH_ATTRIBUTE}: {error}')
+
+    async def close(self) -> List[str]:
+        """
+        Cancels component background tasks and stops all worker processes started by the loader.
+
+        Returns:
+            The names of the background tasks that were cancelled before completing.
+        """
+
+        # get the background tasks that have not completed
+        pending: List[Task[Any]] = [task for task in self._tasks if not task.done()]
+        # cancel each pending task
+        for task in pending: task.cancel()
+        # wait for the cancelled tasks to finish
+        await asyncio.gather(*pending, return_exceptions=True)
+        self._tasks.clear()
+
+        # stop each worker process
+        await asyncio.gather(*[worker.stop() for worker in self._workers])
+        self._workers.clear()
+        return [task.get_name() for task in pending]
+
+    async def sync_guilds(self, guilds: Iterable[Snowflake], *, copy_global: bool = False, concurrency: int = 4, rate: int = 5, period: float = 1.0) -> Dict[int, bool]:
+        """
+        Syncs the underlying command tree to several guilds concurrently.
+        Guilds whose registered commands already match the command tree are skipped.
+        Failed guild syncs are logged as warning messages.
+
+        Args:
+            guilds: The guilds to sync commands to.
+            copy_global: Whether global commands should be copied to each guild before syncing.
+            concurrency: The maximum number of guilds synced at once.
+            rate: The maximum number of guild syncs started per period.
+            period: The length of the rate window, in seconds.
+
+        Returns:
+            A mapping of guild ID to whether the guild's commands were synced.
+        """
+
+        # initialize a rate-limited scheduler for the guild syncs
+        scheduler: Scheduler = Scheduler(concurrency=concurrency, rate=rate, period=period)
+        # deduplicate the provided guilds by ID
+        targets: Dict[int, Snowflake] = {guild.id: guild for guild in guilds}
+        # record the starting time
+        start: float = time.perf_counter()
+        # sync each guild through the scheduler
+        results: List[bool] = await asyncio.gather(*[scheduler.run(self._sync_guild(guild, copy_global=copy_global)) for guild in targets.values()])
+        # calculate the elapsed time
+        elapsed: float = time.perf_counter() - start
+
+        log.info(f'Synced {sum(results)} of {len(results)} guilds in {elapsed:.2f}s')
+        return dict(zip(targets.keys(), results))
+
+    async def _sync_guild(self, guild: Snowflake, *, copy_global: bool = False) -> bool:
+        """
+        Syncs the underlying command tree to a guild if its registered commands differ.
+        """
+
+        try:
+            # copy global commands to the guild if requested
+            if copy_global: self._tree.copy_global_to(guild=guild)
+            # get the signature of each local command
+            local: List[Any] = sorted(self._get_signature(command.to_dict(self._tree)) for command in self._tree.get_commands(guild=guild))
+            # get the signature of each registered command
+            remote: List[Any] = sorted(self._get_signature(self._get_payload(command)) for command in await self._tree.fetch_commands(guild=guild))
+            # skip the guild if the commands match
+            if local == remote:
+                log.debug(f'{guild.id}: Commands up to date')
+                return False
+            # sync the command tree to the guild
+            await self._tree.sync(guild=guild)
+            log.debug(f'{guild.id}: Synced {len(local)} commands')
+            return True
+        except Exception as exception:
+            name: str = str(guild.id)
+            action: str = f'syncing guild {guild.id}'
+            log.warning(f'{name}: {exception.__class__.__name__} occurred {action}: {exception}')
+            return False
+
+    def _get_payload(self, command: AppCommand) -> Dict[str, Any]:
+        """
+        Retrieves the payload of a registered command, including the fields `AppCommand.to_dict` omits.
+        """
+
+        payload: Dict[str, Any] = dict(command.to_dict())
+        payload['nsfw'] = command.nsfw
+        payload['default_member_permissions'] = command.default_member_permissions.value if command.default_member_permissions is not None else None
+        return payload
+
+    def _get_signature(self, payload: Mapping[str, Any]) -> Tuple[Any, ...]:
+        """
+        Reduces a command payload to the fields compared when diffing commands.
+        """
+
+        # get the signature of each option
+        options: Tuple[Any, ...] = tuple(self._get_signature(option) for option in payload.get('options', []))
+        # get the name and value of each choice
+        choices: Tuple[Any, ...] = tuple((choice.get('name'), choice.get('value')) for choice in payload.get('choices', []))
+        # compare permissions as strings, as they may be represented as strings or integers
+        permissions: Optional[str] = str(payload['default_member_permissions']) if payload.get('default_member_permissions') is not None else None
+        return (payload.get('name'), payload.get('type'), payload.get('description'), bool(payload.get('required', False)), options, choices, permissions, bool(payload.get('nsfw', False)))
+
     async def inject(self, class_object: Type[Component], kwargs: KWARGTYPE) -> None:
         """
         Injects data into the keyword argument dictionary to be passed to the class object being initialized.
@@ -91,6 +266,8 @@ class Loader():
             directory.mkdir(parents=True, exist_ok=True)
             # get all resolved paths for files with filenames matching the pattern in the provided directory
             file_objects: List[Path] = [path.resolve() for path in directory.glob(pattern) if path.is_file()]
+            # get all resolved paths for zip bundles in the provided directory
+            bundle_objects: List[Path] = [path.resolve() for path in directory.glob(f'*.{BUNDLE_EXTENSION}') if zipfile.is_zipfile(path)]
         except KeyboardInterrupt: raise
         except Exception as exception:
             name: str = directory.name
@@ -99,30 +276,75 @@ class Loader():
             return
 
         for file_object in file_objects: await self._process_path(file_object, loop=loop, *args, **kwargs)
+        for bundle_object in bundle_objects: await self._process_bundle(bundle_object, loop=loop, *args, **kwargs)
+
+    async def _process_bundle(self, bundle_object: Path, *args: Any, loop: Optional[AbstractEventLoop] = None, **kwargs: KWARGTYPE) -> None:
+        try:
+            # open the bundle located at the reference
+            bundle: Bundle = Bundle(bundle_object)
+            # get the module spec of each module in the bundle
+            specs: List[ModuleSpec] = [bundle.get_module_spec(module_name) for module_name in bundle.modules]
+        except KeyboardInterrupt: raise
+        except Exception as exception:
+            name: str = bundle_object.name
+            action: str = f'loading {bundle_object.name}'
+            log.warning(f'{name}: {exception.__class__.__name__} occurred {action}: {exception}')
+            return
+
+        for spec in specs: await self._process_spec(spec, loop=loop, *args, **kwargs)
 
     async def _process_path(self, file_object: Path, *args: Any, loop: Optional[AbstractEventLoop] = None, **kwargs: KWARGTYPE) -> None:
+        # run the module in a worker process if it is marked as isolated
+        if file_object.stem in self._isolated: return await self._process_worker(file_object)
+
         try:
             # get the module spec located at the reference
             spec: ModuleSpec = await self._get_module_spec(file_object)
-            # create the module from the module spec
-            module: ModuleType = await self._get_module(spec)
-            # execute the module via the spec loader if available
-            if spec.loader: spec.loader.exec_module(module)
-            # retrieve all class objects from the module spec
-            class_objects: List[Type[Component]] = await self._get_class_objects(module)
         except KeyboardInterrupt: raise
         except Exception as exception:
             name: str = file_object.name
             action: str = f'loading {file_object.name}'
             log.warning(f'{name}: {exception.__class__.__name__} occurred {action}: {exception}')
             return
+
+        await self._process_spec(spec, loop=loop, *args, **kwargs)
+
+    async def _process_spec(self, spec: ModuleSpec, *args: Any, loop: Optional[AbstractEventLoop] = None, **kwargs: KWARGTYPE) -> None:
+        try:
+            # execute the module, or reuse it if it has been executed in this process
+            module: ModuleType = execute_module(spec)
+            # retrieve all class objects from the module spec
+            class_objects: List[Type[Component]] = await self._get_class_objects(module)
+        except KeyboardInterrupt: raise
+        except Exception as exception:
+            name: str = spec.name
+            action: str = f'loading {spec.origin}'
+            log.warning(f'{name}: {exception.__class__.__name__} occurred {action}: {exception}')
+            return
         
         for class_object in class_objects: await self._process_class(class_object, loop=loop, *args, **kwargs)
 
+    async def _process_worker(self, file_object: Path) -> None:
+        try:
+            # initialize a worker for the module located at the reference
+            worker: Worker = await self._get_worker(file_object)
+            # start the worker and retrieve its command metadata
+            commands: List[Dict[str, Any]] = await worker.start()
+            self._workers.append(worker)
+        except KeyboardInterrupt: raise
+        except Exception as exception:
+            name: str = file_object.name
+            action: str = f'starting a worker for {file_object.name}'
+            log.warning(f'{name}: {exception.__class__.__name__} occurred {action}: {exception}')
+            return
+
+        for metadata in commands: await self._process_remote_command(worker, metadata)
+
     async def _process_class(self, class_object: Type[Component], *args: Any, loop: Optional[AbstractEventLoop] = None, **kwargs: KWARGTYPE) -> None:
         try:
             # initialize the class object
             instance: Component = await self._get_instance(class_object, *args, **kwargs)
+            self._instances.append(instance)
             # perform setup on the instance
             await self._setup_instance(instance, loop=loop)
             # retrieve all coroutine objects from the instance
@@ -134,7 +356,11 @@ class Loader():
             log.warning(f'{name}: {exception.__class__.__name__} occurred {action}: {exception}')
             return
 
-        for coroutine_object in coroutine_objects: await self._process_coroutine(coroutine_object)
+        for coroutine_object in coroutine_objects:
+            # route coroutines marked as event listeners
+            if hasattr(coroutine_object, METADATA_ATTRIBUTE): await self._process_listener(coroutine_object)
+            # otherwise register the coroutine as a command
+            else: await self._process_coroutine(coroutine_object)
 
     async def _process_coroutine(self, coroutine_object: MethodType) -> None:
         try:
@@ -142,6 +368,8 @@ class Loader():
             command: Command[Any, ELLIPSIS_TYPE, Any] = await self._get_command(coroutine_object)
             # add the command to the command tree
             self._tree.add_command(command)
+            # record the command as the source of its code
+            self._sources[coroutine_object.__code__] = coroutine_object.__qualname__
         except KeyboardInterrupt: raise
         except Exception as exception:
             name: str = coroutine_object.__qualname__
@@ -149,6 +377,34 @@ class Loader():
             log.warning(f'{name}: {exception.__class__.__name__} occurred {action}: {exception}')
             return
         
+    async def _process_listener(self, coroutine_object: MethodType) -> None:
+        try:
+            # get a handler for each event the coroutine listens to
+            handlers: List[Handler] = await self._get_handlers(coroutine_object)
+            # add each handler to the routing table
+            for handler in handlers: self._router.add(handler)
+            # record the listener as the source of its code
+            self._sources[coroutine_object.__code__] = coroutine_object.__qualname__
+        except KeyboardInterrupt: raise
+        except Exception as exception:
+            name: str = coroutine_object.__qualname__
+            action: str = f'routing {coroutine_object.__name__}'
+            log.warning(f'{name}: {exception.__class__.__name__} occurred {action}: {exception}')
+            return
+
+    async def _process_remote_command(self, worker: Worker, metadata: Dict[str, Any]) -> None:
+        try:
+            # get a command forwarding to the worker
+            command: Command[Any, ELLIPSIS_TYPE, Any] = await self._get_remote_command(worker, metadata)
+            # add the command to the command tree
+            self._tree.add_command(command)
+        except KeyboardInterrupt: raise
+        except Exception as exception:
+            name: str = f'{worker.name}.{metadata.get("name")}'
+            action: str = f'loading {metadata.get("name")}'
+            log.warning(f'{name}: {exception.__class__.__name__} occurred {action}: {exception}')
+            return
+        
     #endregion
 
 
@@ -239,7 +495,10 @@ class Loader():
                 # wrap setup coroutine in exception handler
                 awaitable: Coroutine[Any, Any, None] = self._log_exceptions(instance.__setup__(*args, **kwargs), message=message)
                 # create a task for the coroutine
-                _: Task[None] = loop.create_task(awaitable)
+                task: Task[None] = loop.create_task(awaitable, name=f'{instance.__class__.__name__}.{instance.__setup__.__name__}')
+                # keep a reference to the task until it completes
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
             # if an event loop was not provided
             else:
                 log.warning(f'{instance.__class__.__name__}: No {Loader.__name__} event loop available. {instance.__setup__.__name__} will be awaited inline.')
@@ -292,6 +551,61 @@ class Loader():
         command: Command[Any, Any, Any] = Command(name=name, description=description, callback=coroutine)
         return command
 
+    async def _get_handlers(self, coroutine: MethodType) -> List[Handler]:
+        """
+        Creates an event handler for each listener declaration on the provided coroutine.
+        """
+
+        # get the listener metadata attached to the coroutine
+        metadata: List[Dict[str, Any]] = getattr(coroutine, METADATA_ATTRIBUTE)
+        # initialize a handler for each declaration
+        return [Handler(coroutine, **declaration) for declaration in metadata]
+
+    async def _get_worker(self, path: Path) -> Worker:
+        """
+        Initializes a worker for the module at the provided path.
+        """
+
+        # get the loader section of the client configuration
+        loader: LoaderSection = self._settings.client.loader
+        # initialize the worker with the configured limits
+        return Worker(path, config=self._settings.path, memory=loader.worker_memory, requests=loader.worker_requests)
+
+    async def _get_remote_command(self, worker: Worker, metadata: Dict[str, Any]) -> Command[Any, ELLIPSIS_TYPE, Any]:
+        """
+        Register a command that forwards its invocations to a worker.
+        """
+
+        # get the command name
+        name: str = metadata['name']
+
+        async def callback(interaction: discord.Interaction, **arguments: Any) -> None:
+            # acknowledge the interaction while the worker executes the command
+            await interaction.response.defer(thinking=True)
+            # collect the interaction data available to the worker
+            context: Dict[str, Any] = {'user_id': interaction.user.id, 'guild_id': interaction.guild_id, 'channel_id': interaction.channel_id, 'locale': str(interaction.locale)}
+            # invoke the command in the worker
+            value: Optional[str] = await worker.invoke(name, context, arguments)
+            # send the command result if one was returned
+            if value is None: await interaction.delete_original_response()
+            else: await interaction.followup.send(value)
+
+        # build the callback signature from the parameter metadata
+        parameters: List[inspect.Parameter] = [inspect.Parameter('interaction', inspect.Parameter.POSITIONAL_OR_KEYWORD, annotation=discord.Interaction)]
+        for parameter in metadata['parameters']:
+            default: Any = parameter['default'] if 'default' in parameter else inspect.Parameter.empty
+            parameters.append(inspect.Parameter(parameter['name'], inspect.Parameter.KEYWORD_ONLY, annotation=TYPES[parameter['type']], default=default))
+        setattr(callback, '__signature__', inspect.Signature(parameters))
+        callback.__name__ = callback.__qualname__ = name
+        callback.__doc__ = metadata['description']
+
+        # get the command description
+        description: str = self._trim_docstring(callback)
+
+        # initialize a command from the forwarding callback
+        command: Command[Any, Any, Any] = Command(name=name, description=description, callback=callback)
+        return command
+
     def _trim_docstring(self, obj: object, max_length: int = MAX_DESCRIPTION_LENGTH) -> str:
         """
         Trims and cleans the provided object's docstring to the provided length
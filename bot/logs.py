@@ -0,0 +1,271 @@
+import logging
+import queue
+import random
+import threading
+import time
+from configparser import ConfigParser
+from logging import Filter, Handler, Logger, LogRecord
+from logging.handlers import QueueHandler, QueueListener
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+log: logging.Logger = logging.getLogger(__name__)
+
+DROP_NEWEST: str = 'newest'
+"""Discard the incoming record when the queue is full"""
+
+DROP_OLDEST: str = 'oldest'
+"""Discard the oldest queued record when the queue is full"""
+
+FILTER_PREFIX: str = 'filter_'
+"""The prefix of logging configuration sections declaring a `ThrottleFilter`"""
+
+SUMMARY_ATTRIBUTE: str = 'throttle_summary'
+"""The record attribute marking a summary emitted by a `ThrottleFilter`"""
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    A `QueueHandler` for a bounded queue that drops records instead of
+    blocking the caller when the queue is full.
+    """
+
+    def __init__(self, queue: 'queue.Queue[LogRecord]', *, policy: str = DROP_NEWEST) -> None:
+        """
+        Initializes a `DroppingQueueHandler`.
+
+        Args:
+            queue: The bounded queue to place records on.
+            policy: Which record to drop when the queue is full, `newest` or `oldest`.
+        """
+        if policy not in (DROP_NEWEST, DROP_OLDEST): raise ValueError(f'policy: Expected {DROP_NEWEST} or {DROP_OLDEST}, got {policy}')
+        super().__init__(queue)
+        self._policy: str = policy
+        self.dropped: int = 0
+        """The number of records dropped because the queue was full."""
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        """
+        Merges the record's arguments into its message and leaves formatting
+        to the listener's handlers, keeping the caller's cost to a minimum.
+        """
+        # render the exception while its traceback is still available
+        if record.exc_info and not record.exc_text: record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg = record.getMessage()
+        record.args = None
+        record.exc_info = None
+        return record
+
+    def enqueue(self, record: LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            if self._policy == DROP_NEWEST: return
+            # make room by discarding the oldest record
+            try:
+                self.queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self.queue.put_nowait(record)
+            except queue.Full:
+                pass
+
+
+class DrainingQueueListener(QueueListener):
+    """
+    A `QueueListener` that waits for room in a bounded queue to signal
+    its thread to stop, so every queued record is written before it exits.
+    """
+
+    def enqueue_sentinel(self) -> None:
+        self.queue.put(self._sentinel)
+
+
+class QueueLogging():
+    """
+    Moves the handlers of every configured logger behind a bounded queue,
+    so that records are written by a background thread instead of the caller.
+    """
+
+    def __init__(self, *, maxsize: int = 10000, policy: str = DROP_NEWEST) -> None:
+        """
+        Initializes a `QueueLogging` pipeline.
+
+        Args:
+            maxsize: The maximum number of records queued per logger.
+            policy: Which record to drop when a queue is full, `newest` or `oldest`.
+        """
+        self._maxsize: int = maxsize
+        self._policy: str = policy
+        self._pipelines: List[Tuple[Logger, List[Handler], DroppingQueueHandler, DrainingQueueListener]] = list()
+
+    @property
+    def dropped(self) -> int:
+        """The number of records dropped across all queues."""
+        return sum(handler.dropped for _, _, handler, _ in self._pipelines)
+
+    def start(self) -> None:
+        """
+        Replaces the handlers of the root logger and each configured logger
+        with a queue serviced by a background listener thread.
+        """
+        loggers: List[Logger] = [logging.getLogger()] + [logger for logger in logging.Logger.manager.loggerDict.values() if isinstance(logger, Logger)]
+        for logger in loggers:
+            handlers: List[Handler] = list(logger.handlers)
+            if not handlers: continue
+            records: 'queue.Queue[LogRecord]' = queue.Queue(self._maxsize)
+            handler: DroppingQueueHandler = DroppingQueueHandler(records, policy=self._policy)
+            listener: DrainingQueueListener = DrainingQueueListener(records, *handlers, respect_handler_level=True)
+            # swap the logger's handlers for the queue handler
+            for existing in handlers: logger.removeHandler(existing)
+            logger.addHandler(handler)
+            listener.start()
+            self._pipelines.append((logger, handlers, handler, listener))
+        log.debug('Started queued logging for %d loggers', len(self._pipelines))
+
+    def stop(self) -> None:
+        """
+        Flushes each queue, restores the original handlers and reports dropped records.
+        """
+        dropped: int = self.dropped
+        for logger, handlers, handler, listener in self._pipelines:
+            # stop the listener after it processes the remaining records
+            listener.stop()
+            logger.removeHandler(handler)
+            for existing in handlers: logger.addHandler(existing)
+        self._pipelines.clear()
+        if dropped: log.warning('Dropped %d log records while the logging queue was full', dropped)
+
+
+class _Window():
+    """
+    The records passed and suppressed for a key of a `ThrottleFilter` since the window started.
+    """
+
+    __slots__ = ('key', 'start', 'passed', 'suppressed', 'record')
+
+    def __init__(self, key: Tuple[str, int, str, int], start: float) -> None:
+        self.key: Tuple[str, int, str, int] = key
+        self.start: float = start
+        self.passed: int = 0
+        self.suppressed: int = 0
+        self.record: Optional[LogRecord] = None
+        """The last suppressed record."""
+
+
+class ThrottleFilter(Filter):
+    """
+    A logging filter that rate limits and samples records per call site.
+
+    Records logged by the same logger, at the same level, from the same line share
+    a key, so messages formatted before logging are limited together. Each key
+    passes at most `rate` records per `per` seconds, and each of those passes with
+    probability `sample`. A background timer discards closed windows and logs a
+    summary of the records each one suppressed.
+    """
+
+    def __init__(self, name: str = '', *, rate: int = 0, per: float = 60.0, sample: float = 1.0) -> None:
+        """
+        Initializes a `ThrottleFilter`.
+
+        Args:
+            name: The name of the logger the filter applies to.
+            rate: The number of records passed per key per window, or 0 for no limit.
+            per: The length of the rate window, in seconds.
+            sample: The probability that a record within the rate limit is passed.
+        """
+        super().__init__(name)
+        if rate < 0: raise ValueError(f'rate: Expected a non-negative integer, got {rate}')
+        if per <= 0: raise ValueError(f'per: Expected a positive number, got {per}')
+        if not 0 <= sample <= 1: raise ValueError(f'sample: Expected a number between 0 and 1, got {sample}')
+        self._rate: int = rate
+        self._per: float = per
+        self._sample: float = sample
+        # the open window of each key, as records may be filtered from several threads
+        self._windows: Dict[Tuple[str, int, str, int], _Window] = dict()
+        self._lock: threading.Lock = threading.Lock()
+        self._timer: Optional[threading.Thread] = None
+
+    def filter(self, record: LogRecord) -> bool:
+        # always pass summaries emitted by the filter
+        if getattr(record, SUMMARY_ATTRIBUTE, False): return True
+        if not super().filter(record): return False
+
+        key: Tuple[str, int, str, int] = (record.name, record.levelno, record.pathname, record.lineno)
+        now: float = time.monotonic()
+        closed: Optional[_Window] = None
+        with self._lock:
+            window: Optional[_Window] = self._windows.get(key)
+            # start a new window if none exists or the current one elapsed before the timer discarded it
+            if window is None or now - window.start >= self._per:
+                closed = window
+                window = self._windows[key] = _Window(key, now)
+                self._start_timer()
+            allowed: bool = (not self._rate or window.passed < self._rate) and (self._sample >= 1 or random.random() < self._sample)
+            if allowed: window.passed += 1
+            else:
+                window.suppressed += 1
+                window.record = record
+        if closed: self._summarize(closed)
+        return allowed
+
+    def _start_timer(self) -> None:
+        """
+        Starts the timer closing windows, unless it is running.
+        """
+        if self._timer and self._timer.is_alive(): return
+        self._timer = threading.Thread(target=self._run, name=f'{ThrottleFilter.__name__}:{self.name or "root"}', daemon=True)
+        self._timer.start()
+
+    def _run(self) -> None:
+        """
+        Closes elapsed windows once per window length, until no window is open.
+        """
+        while True:
+            time.sleep(self._per)
+            now: float = time.monotonic()
+            with self._lock:
+                closed: List[_Window] = [window for window in self._windows.values() if now - window.start >= self._per]
+                for window in closed: del self._windows[window.key]
+                # stop once every window is closed, a new record restarts the timer
+                idle: bool = not self._windows
+                if idle: self._timer = None
+            for window in closed: self._summarize(window)
+            if idle: return
+
+    def _summarize(self, window: _Window) -> None:
+        """
+        Emits a summary of the records suppressed in a closed window, if any.
+        """
+        record: Optional[LogRecord] = window.record
+        if not window.suppressed or not record: return
+        logger: Logger = logging.getLogger(record.name)
+        summary: LogRecord = logger.makeRecord(record.name, record.levelno, record.pathname, record.lineno, 'Suppressed %d similar messages in %gs, the last being: %s', (window.suppressed, self._per, record.getMessage()), None, extra={SUMMARY_ATTRIBUTE: True})
+        logger.handle(summary)
+
+
+def configure_filters(path: Path) -> List[ThrottleFilter]:
+    """
+    Attaches a `ThrottleFilter` to each logger declared by a `[filter_*]`
+    section of a logging configuration file.
+
+    Each section accepts the keys `logger` (the logger name, or `root`),
+    `rate`, `per` and `sample`. These sections are ignored by `fileConfig`.
+
+    Raises:
+        ValueError: If a section contains an invalid value
+    """
+    parser: ConfigParser = ConfigParser()
+    parser.read(path)
+    filters: List[ThrottleFilter] = list()
+    for section in [name for name in parser.sections() if name.startswith(FILTER_PREFIX)]:
+        values = parser[section]
+        name: str = values.get('logger', 'root')
+        logger: Logger = logging.getLogger() if name == 'root' else logging.getLogger(name)
+        throttle: ThrottleFilter = ThrottleFilter(rate=values.getint('rate', 0), per=values.getfloat('per', 60.0), sample=values.getfloat('sample', 1.0))
+        logger.addFilter(throttle)
+        filters.append(throttle)
+        log.debug('Attached %s to logger %s', section, name)
+    return filters
@@ -0,0 +1,103 @@
+import logging
+import os
+import sys
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+import discord
+
+log: logging.Logger = logging.getLogger(__name__)
+
+SCALARS: Tuple[type, ...] = (str, bytes, int, float, tuple, frozenset)
+"""Attribute value types counted towards the size of the object holding them"""
+
+
+def get_rss() -> int:
+    """
+    Retrieves the resident set size of the current process in bytes.
+    Falls back to the peak resident set size where the current size is unavailable,
+    and to 0 where neither is available.
+    """
+    try:
+        with open('/proc/self/statm') as file:
+            return int(file.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+        # reported in kilobytes on Linux and bytes on macOS
+        peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        return 0
+
+
+def sizeof(obj: Any) -> int:
+    """
+    Estimates the memory held by a cached model in bytes.
+
+    Counts the object itself and the scalar values of its attributes, but not
+    referenced models, so that shared objects are not counted more than once.
+    """
+    size: int = sys.getsizeof(obj)
+    slots: Set[str] = set()
+    for cls in type(obj).__mro__: slots.update(getattr(cls, '__slots__', ()))
+    for name in slots:
+        value: Any = getattr(obj, name, None)
+        if isinstance(value, SCALARS): size += sys.getsizeof(value)
+    if hasattr(obj, '__dict__'):
+        size += sys.getsizeof(obj.__dict__)
+        size += sum(sys.getsizeof(value) for value in obj.__dict__.values() if isinstance(value, SCALARS))
+    return size
+
+
+def get_cache_report(client: discord.Client) -> Dict[str, Tuple[int, int]]:
+    """
+    Counts the objects and estimated bytes held by each of the client's caches.
+
+    Returns:
+        A mapping of cache type to a tuple of object count and estimated bytes.
+    """
+    caches: Dict[str, Callable[[], Iterable[Any]]] = {
+        'guilds': lambda: client.guilds,
+        'members': lambda: (member for guild in client.guilds for member in guild.members),
+        'users': lambda: client.users,
+        'channels': lambda: (channel for guild in client.guilds for channel in guild.channels),
+        'roles': lambda: (role for guild in client.guilds for role in guild.roles),
+        'messages': lambda: client.cached_messages,
+        'emojis': lambda: client.emojis,
+        'stickers': lambda: client.stickers,
+    }
+    report: Dict[str, Tuple[int, int]] = dict()
+    for name, cache in caches.items():
+        objects: List[Any] = list(cache())
+        report[name] = (len(objects), sum(sizeof(obj) for obj in objects))
+    return report
+
+
+def log_cache_report(client: discord.Client) -> None:
+    """
+    Logs the objects and estimated bytes held by each of the client's caches.
+    """
+    report: Dict[str, Tuple[int, int]] = get_cache_report(client)
+    for name, (count, size) in report.items():
+        log.info(f'Cache {name}: {count} objects, {size / 1024:.1f} KiB')
+    total: int = sum(size for _, size in report.values())
+    log.info(f'Cache total: {total / 1024:.1f} KiB')
+
+
+def log_identity_report(clients: Iterable[Any]) -> None:
+    """
+    Logs the memory attributable to each client sharing the process, as the
+    growth in resident set size while its components loaded plus the estimated
+    bytes held by its caches, and the remainder shared between them.
+    """
+    clients = list(clients)
+    rss: int = get_rss()
+    attributed: int = 0
+    for client in clients:
+        cache: int = sum(size for _, size in get_cache_report(client).values())
+        size: int = getattr(client, 'load_rss', 0) + cache
+        attributed += size
+        log.info(f'Identity {client.user}: {size / 1024 ** 2:.1f} MiB ({cache / 1024 ** 2:.1f} MiB cached)')
+    shared: int = max(rss - attributed, 0)
+    log.info(f'Process RSS {rss / 1024 ** 2:.1f} MiB across {len(clients)} identities, {shared / 1024 ** 2:.1f} MiB shared')
@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+import weakref
+from bisect import bisect_left
+from collections import deque
+from types import CodeType, FrameType
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+log: logging.Logger = logging.getLogger(__name__)
+
+BUCKETS: Tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+"""The upper bounds, in seconds, of the lag histogram buckets"""
+
+UNATTRIBUTED: str = '<unattributed>'
+"""The name recorded for stalls that could not be attributed to a component"""
+
+Resolver = Callable[[CodeType], Optional[str]]
+
+_shared: 'weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, LagMonitor]' = weakref.WeakKeyDictionary()
+"""The monitor shared by the clients running on each event loop"""
+
+
+class Offender():
+    """
+    Accumulated stalls attributed to a single source.
+    """
+
+    def __init__(self, source: str) -> None:
+        self.source: str = source
+        self.stalls: int = 0
+        self.total: float = 0.0
+        self.maximum: float = 0.0
+        self.stack: List[str] = list()
+        """The most recently captured stack."""
+
+    @property
+    def metrics(self) -> Dict[str, Any]:
+        """A summary of the stalls attributed to the source."""
+        return {
+            'source': self.source,
+            'stalls': self.stalls,
+            'total': self.total,
+            'max': self.maximum,
+        }
+
+
+class LagMonitor():
+    """
+    Samples event loop scheduling lag and attributes stalls to their source.
+
+    A task on the loop records how late each of its wakeups is. A watchdog
+    thread notices when those wakeups stop arriving, captures the stack of the
+    loop thread while it is still blocked, and attributes the stall to the
+    innermost frame belonging to a registered command or listener.
+    """
+
+    def __init__(self, *, resolver: Resolver, interval: float = 0.1, threshold: float = 0.25, window: int = 6000, report_interval: float = 300.0) -> None:
+        """
+        Initializes a `LagMonitor`.
+
+        Args:
+            resolver: Maps a code object to the component and command it belongs to, or None.
+            interval: The time between lag samples, in seconds.
+            threshold: The lag above which a stall is captured and attributed, in seconds.
+            window: The number of samples kept for the rolling histogram.
+            report_interval: The time between logged reports of the top offenders, in seconds.
+        """
+        self._resolvers: List[Resolver] = [resolver]
+        self._interval: float = interval
+        self._threshold: float = threshold
+        self._report_interval: float = report_interval
+
+        self._samples: Deque[float] = deque(maxlen=window)
+        self._offenders: Dict[str, Offender] = dict()
+        self._heartbeat: float = time.monotonic()
+        self._captured: Optional[Tuple[str, List[str]]] = None
+
+        self._task: Optional[asyncio.Task[None]] = None
+        self._thread: Optional[threading.Thread] = None
+        self._stopped: threading.Event = threading.Event()
+        self._loop_thread: Optional[int] = None
+
+    @property
+    def histogram(self) -> Dict[str, int]:
+        """The number of samples in each lag bucket over the rolling window."""
+        labels: List[str] = [f'<={bound * 1000:g}ms' for bound in BUCKETS] + [f'>{BUCKETS[-1] * 1000:g}ms']
+        counts: List[int] = [0] * len(labels)
+        for sample in self._samples: counts[bisect_left(BUCKETS, sample)] += 1
+        return dict(zip(labels, counts))
+
+    def offenders(self, count: int = 10) -> List[Dict[str, Any]]:
+        """
+        Retrieves the sources responsible for the most total stall time.
+        """
+        ranked: List[Offender] = sorted(self._offenders.values(), key=lambda offender: offender.total, reverse=True)
+        return [offender.metrics for offender in ranked[:count]]
+
+
+    @classmethod
+    def acquire(cls, *, resolver: Resolver, threshold: float) -> 'LagMonitor':
+        """
+        Retrieves the monitor of the running event loop, starting one if there is none,
+        so that clients sharing a loop share one watchdog and each stall is logged once.
+        The threshold of the monitor that is already running is kept.
+
+        Args:
+            resolver: Maps a code object to the component and command it belongs to, or None.
+            threshold: The lag above which a stall is captured and attributed, in seconds.
+        """
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        monitor: Optional[LagMonitor] = _shared.get(loop)
+        if monitor:
+            monitor._resolvers.append(resolver)
+            return monitor
+        monitor = _shared[loop] = cls(resolver=resolver, threshold=threshold)
+        monitor.start()
+        return monitor
+
+    async def release(self, resolver: Resolver) -> None:
+        """
+        Removes a resolver added by `acquire`, stopping the monitor once no resolvers remain.
+        """
+        if resolver in self._resolvers: self._resolvers.remove(resolver)
+        if self._resolvers: return
+        loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+        if _shared.get(loop) is self: del _shared[loop]
+        await self.stop()
+
+    def start(self) -> None:
+        """
+        Starts sampling the running event loop.
+        """
+        self._loop_thread = threading.get_ident()
+        self._heartbeat = time.monotonic()
+        self._stopped.clear()
+        self._task = asyncio.get_running_loop().create_task(self._sample(), name=f'{LagMonitor.__name__}')
+        self._thread = threading.Thread(target=self._watch, name=f'{LagMonitor.__name__}', daemon=True)
+        self._thread.start()
+        log.debug('Started monitoring event loop lag with a %.0fms threshold', self._threshold * 1000)
+
+    async def stop(self) -> None:
+        """
+        Stops sampling and logs the top offenders.
+        """
+        self._stopped.set()
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        if self._thread: self._thread.join()
+        self._task = None
+        self._thread = None
+        self.log_report()
+
+    def log_report(self) -> None:
+        """
+        Logs the lag histogram and the top offenders.
+        """
+        log.info('Event loop lag: %s', ', '.join(f'{label} {count}' for label, count in self.histogram.items() if count))
+        for metrics in self.offenders():
+            log.info(f'Stalls in {metrics["source"]}: {metrics["stalls"]} totalling {metrics["total"] * 1000:.0f}ms (max {metrics["max"] * 1000:.0f}ms)')
+
+
+    async def _sample(self) -> None:
+        """
+        Records the lag of each wakeup and attributes stalls exceeding the threshold.
+        """
+        reported: float = time.monotonic()
+        while True:
+            expected: float = time.monotonic() + self._interval
+            await asyncio.sleep(self._interval)
+            now: float = time.monotonic()
+            self._heartbeat = now
+            lag: float = max(0.0, now - expected)
+            self._samples.append(lag)
+
+            if lag > self._threshold: self._record(lag)
+            if now - reported > self._report_interval:
+                reported = now
+                self.log_report()
+
+    def _record(self, lag: float) -> None:
+        """
+        Attributes a stall to the stack captured by the watchdog while the loop was blocked.
+        """
+        source, stack = self._captured if self._captured else (UNATTRIBUTED, [])
+        self._captured = None
+        offender: Offender = self._offenders.setdefault(source, Offender(source))
+        offender.stalls += 1
+        offender.total += lag
+        offender.maximum = max(offender.maximum, lag)
+        offender.stack = stack
+        log.warning(f'Event loop blocked for {lag * 1000:.0f}ms by {source}')
+        if stack: log.debug('Blocking stack:\n%s', ''.join(stack))
+
+    def _watch(self) -> None:
+        """
+        Captures the stack of the loop thread when the loop stops waking up.
+        """
+        # the heartbeat the current capture belongs to
+        captured: Optional[float] = None
+        while not self._stopped.wait(self._interval / 2):
+            heartbeat: float = self._heartbeat
+            # capture once per stall, while the loop is still blocked
+            if heartbeat == captured or time.monotonic() - heartbeat < self._interval + self._threshold: continue
+            frame: Optional[FrameType] = sys._current_frames().get(self._loop_thread) if self._loop_thread else None
+            if frame is None: continue
+            self._captured = (self._attribute(frame), traceback.format_stack(frame))
+            captured = heartbeat
+
+    def _attribute(self, frame: Optional[FrameType]) -> str:
+        """
+        Retrieves the source of the innermost frame belonging to a registered command or listener.
+        """
+        while frame is not None:
+            for resolver in list(self._resolvers):
+                source: Optional[str] = resolver(frame.f_code)
+                if source: return source
+            frame = frame.f_back
+        return UNATTRIBUTED
@@ -0,0 +1,68 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, TypeVar
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+ReturnType = TypeVar('ReturnType')
+
+
+class Scheduler():
+    """
+    Runs awaitables concurrently while respecting a request rate.
+
+    Concurrency is bounded by a semaphore and the start rate is bounded
+    by a token bucket holding `rate` tokens that refill over `period` seconds.
+    The bucket is a fixed approximation: it does not read Discord's per-route
+    rate limit headers, so rate limit responses (HTTP 429) are still handled
+    by discord.py. The scheduler only keeps bulk operations from running into them.
+    """
+
+    def __init__(self, *, concurrency: int = 4, rate: int = 5, period: float = 1.0) -> None:
+        """
+        Initializes a `Scheduler`.
+
+        Args:
+            concurrency: The maximum number of awaitables running at once.
+            rate: The maximum number of awaitables started per period.
+            period: The length of the rate window, in seconds.
+        """
+        if concurrency < 1: raise ValueError(f'concurrency: Expected a positive integer, got {concurrency}')
+        if rate < 1: raise ValueError(f'rate: Expected a positive integer, got {rate}')
+        if period <= 0: raise ValueError(f'period: Expected a positive number, got {period}')
+
+        self._semaphore: asyncio.Semaphore = asyncio.Semaphore(concurrency)
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._rate: int = rate
+        self._period: float = period
+        self._tokens: float = float(rate)
+        self._updated: float = time.monotonic()
+
+    async def run(self, awaitable: Awaitable[ReturnType]) -> ReturnType:
+        """
+        Awaits the provided awaitable once a concurrency slot and a rate token are available.
+        """
+        async with self._semaphore:
+            await self._acquire()
+            return await awaitable
+
+    async def _acquire(self) -> None:
+        """
+        Waits until a rate token is available and consumes it.
+        """
+        async with self._lock:
+            while True:
+                # refill tokens based on the time elapsed since the last update
+                now: float = time.monotonic()
+                self._tokens = min(float(self._rate), self._tokens + (now - self._updated) * self._rate / self._period)
+                self._updated = now
+                # consume a token if one is available
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                # wait until the next token is available
+                delay: float = (1 - self._tokens) * self._period / self._rate
+                log.debug('Rate limit reached, waiting %.3fs', delay)
+                await asyncio.sleep(delay)
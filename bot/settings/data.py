@@ -2,7 +2,7 @@ import logging
 from configparser import ConfigParser
 from logging import Logger
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
 
 from ..arguments import Arguments
 from ..configuration import Section
@@ -106,3 +106,165 @@ class LoaderSection(TypedAccess, Section):
         Sets the command reset setting in configuration.
         """
         return self.set_boolean('reset_commands', value)
+
+    @property
+    def guilds(self) -> List[int]:
+        """
+        Gets the IDs of guilds to sync commands to from configuration.
+        """
+        try:
+            return self.get_integers('sync_guilds')
+        except ValueError:
+            return []
+    @guilds.setter
+    def guilds(self, value: List[int]) -> None:
+        """
+        Sets the IDs of guilds to sync commands to in configuration.
+        """
+        return self.set_integers('sync_guilds', value)
+
+    @property
+    def copy_global(self) -> bool:
+        """
+        Gets whether global commands are copied to each sync guild, instead of being synced globally, from configuration.
+        """
+        try:
+            return self.get_boolean('copy_global_commands')
+        except ValueError:
+            return False
+    @copy_global.setter
+    def copy_global(self, value: bool) -> None:
+        """
+        Sets whether global commands are copied to each sync guild, instead of being synced globally, in configuration.
+        """
+        return self.set_boolean('copy_global_commands', value)
+
+    @property
+    def sync_concurrency(self) -> int:
+        """
+        Gets the maximum number of guilds synced at once from configuration.
+        """
+        try:
+            return self.get_integer('sync_concurrency')
+        except ValueError:
+            return 4
+    @sync_concurrency.setter
+    def sync_concurrency(self, value: int) -> None:
+        """
+        Sets the maximum number of guilds synced at once in configuration.
+        """
+        return self.set_integer('sync_concurrency', value)
+
+    @property
+    def sync_rate(self) -> int:
+        """
+        Gets the maximum number of guild syncs started per second from configuration.
+        """
+        try:
+            return self.get_integer('sync_rate')
+        except ValueError:
+            return 5
+    @sync_rate.setter
+    def sync_rate(self, value: int) -> None:
+        """
+        Sets the maximum number of guild syncs started per second in configuration.
+        """
+        return self.set_integer('sync_rate', value)
+
+    @property
+    def isolated(self) -> List[str]:
+        """
+        Gets the names of component modules to run in worker processes from configuration.
+        """
+        try:
+            return self.get_strings('isolated_components')
+        except ValueError:
+            return []
+    @isolated.setter
+    def isolated(self, value: List[str]) -> None:
+        """
+        Sets the names of component modules to run in worker processes in configuration.
+        """
+        return self.set_strings('isolated_components', value)
+
+    @property
+    def worker_memory(self) -> int:
+        """
+        Gets the address space limit of each worker process in megabytes from configuration.
+        A value of 0 disables the limit.
+        """
+        try:
+            return self.get_integer('worker_memory')
+        except ValueError:
+            return 0
+    @worker_memory.setter
+    def worker_memory(self, value: int) -> None:
+        """
+        Sets the address space limit of each worker process in megabytes in configuration.
+        """
+        return self.set_integer('worker_memory', value)
+
+    @property
+    def worker_requests(self) -> int:
+        """
+        Gets the number of invocations after which a worker process is recycled from configuration.
+        A value of 0 disables recycling.
+        """
+        try:
+            return self.get_integer('worker_requests')
+        except ValueError:
+            return 0
+    @worker_requests.setter
+    def worker_requests(self, value: int) -> None:
+        """
+        Sets the number of invocations after which a worker process is recycled in configuration.
+        """
+        return self.set_integer('worker_requests', value)
+
+    @property
+    def derive_intents(self) -> bool:
+        """
+        Gets whether gateway intents should be derived from loaded components from configuration.
+        """
+        try:
+            return self.get_boolean('derive_intents')
+        except ValueError:
+            return False
+    @derive_intents.setter
+    def derive_intents(self, value: bool) -> None:
+        """
+        Sets whether gateway intents should be derived from loaded components in configuration.
+        """
+        return self.set_boolean('derive_intents', value)
+
+    @property
+    def intents(self) -> int:
+        """
+        Gets the cached gateway intents derived from loaded components from configuration.
+
+        Raises:
+            ValueError: If the cached intents are missing or invalid
+        """
+        return self.get_integer('intents')
+    @intents.setter
+    def intents(self, value: int) -> None:
+        """
+        Sets the cached gateway intents derived from loaded components in configuration.
+        """
+        return self.set_integer('intents', value)
+
+    @property
+    def manifest(self) -> str:
+        """
+        Gets the fingerprint of the components the cached intents were derived from.
+
+        Raises:
+            ValueError: If the fingerprint is missing
+        """
+        return self.get_string('manifest')
+    @manifest.setter
+    def manifest(self, value: str) -> None:
+        """
+        Sets the fingerprint of the components the cached intents were derived from.
+        """
+        return self.set_string('manifest', value)
@@ -1,11 +1,16 @@
+from __future__ import annotations
+
 from configparser import ConfigParser
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, List, Optional
 from ..arguments import Arguments
 from ..configuration import Section
 from ..settings.section import TypedAccess
-import discord
+
+# discord is imported on use to keep importing settings lightweight
+if TYPE_CHECKING:
+    import discord
 
 log: logging.Logger = logging.getLogger(__name__)
 
@@ -35,7 +40,8 @@ class GeneralSection(TypedAccess, Section):
                 print(f'Found existing permissions value: {self.permissions}')
                 break
             except ValueError:
-                default_value: int = discord.Permissions.DEFAULT_VALUE
+                from discord import Permissions
+                default_value: int = Permissions.DEFAULT_VALUE
                 permissions_value: str = input(f'Provide a permissions integer (or leave empty for default <{default_value}>): ')
                 permissions = int(permissions_value) if permissions_value else default_value
         self.permissions = permissions
@@ -80,4 +86,186 @@ class GeneralSection(TypedAccess, Section):
         """
         Sets the owner's ID in configuration.
         """
-        return self.set_integer('owner', value)
\ No newline at end of file
+        return self.set_integer('owner', value)
+
+    @property
+    def shard_count(self) -> int:
+        """
+        Gets the total number of shards from configuration.
+        A value of 0 uses the shard count recommended by Discord.
+        """
+        # arguments override
+        if self._arguments and self._arguments.shard_count:
+            return self._arguments.shard_count
+
+        try:
+            return self.get_integer('shard_count')
+        except ValueError:
+            return 0
+    @shard_count.setter
+    def shard_count(self, value: int) -> None:
+        """
+        Sets the total number of shards in configuration.
+        """
+        return self.set_integer('shard_count', value)
+
+    @property
+    def shard_ids(self) -> List[int]:
+        """
+        Gets the shard IDs to run in this process from configuration.
+        IDs are comma-separated, and ranges are written as `start-end` (inclusive).
+        An empty value runs every shard.
+
+        Raises:
+            ValueError: If the shard IDs are invalid
+        """
+        # arguments override
+        if self._arguments and self._arguments.shard_ids:
+            return parse_shard_ids(self._arguments.shard_ids)
+
+        try:
+            value: str = self.get_string('shard_ids')
+        except ValueError:
+            return []
+        return parse_shard_ids(value)
+    @shard_ids.setter
+    def shard_ids(self, value: List[int]) -> None:
+        """
+        Sets the shard IDs to run in this process in configuration.
+        """
+        return self.set_integers('shard_ids', value)
+
+    @property
+    def processes(self) -> int:
+        """
+        Gets the number of shard processes to launch from configuration.
+        """
+        # arguments override
+        if self._arguments and self._arguments.processes:
+            return self._arguments.processes
+
+        try:
+            return self.get_integer('processes')
+        except ValueError:
+            return 1
+    @processes.setter
+    def processes(self, value: int) -> None:
+        """
+        Sets the number of shard processes to launch in configuration.
+        """
+        return self.set_integer('processes', value)
+
+    @property
+    def max_messages(self) -> Optional[int]:
+        """
+        Gets the maximum number of messages to cache from configuration.
+        A value of 0 disables the message cache.
+        """
+        try:
+            value: int = self.get_integer('max_messages')
+        except ValueError:
+            return 1000
+        return value if value > 0 else None
+    @max_messages.setter
+    def max_messages(self, value: int) -> None:
+        """
+        Sets the maximum number of messages to cache in configuration.
+        """
+        return self.set_integer('max_messages', value)
+
+    @property
+    def member_cache_flags(self) -> Optional[discord.MemberCacheFlags]:
+        """
+        Gets the member cache flags from configuration.
+        Accepts `all`, `none`, or a comma-separated list of flag names (e.g. `voice, joined`).
+        An empty value derives the flags from the client's intents.
+
+        Raises:
+            ValueError: If a flag name is invalid
+        """
+        try:
+            value: List[str] = [flag.lower() for flag in self.get_strings('member_cache_flags')]
+        except ValueError:
+            return None
+        from discord import MemberCacheFlags
+        if value == ['all']: return MemberCacheFlags.all()
+        if value == ['none']: return MemberCacheFlags.none()
+        invalid: List[str] = [flag for flag in value if flag not in MemberCacheFlags.VALID_FLAGS]
+        if invalid: raise ValueError(f'member_cache_flags: Invalid flags {", ".join(invalid)}')
+        # start from no flags, as the initializer enables every flag not provided
+        flags: MemberCacheFlags = MemberCacheFlags.none()
+        for flag in value: setattr(flags, flag, True)
+        return flags
+    @member_cache_flags.setter
+    def member_cache_flags(self, value: List[str]) -> None:
+        """
+        Sets the member cache flags in configuration.
+        """
+        return self.set_strings('member_cache_flags', value)
+
+    @property
+    def chunk_guilds_at_startup(self) -> Optional[bool]:
+        """
+        Gets whether guild members should be chunked at startup from configuration.
+        An empty value chunks guilds if the members intent is enabled.
+        """
+        try:
+            return self.get_boolean('chunk_guilds_at_startup')
+        except ValueError:
+            return None
+    @chunk_guilds_at_startup.setter
+    def chunk_guilds_at_startup(self, value: bool) -> None:
+        """
+        Sets whether guild members should be chunked at startup in configuration.
+        """
+        return self.set_boolean('chunk_guilds_at_startup', value)
+
+    @property
+    def lag_threshold(self) -> float:
+        """
+        Gets the event loop lag, in seconds, above which stalls are attributed and logged from configuration.
+        A value of 0 disables lag monitoring.
+        """
+        try:
+            return self.get_float('lag_threshold')
+        except ValueError:
+            return 0.25
+    @lag_threshold.setter
+    def lag_threshold(self, value: float) -> None:
+        """
+        Sets the event loop lag, in seconds, above which stalls are attributed and logged in configuration.
+        """
+        return self.set_float('lag_threshold', value)
+
+    @property
+    def shutdown_timeout(self) -> float:
+        """
+        Gets the time, in seconds, running commands and listeners are given to complete during shutdown from configuration.
+        """
+        try:
+            return self.get_float('shutdown_timeout')
+        except ValueError:
+            return 10.0
+    @shutdown_timeout.setter
+    def shutdown_timeout(self, value: float) -> None:
+        """
+        Sets the time, in seconds, running commands and listeners are given to complete during shutdown in configuration.
+        """
+        return self.set_float('shutdown_timeout', value)
+
+
+def parse_shard_ids(value: str) -> List[int]:
+    """
+    Parses a comma-separated list of shard IDs and inclusive `start-end` ranges.
+
+    Raises:
+        ValueError: If a term is not an integer or a range of integers
+    """
+    shard_ids: List[int] = list()
+    for term in [term.strip() for term in value.split(',') if term.strip()]:
+        start, _, end = term.partition('-')
+        try:
+            shard_ids.extend(range(int(start), int(end) + 1) if end else [int(start)])
+        except ValueError as error:
+            raise ValueError(f'shard_ids: Invalid term {term}') from error
+    return sorted(set(shard_ids))
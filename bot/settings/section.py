@@ -116,6 +116,68 @@ class TypedAccess(MutableMapping[str, str]):
         self.set_string(key, value)
 
 
+    def get_strings(self, key: str) -> List[str]:
+        """
+        Gets a list of string values for a given key.
+        Values are stored as a comma-separated string.
+        If the key does not exist, it is created and given an empty value.
+
+        Args:
+            key: The key to retrieve a value from.
+
+        Raises:
+            ValueError: If the provided key's value is missing or empty
+        """
+
+        value: str = self.get_string(key)
+        return [item.strip() for item in value.split(',') if item.strip()]
+
+
+    def set_strings(self, key: str, value: List[Any]) -> None:
+        """
+        Sets a list of string values for a given key.
+
+        Args:
+            key: The key to store the value to.
+            value: The values to store.
+        """
+
+        self.set_string(key, ', '.join(str(item) for item in value))
+
+
+    def get_integers(self, key: str) -> List[int]:
+        """
+        Gets a list of `integer` values for a given key.
+        Values are stored as a comma-separated string.
+        If the key does not exist, it is created and given an empty value.
+
+        Args:
+            key: The key to retrieve a value from.
+
+        Raises:
+            ValueError: If the provided key's value is missing, empty or 
+            cannot be parsed to a list of integers
+        """
+
+        values: List[str] = self.get_strings(key)
+        try:
+            return [int(item) for item in values]
+        except ValueError as error:
+            raise ValueError(f'{key}: {error}') from error
+
+
+    def set_integers(self, key: str, value: List[int]) -> None:
+        """
+        Sets a list of `integer` values for a given key.
+
+        Args:
+            key: The key to store the value to.
+            value: The values to store.
+        """
+
+        self.set_strings(key, value)
+
+
     def get_float(self, key: str) -> float:
         """
         Gets a `float` value for a given key.
@@ -1,14 +1,18 @@
+from __future__ import annotations
+
 import logging
 from pathlib import Path
-from typing import Optional
-
-import discord
+from typing import TYPE_CHECKING, Optional
 
 from ..arguments import Arguments
 from ..configuration import Configuration
 from ..disk import Folder
 from .client import ClientConfiguration
 
+# discord is only needed for annotations
+if TYPE_CHECKING:
+    import discord
+
 
 log: logging.Logger = logging.getLogger(__name__)
 
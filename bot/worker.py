@@ -0,0 +1,353 @@
+"""
+Worker
+
+Runs the components of a single module in a subprocess.
+
+The main process registers the commands reported by the worker and forwards
+each invocation over the worker's standard streams. Messages are `marshal`
+encoded and framed with a 4-byte big-endian length prefix.
+"""
+
+import argparse
+import asyncio
+import inspect
+import importlib.util
+import logging
+import marshal
+import os
+import struct
+import sys
+from asyncio import Future, StreamReader, StreamWriter, Task
+from asyncio.subprocess import Process
+from importlib.machinery import ModuleSpec
+from pathlib import Path
+from types import MethodType, ModuleType
+from typing import Any, Dict, List, Mapping, Optional, Set, Type
+
+
+log: logging.Logger = logging.getLogger(__name__)
+
+HEADER: struct.Struct = struct.Struct('>I')
+"""The frame header containing the length of the message"""
+
+TYPES: Dict[str, Type[Any]] = {
+    'str': str,
+    'int': int,
+    'float': float,
+    'bool': bool,
+}
+"""The parameter types that can be forwarded to a worker"""
+
+ENTRY_POINT: str = f'import sys; from {__name__} import run; run(sys.argv[1:])'
+"""The command executed by the worker interpreter"""
+
+
+class WorkerError(Exception):
+    """Raised when a worker fails to start or to execute a command."""
+
+    def __init__(self, name: str, message: str):
+        self._message = f'{name}: {message}'
+
+    def __str__(self) -> str:
+        return self._message
+
+
+class Context():
+    """
+    A serializable stand-in for `discord.Interaction` provided to
+    commands running in a worker.
+    """
+
+    def __init__(self, data: Mapping[str, Any]) -> None:
+        self.user_id: Optional[int] = data.get('user_id')
+        """The ID of the user invoking the command."""
+        self.guild_id: Optional[int] = data.get('guild_id')
+        """The ID of the guild the command was invoked in."""
+        self.channel_id: Optional[int] = data.get('channel_id')
+        """The ID of the channel the command was invoked in."""
+        self.locale: Optional[str] = data.get('locale')
+        """The locale of the user invoking the command."""
+
+
+async def read_message(reader: StreamReader) -> Dict[str, Any]:
+    """
+    Reads a single framed message from a stream.
+
+    Raises:
+        asyncio.IncompleteReadError: If the stream closes mid-message
+    """
+    header: bytes = await reader.readexactly(HEADER.size)
+    (length,) = HEADER.unpack(header)
+    return marshal.loads(await reader.readexactly(length))
+
+def write_message(writer: StreamWriter, message: Mapping[str, Any]) -> None:
+    """
+    Writes a single framed message to a stream.
+    """
+    payload: bytes = marshal.dumps(dict(message))
+    writer.write(HEADER.pack(len(payload)) + payload)
+
+
+class Worker():
+    """
+    Manages a subprocess running the components of a single module.
+    """
+
+    def __init__(self, path: Path, *, config: Path, memory: int = 0, requests: int = 0) -> None:
+        """
+        Initializes a `Worker`.
+
+        Args:
+            path: A reference to the module to run in the worker.
+            config: The directory containing configuration data.
+            memory: The address space limit of the worker in megabytes, or 0 for no limit.
+            requests: The number of invocations after which the worker is recycled, or 0 to never recycle.
+        """
+        self._path: Path = path
+        self._config: Path = config
+        self._memory: int = memory
+        self._requests: int = requests
+
+        self._process: Optional[Process] = None
+        self._listener: Optional[Task[None]] = None
+        self._lock: asyncio.Lock = asyncio.Lock()
+        self._pending: Dict[int, Future[Any]] = dict()
+        self._counter: int = 0
+        self._handled: int = 0
+        self._commands: List[Dict[str, Any]] = list()
+
+    @property
+    def name(self) -> str:
+        """The name of the module run by the worker."""
+        return self._path.stem
+
+    @property
+    def commands(self) -> List[Dict[str, Any]]:
+        """The metadata of each command reported by the worker."""
+        return self._commands
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the worker subprocess is running."""
+        return self._process is not None and self._process.returncode is None
+
+
+    async def start(self) -> List[Dict[str, Any]]:
+        """
+        Starts the worker subprocess and waits for it to report its commands.
+
+        Raises:
+            WorkerError: If the worker exits before reporting its commands
+        """
+        # wait for the listener of a previous process to fail its pending invocations
+        if self._listener: await self._listener
+        arguments: List[str] = [str(self._path), '--config', str(self._config), '--memory', str(self._memory)]
+        # start the worker subprocess
+        self._process = await asyncio.create_subprocess_exec(sys.executable, '-c', ENTRY_POINT, *arguments, stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE)
+        self._handled = 0
+        log.debug('%s: Started worker process %d', self.name, self._process.pid)
+
+        try:
+            # wait for the worker to report its commands
+            assert self._process.stdout
+            message: Dict[str, Any] = await read_message(self._process.stdout)
+        except asyncio.IncompleteReadError as error:
+            raise WorkerError(self.name, f'Worker exited with code {await self._process.wait()}') from error
+
+        self._commands = message.get('commands', [])
+        # start listening for results
+        self._listener = asyncio.create_task(self._listen(self._process))
+        return self._commands
+
+    async def stop(self) -> None:
+        """
+        Stops the worker subprocess, failing any pending invocations.
+        """
+        process: Optional[Process] = self._process
+        self._process = None
+        if process and process.returncode is None:
+            # close the worker's input stream to request an exit
+            assert process.stdin
+            process.stdin.close()
+            try:
+                await asyncio.wait_for(process.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+        if self._listener: await self._listener
+        self._listener = None
+        log.debug('%s: Stopped worker process', self.name)
+
+    async def invoke(self, command: str, context: Mapping[str, Any], arguments: Mapping[str, Any]) -> Any:
+        """
+        Invokes a command in the worker, restarting the worker if it has exited
+        or reached its invocation limit.
+
+        Raises:
+            WorkerError: If the command raised an exception or the worker exited
+        """
+        async with self._lock:
+            # recycle the worker once it has reached its invocation limit
+            if self._requests and self._handled >= self._requests:
+                log.info('%s: Recycling worker after %d invocations', self.name, self._handled)
+                await self.stop()
+            # restart the worker if it is not running
+            if not self.is_running: await self.start()
+            assert self._process and self._process.stdin
+
+            self._counter += 1
+            self._handled += 1
+            future: Future[Any] = asyncio.get_running_loop().create_future()
+            self._pending[self._counter] = future
+            write_message(self._process.stdin, {'op': 'invoke', 'id': self._counter, 'command': command, 'context': dict(context), 'arguments': dict(arguments)})
+            await self._process.stdin.drain()
+        return await future
+
+    async def _listen(self, process: Process) -> None:
+        """
+        Resolves pending invocations as results arrive from the worker.
+        """
+        assert process.stdout
+        try:
+            while True:
+                message: Dict[str, Any] = await read_message(process.stdout)
+                future: Optional[Future[Any]] = self._pending.pop(message['id'], None)
+                if not future or future.done(): continue
+                if message.get('error') is not None: future.set_exception(WorkerError(self.name, message['error']))
+                else: future.set_result(message.get('value'))
+        except asyncio.IncompleteReadError:
+            log.debug('%s: Worker output closed', self.name)
+        # fail every invocation still waiting on the worker
+        for future in self._pending.values():
+            if not future.done(): future.set_exception(WorkerError(self.name, f'Worker exited with code {await process.wait()}'))
+        self._pending.clear()
+
+
+#region worker process
+
+async def _serve(path: Path, config: Path) -> None:
+    """
+    Loads the components of a module and serves invocations until input closes.
+    """
+    # import the settings here to keep the coordinator side of this module lightweight
+    from .settings import Settings
+
+    loop: asyncio.AbstractEventLoop = asyncio.get_running_loop()
+    # duplicate the original stdout as the message channel
+    channel = os.fdopen(os.dup(sys.stdout.fileno()), 'wb')
+    # redirect stdout to stderr so components cannot corrupt the channel
+    os.dup2(sys.stderr.fileno(), sys.stdout.fileno())
+    sys.stdout = sys.stderr
+
+    reader: StreamReader = StreamReader()
+    await loop.connect_read_pipe(lambda: asyncio.StreamReaderProtocol(reader), sys.stdin.buffer)
+    transport, protocol = await loop.connect_write_pipe(asyncio.streams.FlowControlMixin, channel)
+    writer: StreamWriter = StreamWriter(transport, protocol, reader, loop)
+
+    settings: Settings = Settings(config)
+    # keep a reference to each component's setup task until it completes
+    setups: Set[Task[None]] = set()
+    commands: Dict[str, MethodType] = _load_commands(path, settings, setups)
+    write_message(writer, {'op': 'ready', 'commands': [_describe(coroutine) for coroutine in commands.values()]})
+    await writer.drain()
+
+    async def handle(message: Dict[str, Any]) -> None:
+        result: Dict[str, Any] = {'op': 'result', 'id': message['id'], 'value': None, 'error': None}
+        try:
+            value: Any = await commands[message['command']](Context(message['context']), **message['arguments'])
+            result['value'] = None if value is None else str(value)
+        except Exception as error:
+            result['error'] = f'{error.__class__.__name__}: {error}'
+        write_message(writer, result)
+        await writer.drain()
+
+    tasks: List[Task[None]] = list()
+    while True:
+        try:
+            message: Dict[str, Any] = await read_message(reader)
+        except asyncio.IncompleteReadError:
+            break
+        tasks.append(loop.create_task(handle(message)))
+        tasks = [task for task in tasks if not task.done()]
+    # finish in-flight invocations before exiting
+    if tasks: await asyncio.gather(*tasks, return_exceptions=True)
+
+def _load_commands(path: Path, settings: Any, setups: Set[Task[None]]) -> Dict[str, MethodType]:
+    """
+    Imports a module and initializes its components, returning their commands by name.
+    The task running each component's `__setup__` is added to the provided set until it completes.
+    """
+    from .component import Component
+
+    spec: Optional[ModuleSpec] = importlib.util.spec_from_file_location(name=path.stem, location=path)
+    if not spec or not spec.loader: raise ImportError(f'No spec available for {path.name}.')
+    module: ModuleType = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    commands: Dict[str, MethodType] = dict()
+    for _, class_object in inspect.getmembers(module, inspect.isclass):
+        if class_object.__module__ != module.__name__: continue
+        if not isinstance(class_object, Component): continue
+        # initialize the component with its configuration section
+        instance: Component = class_object(config=settings.application[class_object.__name__], client=None)
+        task: Task[None] = asyncio.get_running_loop().create_task(instance.__setup__(), name=f'{class_object.__name__}.__setup__')
+        setups.add(task)
+        task.add_done_callback(_finish_setup)
+        task.add_done_callback(setups.discard)
+        for name, coroutine in inspect.getmembers(instance, inspect.iscoroutinefunction):
+            if name.startswith('_'): continue
+            commands[name] = coroutine
+    return commands
+
+def _finish_setup(task: Task[None]) -> None:
+    """
+    Logs the error of a failed component setup task.
+    """
+    if task.cancelled(): return
+    error: Optional[BaseException] = task.exception()
+    if error: log.warning(f'{task.get_name()}: {error.__class__.__name__} occurred during setup: {error}')
+
+def _describe(coroutine: MethodType) -> Dict[str, Any]:
+    """
+    Describes a command's name, description and parameters as serializable metadata.
+
+    Raises:
+        TypeError: If a parameter's annotation cannot be forwarded to a worker
+    """
+    parameters: List[Dict[str, Any]] = list()
+    # skip the context parameter
+    for parameter in list(inspect.signature(coroutine).parameters.values())[1:]:
+        annotation: Any = parameter.annotation
+        name: Optional[str] = annotation if isinstance(annotation, str) else getattr(annotation, '__name__', None)
+        if name not in TYPES: raise TypeError(f'{coroutine.__qualname__}: Unsupported parameter type {annotation} for {parameter.name}')
+        parameter_data: Dict[str, Any] = {'name': parameter.name, 'type': name, 'required': parameter.default is parameter.empty}
+        if parameter.default is not parameter.empty: parameter_data['default'] = parameter.default
+        parameters.append(parameter_data)
+    return {'name': coroutine.__name__, 'description': coroutine.__doc__ or '', 'parameters': parameters}
+
+def _limit_memory(megabytes: int) -> None:
+    """
+    Limits the address space of the current process.
+    """
+    try:
+        import resource
+    except ImportError:
+        log.warning('Worker memory limits are not supported on this platform.')
+        return
+    limit: int = megabytes * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def run(argv: List[str]) -> None:
+    """
+    Parses worker arguments and serves invocations until input closes.
+    """
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(prog="Discord Bot Worker", description="Runs a component module in a worker process")
+    parser.add_argument('path', type=Path)
+    parser.add_argument('--config', type=Path, default=Path('./config'))
+    parser.add_argument('--memory', type=int, default=0)
+    namespace: argparse.Namespace = parser.parse_args(argv)
+    if namespace.memory: _limit_memory(namespace.memory)
+    asyncio.run(_serve(namespace.path, namespace.config))
+
+#endregion
@@ -0,0 +1,56 @@
+import asyncio
+from pathlib import Path
+from typing import AsyncIterator, List
+
+from bot.database import AsyncDatabase, Pragmas
+from bot.database.storable import column, table
+
+
+@table(name='counters')
+class Counter():
+
+    def __init__(self, id: int, count: int) -> None:
+        self._id: int = id
+        self._count: int = count
+
+    @column(name='id', type='INTEGER', is_primary=True)
+    def id(self) -> int:
+        return self._id
+
+    @column(name='count', type='INTEGER')
+    def count(self) -> int:
+        return self._count
+
+    def __values__(self):
+        return (self._id, self._count)
+
+    @classmethod
+    def __from_row__(cls, row) -> 'Counter':
+        return cls(row['id'], row['count'])
+
+
+async def interleave(path: Path) -> List[int]:
+    database: AsyncDatabase = AsyncDatabase(path, pragmas=Pragmas.wal(), readers=1, chunk_size=2)
+    try:
+        await database.create(Counter)
+        await database.insert_many(Counter, [Counter(id, 0) for id in range(5)])
+        first: AsyncIterator[Counter] = database.iter_select(Counter, batch_size=2).__aiter__()
+        second: AsyncIterator[Counter] = database.iter_select(Counter).__aiter__()
+        ids: List[int] = list()
+        # alternate between the iterations while the first holds the only read-only connection
+        for _ in range(5):
+            ids.append((await first.__anext__()).id())
+            ids.append((await second.__anext__()).id())
+            # writes and selects are not queued behind either iteration
+            await database.upsert(Counter, Counter(0, len(ids)))
+            assert len(await database.select(Counter)) == 5
+        await first.aclose()
+        await second.aclose()
+        return ids
+    finally:
+        await database.close()
+
+
+def test_interleaved_iterations(tmp_path: Path) -> None:
+    ids: List[int] = asyncio.run(asyncio.wait_for(interleave(tmp_path / 'counters.db'), 10))
+    assert ids == [0, 0, 1, 1, 2, 2, 3, 3, 4, 4]
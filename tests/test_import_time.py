@@ -0,0 +1,63 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import List
+
+ROOT: Path = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES: List[str] = ['discord', 'aiohttp', 'sqlite3', 'bot.core', 'bot.database', 'bot.loader']
+"""The modules that importing the package or its settings must not load"""
+
+BASELINE: str = 'discord'
+"""The heavy import the package's import time is compared against, measured in the same run"""
+
+RATIO: float = 0.5
+"""
+The largest fraction of the baseline's import time the package may take.
+Deferred imports keep the package far below it, while an eager import of
+discord.py would take at least the whole baseline.
+"""
+
+
+def measure(statement: str, package: str) -> float:
+    """
+    Runs an import statement in a fresh interpreter with `-X importtime`, and returns
+    the cumulative import time of the package and its submodules in seconds.
+    """
+    result: subprocess.CompletedProcess = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    total: int = 0
+    # each line reads `import time: <self us> | <cumulative us> | <module name indented by nesting>`
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'): continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # sum the top-level imports of the package and its submodules, which include their nested imports
+        if name[1:].startswith(' '): continue
+        if name.strip() == package or name.strip().startswith(f'{package}.'): total += int(cumulative)
+    assert total, f'{package} was not imported by {statement}'
+    return total / 1_000_000
+
+
+def loaded(statement: str) -> List[str]:
+    """
+    Runs an import statement in a fresh interpreter and returns the heavy modules it loaded.
+    """
+    check: str = f'{statement}; import sys; print(",".join(name for name in {HEAVY_MODULES!r} if name in sys.modules))'
+    result: subprocess.CompletedProcess = subprocess.run([sys.executable, '-c', check], cwd=ROOT, capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    return [name for name in result.stdout.strip().split(',') if name]
+
+
+def test_import_bot() -> None:
+    assert loaded('import bot') == []
+
+
+def test_import_settings() -> None:
+    assert loaded('from bot import Settings') == []
+
+
+def test_import_time_relative_to_baseline() -> None:
+    # take the fastest of several runs of each, as the fastest is the least disturbed
+    baseline: float = min(measure(f'import {BASELINE}', BASELINE) for _ in range(3))
+    package: float = min(measure('from bot import Settings', 'bot') for _ in range(3))
+    assert package < baseline * RATIO, f'bot took {package * 1000:.1f}ms, {BASELINE} took {baseline * 1000:.1f}ms'
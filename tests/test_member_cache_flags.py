@@ -0,0 +1,31 @@
+from configparser import ConfigParser
+from pathlib import Path
+
+from discord import MemberCacheFlags
+
+from bot.settings.general import GeneralSection
+
+
+def get_section(tmp_path: Path, value: str) -> GeneralSection:
+    parser: ConfigParser = ConfigParser()
+    parser['GENERAL'] = {'member_cache_flags': value}
+    # sections re-read their file on access, so each value gets its own file
+    return GeneralSection(parser, path=tmp_path / f'{value or "empty"}.ini')
+
+
+def test_listed_flags_only(tmp_path: Path) -> None:
+    flags = get_section(tmp_path, 'voice').member_cache_flags
+    assert flags is not None
+    assert flags.voice
+    # every flag not listed is disabled
+    for flag in MemberCacheFlags.VALID_FLAGS:
+        if flag != 'voice': assert not getattr(flags, flag), flag
+
+
+def test_all_and_none(tmp_path: Path) -> None:
+    assert get_section(tmp_path, 'all').member_cache_flags == MemberCacheFlags.all()
+    assert get_section(tmp_path, 'none').member_cache_flags == MemberCacheFlags.none()
+
+
+def test_unset(tmp_path: Path) -> None:
+    assert get_section(tmp_path, '').member_cache_flags is None
@@ -0,0 +1,41 @@
+import pytest
+
+from bot.database.storable import column, table
+
+
+class Base():
+    __slots__ = ('created',)
+
+    def __init__(self) -> None:
+        self.created: bool = True
+
+
+@table(name='items', compiled=True)
+class Item(Base):
+    __slots__ = ()
+
+    def __init__(self, id: int) -> None:
+        super().__init__()
+        self._id: int = id
+
+    @column(name='id', type='INTEGER', is_primary=True)
+    def id(self) -> int:
+        return self._id
+
+
+def test_compiled_super() -> None:
+    # zero-argument super() resolves against the compiled class
+    item: Item = Item(1)
+    assert item.created
+    assert item.__values__() == (1,)
+    assert Item.__from_row__((2,)).id() == 2
+
+
+def test_compiled_reserved_name() -> None:
+    # the slot of a column method named table would replace the built table
+    with pytest.raises(ValueError):
+        @table(name='reserved', compiled=True)
+        class Reserved():
+            @column(name='table', type='TEXT')
+            def table(self) -> str:
+                return self._table
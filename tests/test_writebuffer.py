@@ -0,0 +1,31 @@
+import asyncio
+from pathlib import Path
+from typing import List
+
+from bot.core import Core
+from bot.database import AsyncDatabase, WriteBuffer
+from bot.settings import Settings
+
+from test_asyncdatabase import Counter
+
+
+async def shut_down(tmp_path: Path) -> List[Counter]:
+    settings: Settings = Settings(tmp_path / 'settings')
+    settings.client.general.permissions = 0
+    client: Core = Core(settings)
+    database: AsyncDatabase = AsyncDatabase(tmp_path / 'counters.db')
+    try:
+        await database.create(Counter)
+        # a component buffering writes that never closes its buffer
+        buffer: WriteBuffer[Counter] = WriteBuffer(database, Counter, interval=60)
+        buffer.start()
+        for id in range(3): await buffer.write(Counter(id, 1))
+        await client.close()
+        return list(await database.select(Counter))
+    finally:
+        await database.close()
+
+
+def test_shutdown_flushes_unclosed_buffer(tmp_path: Path) -> None:
+    counters: List[Counter] = asyncio.run(shut_down(tmp_path))
+    assert [counter.id() for counter in counters] == [0, 1, 2]